@@ -0,0 +1,183 @@
+"""
+스테이션 작업 배정(claim) 경합 벤치마크
+
+master_equipment 의 스테이션(기본 13대)을 스레드로 띄워 각자
+claim_next_job -> (작업 시간 대기) -> complete_job 을 반복하고,
+스테이션 수별 처리량과 claim 지연시간을 SKIP LOCKED / 일반 FOR UPDATE 로 비교한다.
+
+사용법 (app 디렉토리에서, 테스트용 DB 에서만 실행):
+    python -m benchmarks.claim_contention
+    python -m benchmarks.claim_contention --stations 1,4,8,13 --duration 10 --work-ms 20
+    python -m benchmarks.claim_contention --mode both
+
+매 실행마다 공정 단계별로 대기 작업지시를 만들고, 종료 후 생성한 작업지시/실적을 삭제한다.
+(직접 INSERT/DELETE 하므로 종료 후 대시보드 집계 테이블을 재생성한다.)
+미완료 작업지시가 이미 있는 DB 에서는 --force 없이 실행하지 않는다. (실제 작업을 가져가지 않도록)
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from core.database import SessionLocal
+from models.master_equipment import MasterEquipment
+from models.master_product import MasterProduct
+from models.work_order import WorkOrder
+from models.work_result import WorkResult
+from services.dashboard_summary import rebuild_dashboard_summary
+from services.station_dispatch import READY_STATUS, claim_next_job, complete_job
+
+
+def load_stations(db) -> list:
+    """공정 단계가 고르게 섞이도록 단계별 라운드로빈 순서로 정렬한 스테이션 목록"""
+    rows = (
+        db.query(MasterEquipment.equipment_id, MasterEquipment.operation_seq)
+        .filter(MasterEquipment.enabled == True, MasterEquipment.operation_seq.in_(list(READY_STATUS)))
+        .order_by(MasterEquipment.operation_seq, MasterEquipment.equipment_id)
+        .all()
+    )
+    by_seq = {}
+    for r in rows:
+        by_seq.setdefault(r.operation_seq, []).append(r.equipment_id)
+    ordered = []
+    while any(by_seq.values()):
+        for seq in sorted(by_seq):
+            if by_seq[seq]:
+                ordered.append(by_seq[seq].pop(0))
+    return ordered
+
+
+def seed_orders(db, product_id: str, per_stage: int) -> list:
+    """공정 단계별로 per_stage 건씩 대기 상태 작업지시 생성"""
+    now = datetime.utcnow()
+    rows = []
+    for seq, status in READY_STATUS.items():
+        for i in range(per_stage):
+            rows.append({
+                "order_id": uuid.uuid4(),
+                "product_id": product_id,
+                "planned_qty": 1,
+                "due_date": now + timedelta(minutes=i),
+                "status": status,
+                "created_ts": now,
+            })
+    db.execute(insert(WorkOrder), rows)
+    db.commit()
+    return [r["order_id"] for r in rows]
+
+
+def cleanup(db, order_ids: list):
+    for i in range(0, len(order_ids), 1000):
+        chunk = order_ids[i:i + 1000]
+        db.query(WorkResult).filter(WorkResult.order_id.in_(chunk)).delete(synchronize_session=False)
+        db.query(WorkOrder).filter(WorkOrder.order_id.in_(chunk)).delete(synchronize_session=False)
+    db.commit()
+    # 직접 삭제한 작업지시/실적을 대시보드 집계에서도 제거
+    rebuild_dashboard_summary(db)
+
+
+def station_worker(equipment_id: str, skip_locked: bool, work_ms: float, deadline: float, stats: dict):
+    db = SessionLocal()
+    claim_ms = []
+    done = empty = 0
+    try:
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            job = claim_next_job(db, equipment_id, skip_locked=skip_locked)
+            claim_ms.append((time.monotonic() - started) * 1000)
+            if job is None:
+                empty += 1
+                time.sleep(0.005)
+                continue
+            if work_ms:
+                time.sleep(work_ms / 1000)
+            complete_job(db, equipment_id, job["order_id"])
+            done += 1
+    finally:
+        db.close()
+    stats[equipment_id] = {"done": done, "empty": empty, "claim_ms": claim_ms}
+
+
+def run_once(stations: list, skip_locked: bool, duration: float, work_ms: float, product_id: str) -> dict:
+    # 실행 시간 동안 작업이 바닥나지 않을 만큼 생성
+    per_station = int(duration * 1000 / max(work_ms, 1)) + 50
+    per_stage = per_station * max(len(stations), 1)
+
+    db = SessionLocal()
+    order_ids = seed_orders(db, product_id, per_stage)
+    try:
+        stats = {}
+        deadline = time.monotonic() + duration
+        threads = [
+            threading.Thread(target=station_worker, args=(s, skip_locked, work_ms, deadline, stats))
+            for s in stations
+        ]
+        started = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - started
+    finally:
+        cleanup(db, order_ids)
+        db.close()
+
+    claim_ms = sorted(ms for s in stats.values() for ms in s["claim_ms"])
+    done = sum(s["done"] for s in stats.values())
+    return {
+        "stations": len(stations),
+        "jobs": done,
+        "jobs_per_sec": done / elapsed,
+        "empty_claims": sum(s["empty"] for s in stats.values()),
+        "claim_p50_ms": statistics.median(claim_ms) if claim_ms else 0.0,
+        "claim_p99_ms": claim_ms[int(len(claim_ms) * 0.99) - 1] if claim_ms else 0.0,
+        "per_station": {k: v["done"] for k, v in stats.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스테이션 작업 배정 경합 벤치마크")
+    parser.add_argument("--stations", default="1,2,4,8,13", help="스테이션 수 목록 (쉼표 구분)")
+    parser.add_argument("--duration", type=float, default=10, help="실행 시간 (초)")
+    parser.add_argument("--work-ms", type=float, default=20, help="작업 1건 처리 시간 (밀리초)")
+    parser.add_argument("--mode", choices=["skip_locked", "for_update", "both"], default="skip_locked")
+    parser.add_argument("--force", action="store_true", help="미완료 작업지시가 있어도 실행")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        open_orders = db.query(WorkOrder).filter(WorkOrder.status != "S5_DONE").count()
+        all_stations = load_stations(db)
+        product_id = db.query(MasterProduct.product_id).order_by(MasterProduct.product_id).limit(1).scalar()
+    finally:
+        db.close()
+    if open_orders and not args.force:
+        print(f"미완료 작업지시가 {open_orders}건 있습니다. 테스트용 DB 에서 실행하거나 --force 를 지정하세요.")
+        sys.exit(2)
+    if not all_stations or product_id is None:
+        print("스테이션/제품 마스터 데이터가 없습니다.")
+        sys.exit(2)
+
+    counts = [min(int(n), len(all_stations)) for n in args.stations.split(",")]
+    modes = ["skip_locked", "for_update"] if args.mode == "both" else [args.mode]
+
+    print(f"스테이션 {len(all_stations)}대, 실행 {args.duration}초, 작업 {args.work_ms}ms")
+    for mode in modes:
+        print(f"\n[{mode}]")
+        print(f"{'stations':>8} {'jobs/s':>10} {'per-station':>12} {'claim p50':>10} {'claim p99':>10} {'empty':>7}")
+        base = None
+        for n in counts:
+            r = run_once(all_stations[:n], mode == "skip_locked", args.duration, args.work_ms, product_id)
+            base = base or r["jobs_per_sec"] / n
+            print(f"{n:>8} {r['jobs_per_sec']:>10.1f} {r['jobs_per_sec'] / n:>12.1f} "
+                  f"{r['claim_p50_ms']:>8.2f}ms {r['claim_p99_ms']:>8.2f}ms {r['empty_claims']:>7}"
+                  f"   (선형 대비 {r['jobs_per_sec'] / (base * n) * 100 if base else 0:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""
+대시보드 집계 벤치마크
+
+같은 데이터에서 대시보드 응답을 만드는 세 가지 경로를 비교한다.
+  pandas  : 이전 구현 (작업지시/실적 전체 로드 -> DataFrame -> 행 단위 apply + groupby)
+  sql     : services.dashboard.get_dashboard_data_sql (GROUP BY + width_bucket, 왕복 1회)
+  summary : services.dashboard.get_dashboard_data_summary (증분 집계 테이블 조회)
+세 결과의 차트/KPI 가 같은지도 확인한다.
+
+사용법 (app 디렉토리에서, 테스트용 DB 에서만 실행):
+    python -m benchmarks.dashboard_aggregation
+    python -m benchmarks.dashboard_aggregation --sizes 10000,100000,1000000 --repeat 3
+    python -m benchmarks.dashboard_aggregation --pandas-max 100000   # 큰 규모에서 pandas 경로 생략
+
+크기는 작업실적 건수 (작업지시 1건당 공정 1~4 실적 4건). 서버에서 generate_series 로 생성하고
+종료 후 삭제한 뒤 대시보드 집계 테이블을 재생성한다.
+작업지시가 이미 있는 DB 에서는 --force 없이 실행하지 않는다. (pandas 경로가 전체 테이블을 읽으므로)
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core.database import SessionLocal
+from models.work_order import WorkOrder
+from models.work_result import WorkResult
+from models.master_operation import MasterOperation
+from models.master_equipment import MasterEquipment
+from models.master_product import MasterProduct
+from models.master_operation_standard import MasterOperationStandard
+from services.dashboard import get_dashboard_data_sql, get_dashboard_data_summary
+from services.dashboard_summary import rebuild_dashboard_summary
+from datetime import datetime, timedelta
+
+
+def legacy_pandas_dashboard(db: Session):
+    """이전 구현 (전체 작업지시/실적 로드 -> pandas 집계), 비교 기준"""
+    
+    # 1. 작업지시 데이터 조회
+    orders_query = (
+        db.query(
+            WorkOrder.order_id,
+            WorkOrder.product_id,
+            WorkOrder.planned_qty,
+            WorkOrder.status,
+            WorkOrder.created_ts,
+            WorkOrder.start_ts,
+            WorkOrder.end_ts,
+            MasterProduct.name.label("product_name"),
+        )
+        .join(MasterProduct, WorkOrder.product_id == MasterProduct.product_id)
+        .all()
+    )
+    
+    # DataFrame 변환
+    df_orders = pd.DataFrame([{
+        "order_id": str(r.order_id),
+        "product_id": r.product_id,
+        "product_name": r.product_name,
+        "planned_qty": r.planned_qty,
+        "status": r.status,
+        "created_ts": r.created_ts,
+        "start_ts": r.start_ts,
+        "end_ts": r.end_ts,
+    } for r in orders_query])
+    
+    # 2. 작업실적 데이터 조회
+    results_query = (
+        db.query(
+            WorkResult.result_id,
+            WorkResult.order_id,
+            WorkResult.operation_seq,
+            WorkResult.equipment_id,
+            WorkResult.start_ts,
+            WorkResult.end_ts,
+            WorkOrder.product_id,
+            WorkOrder.planned_qty,
+            MasterOperation.operation_name,
+            MasterEquipment.name.label("equipment_name"),
+        )
+        .join(WorkOrder, WorkResult.order_id == WorkOrder.order_id)
+        .join(MasterOperation, WorkResult.operation_seq == MasterOperation.operation_seq)
+        .outerjoin(MasterEquipment, WorkResult.equipment_id == MasterEquipment.equipment_id)
+        .all()
+    )
+    
+    # DataFrame 변환
+    df_results = pd.DataFrame([{
+        "result_id": str(r.result_id),
+        "order_id": str(r.order_id),
+        "operation_seq": r.operation_seq,
+        "operation_name": r.operation_name,
+        "equipment_id": r.equipment_id,
+        "equipment_name": r.equipment_name,
+        "start_ts": r.start_ts,
+        "end_ts": r.end_ts,
+        "product_id": r.product_id,
+        "planned_qty": r.planned_qty,
+    } for r in results_query])
+    
+    # 3. 표준시간 데이터 조회
+    standards_query = db.query(MasterOperationStandard).all()
+    standard_times = {
+        (s.product_id, s.operation_seq): s.standard_cycle_time_sec
+        for s in standards_query
+    }
+
+    # 4. 작업시간 계산
+    if not df_results.empty:
+        df_results['actual_time_sec'] = (
+            pd.to_datetime(df_results['end_ts']) - pd.to_datetime(df_results['start_ts'])
+        ).dt.total_seconds()
+        df_results['actual_time_min'] = df_results['actual_time_sec'] / 60
+        
+        # 표준시간 추가
+        df_results['standard_time_sec'] = df_results.apply(
+            lambda row: standard_times.get((row['product_id'], row['operation_seq']), 0),
+            axis=1
+        )
+        
+        # 단위당 실제시간 및 편차율 계산
+        df_results['actual_time_per_unit'] = df_results['actual_time_sec'] / df_results['planned_qty']
+        df_results['deviation_rate'] = (
+            (df_results['actual_time_per_unit'] - df_results['standard_time_sec']) 
+            / df_results['standard_time_sec'] * 100
+        )
+    
+    # 5. 제품별 생산 현황
+    product_summary = df_orders.groupby(['product_id', 'product_name']).agg({
+        'order_id': 'count',
+        'planned_qty': 'sum',
+    }).reset_index()
+    product_summary.columns = ['product_id', 'product_name', 'order_count', 'total_qty']
+    product_summary = product_summary.sort_values('order_count', ascending=False)
+    
+    # Chart.js 데이터 형식
+    product_chart = {
+        "labels": product_summary['product_name'].tolist(),
+        "data": product_summary['order_count'].tolist(),
+    }
+
+    # 6. 상태별 작업지시 분포
+    status_names = {
+        "S0_PLANNED": "계획",
+        "S1_READY": "부품준비",
+        "S2_ASSEMBLY": "조립",
+        "S3_INSPECTION": "검사",
+        "S4_PACK": "포장",
+        "S5_DONE": "완료",
+    }
+    #status를 일반 컬럼으로 변경하고 index를 0부터 재할당
+    status_summary = df_orders['status'].value_counts().reset_index() 
+    status_summary.columns = ['status', 'count']
+    status_summary['status_name'] = status_summary['status'].map(status_names)
+    
+    status_chart = {
+        "labels": status_summary['status_name'].tolist(),
+        "data": status_summary['count'].tolist(),
+    }
+
+    # 7. 공정별 평균 작업시간
+    if not df_results.empty:
+        operation_summary = df_results.groupby('operation_name')['actual_time_min'].mean().reset_index()
+        operation_summary.columns = ['operation_name', 'avg_time_min']
+        operation_summary = operation_summary.sort_values('avg_time_min', ascending=False)
+        
+        operation_chart = {
+            "labels": operation_summary['operation_name'].tolist(),
+            "data": operation_summary['avg_time_min'].round(2).tolist(),
+        }
+    else:
+        operation_chart = {"labels": [], "data": []}
+
+    # 8. 설비별 작업 건수 (Top 10)
+    if not df_results.empty and df_results['equipment_name'].notna().any():
+        equipment_summary = df_results['equipment_name'].value_counts().head(10).reset_index()
+        equipment_summary.columns = ['equipment_name', 'count']
+        
+        equipment_chart = {
+            "labels": equipment_summary['equipment_name'].tolist(),
+            "data": equipment_summary['count'].tolist(),
+        }
+    else:
+        equipment_chart = {"labels": [], "data": []}
+    
+    # 9. 일별 생산량 추이 (최근 30일)
+    completed_orders = df_orders[df_orders['status'] == 'S5_DONE'].copy()
+    if not completed_orders.empty:
+        completed_orders['completion_date'] = pd.to_datetime(completed_orders['end_ts']).dt.date
+        
+        # 최근 30일
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=30)
+        
+        daily_production = completed_orders[
+            (completed_orders['completion_date'] >= start_date) &
+            (completed_orders['completion_date'] <= end_date)
+        ].groupby('completion_date')['planned_qty'].sum().reset_index()
+        
+        daily_production.columns = ['date', 'qty']
+        daily_production = daily_production.sort_values('date')
+        
+        daily_chart = {
+            "labels": [d.strftime('%m/%d') for d in daily_production['date'].tolist()],
+            "data": daily_production['qty'].tolist(),
+        }
+    else:
+        daily_chart = {"labels": [], "data": []}
+    
+    # 10. 편차율 분포 (히스토그램)
+    if not df_results.empty and 'deviation_rate' in df_results.columns:
+        # -50% ~ 50% 범위를 10개 구간으로
+        bins = [-50, -40, -30, -20, -10, 0, 10, 20, 30, 40, 50]
+        df_results['deviation_bin'] = pd.cut(df_results['deviation_rate'], bins=bins)
+        deviation_hist = df_results['deviation_bin'].value_counts().sort_index()
+        
+        deviation_chart = {
+            "labels": [str(interval) for interval in deviation_hist.index],
+            "data": deviation_hist.values.tolist(),
+        }
+    else:
+        deviation_chart = {"labels": [], "data": []}
+    
+    # 11. KPI 요약 지표
+    total_orders = len(df_orders)
+    completed_orders_count = len(df_orders[df_orders['status'] == 'S5_DONE'])
+    in_progress_count = len(df_orders[df_orders['status'].isin(['S1_READY', 'S2_ASSEMBLY', 'S3_INSPECTION', 'S4_PACK'])])
+    planned_count = len(df_orders[df_orders['status'] == 'S0_PLANNED'])
+    
+    completion_rate = (completed_orders_count / total_orders * 100) if total_orders > 0 else 0
+    
+    avg_deviation = df_results['deviation_rate'].mean() if not df_results.empty and 'deviation_rate' in df_results.columns else 0
+    
+    kpi = {
+        "total_orders": total_orders,
+        "completed_orders": completed_orders_count,
+        "in_progress": in_progress_count,
+        "planned": planned_count,
+        "completion_rate": round(completion_rate, 1),
+        "avg_deviation_rate": round(avg_deviation, 2),
+    }
+    
+    # 반환 데이터
+    return {
+        "kpi": kpi,
+        "product_chart": product_chart,
+        "status_chart": status_chart,
+        "operation_chart": operation_chart,
+        "equipment_chart": equipment_chart,
+        "daily_chart": daily_chart,
+        "deviation_chart": deviation_chart,
+    }
+
+
+def seed(db, n_results: int):
+    """작업실적 n_results 건 (작업지시 n_results / 4 건) 생성, 생성한 작업지시는 작업 테이블 bench_dashboard_orders 에 기록"""
+    products = [r.product_id for r in db.query(MasterProduct.product_id).order_by(MasterProduct.product_id).all()]
+    stations = {}
+    for r in (db.query(MasterEquipment.equipment_id, MasterEquipment.operation_seq)
+              .filter(MasterEquipment.enabled == True)
+              .order_by(MasterEquipment.equipment_id).all()):
+        stations.setdefault(r.operation_seq, []).append(r.equipment_id)
+
+    params = {"products": products, "n_products": len(products), "n_orders": max(n_results // 4, 1)}
+    equipment_case = ["CASE op.seq"]
+    for seq, ids in sorted(stations.items()):
+        params[f"eq{seq}"] = ids
+        equipment_case.append(f"WHEN {seq} THEN (:eq{seq})[1 + (o.i + op.seq) % {len(ids)}]")
+    equipment_case.append("END")
+
+    db.execute(text("DROP TABLE IF EXISTS bench_dashboard_orders"))
+    db.execute(text("""
+        CREATE TABLE bench_dashboard_orders AS
+        SELECT gen_random_uuid() AS order_id,
+               (:products)[1 + (i % :n_products)] AS product_id,
+               10 + (i * 37) % 191 AS planned_qty,
+               i
+        FROM generate_series(0, :n_orders - 1) AS i
+    """), params)
+    db.execute(text("""
+        INSERT INTO work_orders (order_id, product_id, planned_qty, due_date, status, created_ts, start_ts, end_ts)
+        SELECT order_id, product_id, planned_qty,
+               localtimestamp + (i % 30) * interval '1 day',
+               (CASE WHEN i % 2 = 0 THEN 'S5_DONE' ELSE 'S4_PACK' END)::order_status,
+               localtimestamp - interval '45 days',
+               localtimestamp - (i % 40) * interval '1 day' - interval '6 hours',
+               CASE WHEN i % 2 = 0 THEN localtimestamp - (i % 40) * interval '1 day' END
+        FROM bench_dashboard_orders
+    """))
+    db.execute(text(f"""
+        INSERT INTO work_results (result_id, order_id, operation_seq, equipment_id, start_ts, end_ts)
+        SELECT gen_random_uuid(), o.order_id, op.seq,
+               {" ".join(equipment_case)},
+               localtimestamp - (o.i % 40) * interval '1 day' - interval '6 hours' + op.seq * interval '1 hour',
+               localtimestamp - (o.i % 40) * interval '1 day' - interval '6 hours' + op.seq * interval '1 hour'
+                 + o.planned_qty * s.standard_cycle_time_sec * (0.6 + ((o.i * 7 + op.seq) % 80) / 100.0) * interval '1 second'
+        FROM bench_dashboard_orders o
+        CROSS JOIN generate_series(1, 4) AS op(seq)
+        JOIN master_operation_standards s ON s.product_id = o.product_id AND s.operation_seq = op.seq
+    """), params)
+    db.commit()
+    db.execute(text("ANALYZE work_orders"))
+    db.execute(text("ANALYZE work_results"))
+    db.commit()
+
+
+def cleanup(db):
+    db.execute(text("DELETE FROM work_results WHERE order_id IN (SELECT order_id FROM bench_dashboard_orders)"))
+    db.execute(text("DELETE FROM work_orders WHERE order_id IN (SELECT order_id FROM bench_dashboard_orders)"))
+    db.execute(text("DROP TABLE IF EXISTS bench_dashboard_orders"))
+    db.commit()
+
+
+def timed(fn, db, repeat: int):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(db)
+        samples.append((time.perf_counter() - started) * 1000)
+        db.rollback()
+    return statistics.median(samples), result
+
+
+def chart_diff(a: dict, b: dict) -> list:
+    """차트는 (라벨 -> 값) 기준으로 비교 (동률 정렬 순서 차이 무시), 실수는 반올림 오차 허용"""
+    diffs = []
+    for key in a:
+        if key == "kpi":
+            left, right = a[key], b[key]
+        else:
+            left = dict(zip(a[key]["labels"], a[key]["data"]))
+            right = dict(zip(b[key]["labels"], b[key]["data"]))
+        if left.keys() != right.keys() or any(
+            abs(float(left[k]) - float(right[k])) > 0.011 for k in left
+        ):
+            diffs.append(key)
+    return diffs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 집계 벤치마크")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="작업실적 건수 목록 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=3, help="경로별 반복 횟수 (중앙값)")
+    parser.add_argument("--pandas-max", type=int, default=1000000, help="이 건수보다 크면 pandas 경로 생략")
+    parser.add_argument("--force", action="store_true", help="작업지시가 있어도 실행")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        existing = db.query(WorkOrder.order_id).limit(1).count()
+        if existing and not args.force:
+            print("작업지시가 있는 DB 입니다. 테스트용 DB 에서 실행하거나 --force 를 지정하세요.")
+            sys.exit(2)
+
+        print(f"{'results':>9} {'pandas':>11} {'sql':>10} {'summary':>10} {'rebuild':>10}  일치")
+        for size in [int(n) for n in args.sizes.split(",")]:
+            seed(db, size)
+            try:
+                pandas_ms, pandas_data = (None, None)
+                if size <= args.pandas_max:
+                    pandas_ms, pandas_data = timed(legacy_pandas_dashboard, db, args.repeat)
+                sql_ms, sql_data = timed(get_dashboard_data_sql, db, args.repeat)
+
+                started = time.perf_counter()
+                rebuild_dashboard_summary(db)
+                rebuild_ms = (time.perf_counter() - started) * 1000
+                summary_ms, summary_data = timed(get_dashboard_data_summary, db, args.repeat)
+
+                diffs = chart_diff(sql_data, summary_data)
+                if pandas_data is not None:
+                    diffs += [f"pandas:{k}" for k in chart_diff(pandas_data, sql_data)]
+                pandas_col = f"{pandas_ms:>9.1f}ms" if pandas_ms is not None else f"{'-':>11}"
+                print(f"{size:>9} {pandas_col} {sql_ms:>8.1f}ms {summary_ms:>8.1f}ms {rebuild_ms:>8.1f}ms  "
+                      f"{'OK' if not diffs else '불일치: ' + ', '.join(diffs)}")
+            finally:
+                cleanup(db)
+    finally:
+        rebuild_dashboard_summary(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
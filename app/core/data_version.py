@@ -0,0 +1,25 @@
+"""
+데이터 버전 카운터
+
+작업지시/실적/품질 데이터를 commit 한 서비스가 bump_data_version() 을 호출하면 버전이 올라가고,
+응답 캐시(core/response_cache.py)는 캐시한 시점의 버전과 비교해 무효화 여부를 판단한다.
+프로세스 단위 카운터이므로 워커가 여러 개면 다른 워커의 쓰기는 캐시 TTL 이 지나야 반영된다.
+"""
+import itertools
+import threading
+
+_counter = itertools.count(1)
+_version = 0
+_lock = threading.Lock()
+
+
+def bump_data_version() -> int:
+    """데이터 변경 알림 (commit 후 호출)"""
+    global _version
+    with _lock:
+        _version = next(_counter)
+        return _version
+
+
+def get_data_version() -> int:
+    return _version
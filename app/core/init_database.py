@@ -1,3 +1,5 @@
+from sqlalchemy import inspect, text
+
 from core.database import Base, engine
 
 # 생산관리 마스터
@@ -16,7 +18,34 @@ from models.work_result import WorkResult
 from models.quality_inspection import QualityInspection
 from models.quality_result import QualityResult
 from models.equipment_sensor_data import EquipmentSensorData
+from models.equipment_sensor_rollup import EquipmentSensorRollup1m, EquipmentSensorRollup1h
+from models.sensor_backfill_checkpoint import SensorBackfillCheckpoint
+from models import dashboard_summary
 
 
 def create_tables():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+    create_missing_indexes()
+
+
+def add_missing_columns():
+    """이미 있는 테이블에 새로 정의된 nullable 컬럼 추가 (create_all 은 기존 테이블을 변경하지 않음)"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                ddl_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(
+                    f'ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS "{column.name}" {ddl_type}'
+                ))
+
+
+def create_missing_indexes():
+    """이미 있는 테이블에 새로 정의된 인덱스 추가 (create_all 은 기존 테이블을 변경하지 않음)"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
\ No newline at end of file
@@ -3,26 +3,31 @@ import joblib
 import numpy as np
 import json
 from pathlib import Path
-import tensorflow as tf
-from tensorflow import keras
+from core.numpy_inference import load_dnn_model
 
 def setup_global_ai_assets(app: FastAPI):
 
     try:
         models_state = {}
         
-        # DNN 모델 로드
-        models_state["dnn_delivery_quality_model"] = keras.models.load_model("ai_models/delivery_quality/dnn_delivery_quality_model.keras")
-        models_state["dnn_sensor_anomaly_detection_model"] = keras.models.load_model("ai_models/sensor_anomaly/dnn_sensor_anomaly_detection_model.keras")
+        # 1. DNN 모델 + 스케일러 로드 (NumPy 추론 엔진)
+        (models_state["dnn_delivery_quality_model"],
+         models_state["dnn_delivery_quality_scaler"]) = load_dnn_model(
+            "ai_models/delivery_quality/dnn_delivery_quality_model.keras",
+            "ai_models/delivery_quality/dnn_delivery_quality_scaler.pkl")
+        (models_state["dnn_sensor_anomaly_detection_model"],
+         models_state["dnn_sensor_anomaly_detection_scaler"]) = load_dnn_model(
+            "ai_models/sensor_anomaly_detection/dnn_sensor_anomaly_detection_model.keras",
+            "ai_models/sensor_anomaly_detection/dnn_sensor_anomaly_detection_scaler.pkl")
         
-        # 2. 스케일러/인코더 로드
-        models_state["dnn_delivery_quality_scaler"] = joblib.load("ai_models/delivery_quality/dnn_delivery_quality_scaler.pkl")
+        # 2. 인코더 로드
         models_state["dnn_delivery_quality_encoder"] = joblib.load("ai_models/delivery_quality/dnn_delivery_quality_label.pkl")
-        models_state["dnn_sensor_anomaly_detection_scaler"] = joblib.load("ai_models/sensor_anomaly/dnn_sensor_anomaly_detection_scaler.pkl")
         
         # 3. 모델 메타 정보 로드
         with open("ai_models/delivery_quality/dnn_delivery_quality_info.json", "r") as f:
             models_state["dnn_delivery_quality_info"] = json.load(f)
+        with open("ai_models/sensor_anomaly_detection/dnn_sensor_anomaly_detection_info.json", "r") as f:
+            models_state["dnn_sensor_anomaly_detection_info"] = json.load(f)
 
         # 로드된 전체 딕셔너리를 app.state에 저장
         app.state.ai_models = models_state
@@ -0,0 +1,18 @@
+"""
+운영 지표 레지스트리
+
+각 서비스가 자신의 지표 수집 함수를 등록하면 GET /metrics 에서 한 번에 조회한다.
+"""
+from typing import Callable
+
+_collectors: dict[str, Callable[[], dict]] = {}
+
+
+def register_metrics(name: str, collector: Callable[[], dict]):
+    """지표 수집 함수 등록 (같은 이름이면 덮어씀)"""
+    _collectors[name] = collector
+
+
+def collect_metrics() -> dict:
+    """등록된 모든 지표 수집"""
+    return {name: collector() for name, collector in _collectors.items()}
@@ -0,0 +1,349 @@
+"""
+소형 Keras(Dense) 모델용 NumPy 추론 엔진
+
+.keras 파일(zip)의 config.json(그래프 구조/활성화 함수)과 model.weights.h5(가중치),
+StandardScaler 파라미터를 .npz 로 추출하고, TensorFlow 없이 NumPy 행렬곱만으로 동일한 predict 인터페이스를 제공한다.
+(단건 예측 시 model.predict 의 그래프/디스패치 오버헤드 제거)
+추출에는 h5py 만 필요하고, 추출한 .npz 는 저장소에 함께 둔다 (.keras/스케일러 해시가 다르면 다시 추출).
+
+사용법 (app 디렉토리에서):
+    python -m core.numpy_inference export      # ai_models/*/*.keras -> .npz
+    python -m core.numpy_inference verify      # 기준 출력(ai_models/numpy_inference_reference.npz)과 일치 여부 검증
+    python -m core.numpy_inference bench       # 단건 예측 지연시간 (TensorFlow 가 있으면 Keras 와 비교)
+    python -m core.numpy_inference reference   # Keras 로 기준 출력 재생성 (모델 재학습 후, TensorFlow 필요)
+
+서버 추론은 이 엔진만 사용한다 (TensorFlow 는 requirements 에 없음, verify/bench/reference 의 Keras 비교용으로만 별도 설치).
+"""
+import hashlib
+import io
+import json
+import re
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+import h5py
+import joblib
+import numpy as np
+
+# (모델 파일, 스케일러 파일)
+MODEL_ARTIFACTS = {
+    "delivery_quality": ("ai_models/delivery_quality/dnn_delivery_quality_model.keras",
+                         "ai_models/delivery_quality/dnn_delivery_quality_scaler.pkl"),
+    "sensor_anomaly_detection": ("ai_models/sensor_anomaly_detection/dnn_sensor_anomaly_detection_model.keras",
+                                 "ai_models/sensor_anomaly_detection/dnn_sensor_anomaly_detection_scaler.pkl"),
+    "production_qty": ("ai_models/production_qty/dnn_production_qty_model.keras",
+                       "ai_models/production_qty/dnn_production_qty_model_scaler.pkl"),
+    "work_time": ("ai_models/work_time/dnn_work_time_model.keras",
+                  "ai_models/work_time/dnn_work_time_model_scaler.pkl"),
+}
+
+# Keras 로 계산한 기준 입력/출력 (verify 용, reference 명령으로 생성)
+REFERENCE_PATH = "ai_models/numpy_inference_reference.npz"
+
+_ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "sigmoid": lambda x: 1.0 / (1.0 + np.exp(-x)),
+    "tanh": np.tanh,
+    "softmax": lambda x: np.exp(x - x.max(axis=1, keepdims=True)) / np.exp(x - x.max(axis=1, keepdims=True)).sum(axis=1, keepdims=True),
+}
+
+# 추론 시 항등 함수인 레이어
+_PASSTHROUGH_LAYERS = {"Dropout", "GaussianNoise", "GaussianDropout", "ActivityRegularization"}
+
+
+def npz_path_for(keras_path: str | Path) -> Path:
+    return Path(keras_path).with_suffix(".npz")
+
+
+class NumpyModel:
+    """Dense 레이어 DAG 를 NumPy 로 실행 (Keras model.predict 와 같은 입출력 형태)"""
+
+    def __init__(self, spec: dict, weights: dict):
+        self.input_name = spec["input"]
+        self.output_names = spec["outputs"]
+        self.layers = []
+        for layer in spec["layers"]:
+            W = weights.get(f"{layer['name']}/kernel")
+            b = weights.get(f"{layer['name']}/bias")
+            self.layers.append((layer["name"], layer["input"], W, b, _ACTIVATIONS[layer["activation"]]))
+
+    def predict(self, X, verbose=0, batch_size=None):
+        values = {self.input_name: np.asarray(X, dtype=np.float32)}
+        for name, src, W, b, activation in self.layers:
+            x = values[src]
+            if W is not None:
+                x = x @ W
+                if b is not None:
+                    x = x + b
+            values[name] = activation(x)
+        outputs = [values[name] for name in self.output_names]
+        return outputs[0] if len(outputs) == 1 else outputs
+
+    predict_on_batch = predict
+    __call__ = predict
+
+
+class NumpyStandardScaler:
+    """sklearn StandardScaler.transform 과 동일한 연산 (입력 검증 생략)"""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean_ = mean
+        self.scale_ = scale
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+
+def _read_graph(keras_path: Path) -> dict:
+    """.keras 의 config.json 에서 레이어 연결 구조 추출"""
+    with zipfile.ZipFile(keras_path) as zf:
+        config = json.loads(zf.read("config.json"))
+
+    model_config = config["config"]
+    layers = []
+    input_name = None
+    outputs = []
+
+    if config["class_name"] == "Sequential":
+        prev = None
+        for layer in model_config["layers"]:
+            cls, cfg = layer["class_name"], layer["config"]
+            if cls == "InputLayer":
+                input_name = prev = cfg["name"]
+                continue
+            if input_name is None:
+                input_name = prev = "input"
+            layers.append({"name": cfg["name"], "class": cls, "input": prev,
+                           "activation": cfg.get("activation", "linear")})
+            prev = cfg["name"]
+        outputs = [prev]
+    else:
+        for layer in model_config["layers"]:
+            cls, cfg = layer["class_name"], layer["config"]
+            if cls == "InputLayer":
+                input_name = cfg["name"]
+                continue
+            node = layer["inbound_nodes"][0]
+            tensors = [a for a in node["args"] if isinstance(a, dict) and a.get("class_name") == "__keras_tensor__"]
+            if len(tensors) != 1:
+                raise ValueError(f"단일 입력 레이어만 지원합니다: {cfg['name']}")
+            layers.append({"name": cfg["name"], "class": cls,
+                           "input": tensors[0]["config"]["keras_history"][0],
+                           "activation": cfg.get("activation", "linear")})
+        outputs = [o[0] for o in model_config["output_layers"]]
+
+    # model.weights.h5 의 레이어 그룹 이름: 레이어 이름이 아니라 클래스명(snake_case) + 순번 (dense, dense_1, ...)
+    counters = {}
+    for layer in layers:
+        base = re.sub(r"(?<!^)(?=[A-Z])", "_", layer["class"]).lower()
+        n = counters.get(base, 0)
+        counters[base] = n + 1
+        layer["weights"] = f"layers/{base}" if n == 0 else f"layers/{base}_{n}"
+
+    for layer in layers:
+        if layer["class"] != "Dense" and layer["class"] not in _PASSTHROUGH_LAYERS:
+            raise ValueError(f"지원하지 않는 레이어: {layer['class']} ({layer['name']})")
+        if layer["class"] in _PASSTHROUGH_LAYERS:
+            layer["activation"] = "linear"
+        if layer["activation"] not in _ACTIVATIONS:
+            raise ValueError(f"지원하지 않는 활성화 함수: {layer['activation']} ({layer['name']})")
+
+    return {"input": input_name, "outputs": outputs, "layers": layers}
+
+
+def _file_sha1(path: str | Path) -> str:
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+
+def _read_dense_weights(keras_path: Path, spec: dict) -> dict:
+    """model.weights.h5 에서 Dense 가중치 읽기 (vars/0: kernel, vars/1: bias) + 레이어 간 차원 검증"""
+    with zipfile.ZipFile(keras_path) as zf:
+        h5_bytes = zf.read("model.weights.h5")
+
+    arrays = {}
+    widths = {}
+    with h5py.File(io.BytesIO(h5_bytes), "r") as h5:
+        for layer in spec["layers"]:
+            width = widths.get(layer["input"])
+            if layer["class"] != "Dense":
+                widths[layer["name"]] = width
+                continue
+            group = h5[f"{layer['weights']}/vars"]
+            kernel = np.asarray(group["0"], dtype=np.float32)
+            if width is not None and kernel.shape[0] != width:
+                raise ValueError(f"가중치 차원 불일치: {layer['name']} ({layer['weights']}) "
+                                 f"입력 {width}, kernel {kernel.shape}")
+            arrays[f"{layer['name']}/kernel"] = kernel
+            if "1" in group:
+                arrays[f"{layer['name']}/bias"] = np.asarray(group["1"], dtype=np.float32)
+            widths[layer["name"]] = kernel.shape[1]
+    return arrays
+
+
+def export_keras_model(keras_path: str | Path, scaler_path: str | Path | None = None) -> Path:
+    """.keras (+ 스케일러) -> .npz 추출 (TensorFlow 불필요)"""
+    keras_path = Path(keras_path)
+    spec = _read_graph(keras_path)
+    arrays = _read_dense_weights(keras_path, spec)
+
+    spec["source"] = {"keras_sha1": _file_sha1(keras_path),
+                      "scaler_sha1": _file_sha1(scaler_path) if scaler_path is not None else None}
+    if scaler_path is not None:
+        scaler = joblib.load(scaler_path)
+        n = scaler.n_features_in_
+        mean = getattr(scaler, "mean_", None)
+        scale = getattr(scaler, "scale_", None)
+        arrays["scaler/mean"] = np.zeros(n) if mean is None else np.asarray(mean, dtype=np.float64)
+        arrays["scaler/scale"] = np.ones(n) if scale is None else np.asarray(scale, dtype=np.float64)
+
+    out = npz_path_for(keras_path)
+    np.savez(out, spec=np.array(json.dumps(spec)), **arrays)
+    print(f"{keras_path} -> {out}")
+    return out
+
+
+def _load_npz(npz_path: Path) -> tuple[NumpyModel, NumpyStandardScaler | None]:
+    with np.load(npz_path, allow_pickle=False) as data:
+        spec = json.loads(str(data["spec"]))
+        weights = {k: data[k] for k in data.files if k != "spec"}
+    scaler = None
+    if "scaler/mean" in weights:
+        scaler = NumpyStandardScaler(weights["scaler/mean"], weights["scaler/scale"])
+    return NumpyModel(spec, weights), scaler
+
+
+def _npz_is_fresh(keras_path: Path, scaler_path: str | Path | None) -> bool:
+    """.npz 가 현재 .keras/스케일러에서 추출된 것인지 (파일 해시 비교, git checkout 시각과 무관)"""
+    npz = npz_path_for(keras_path)
+    if not npz.exists():
+        return False
+    with np.load(npz, allow_pickle=False) as data:
+        source = json.loads(str(data["spec"])).get("source", {})
+    return (source.get("keras_sha1") == _file_sha1(keras_path)
+            and source.get("scaler_sha1") == (_file_sha1(scaler_path) if scaler_path is not None else None))
+
+
+def load_dnn_model(keras_path: str | Path, scaler_path: str | Path | None = None):
+    """
+    (모델, 스케일러) 로드
+    .npz 가 없거나 .keras/스케일러가 바뀌었으면 추출 후 로드.
+    추출/로드할 수 없으면 (지원하지 않는 레이어 등) RuntimeError (Keras 로 대체하지 않음)
+    """
+    keras_path = Path(keras_path)
+    try:
+        if not _npz_is_fresh(keras_path, scaler_path):
+            export_keras_model(keras_path, scaler_path)
+        model, scaler = _load_npz(npz_path_for(keras_path))
+        if scaler is None and scaler_path is not None:
+            scaler = joblib.load(scaler_path)
+    except Exception as e:
+        raise RuntimeError(f"NumPy 추론 모델 로드 실패 ({keras_path}): {e}") from e
+    return model, scaler
+
+
+# ---------------------------------------------------------------------------
+# 추출 / 검증 / 벤치마크 CLI
+# ---------------------------------------------------------------------------
+
+def _export_all():
+    for keras_path, scaler_path in MODEL_ARTIFACTS.values():
+        export_keras_model(keras_path, scaler_path)
+
+
+def _make_reference(n_rows: int = 500):
+    """Keras + sklearn 스케일러로 기준 입력/출력 생성 (TensorFlow 필요, 모델 재학습 후 1회)"""
+    from tensorflow import keras
+
+    rng = np.random.default_rng(0)
+    arrays = {}
+    for name, (keras_path, scaler_path) in MODEL_ARTIFACTS.items():
+        keras_model = keras.models.load_model(keras_path)
+        sk_scaler = joblib.load(scaler_path)
+
+        # 학습 분포 근처의 입력 생성
+        raw = sk_scaler.mean_ + rng.standard_normal((n_rows, sk_scaler.n_features_in_)) * sk_scaler.scale_
+        scaled = sk_scaler.transform(raw)
+        outputs = keras_model.predict(scaled, verbose=0)
+        outputs = outputs if isinstance(outputs, (list, tuple)) else [outputs]
+
+        arrays[f"{name}/input"] = raw
+        arrays[f"{name}/scaled"] = scaled
+        for i, out in enumerate(outputs):
+            arrays[f"{name}/output_{i}"] = np.asarray(out, dtype=np.float32)
+    np.savez_compressed(REFERENCE_PATH, **arrays)
+    print(f"기준 출력 저장: {REFERENCE_PATH}")
+
+
+def _verify_all(atol: float = 1e-4, rtol: float = 1e-4) -> bool:
+    """저장소의 .npz 추론 결과를 Keras 기준 출력과 비교 (TensorFlow 불필요)"""
+    ok = True
+    with np.load(REFERENCE_PATH, allow_pickle=False) as ref:
+        for name, (keras_path, scaler_path) in MODEL_ARTIFACTS.items():
+            keras_path = Path(keras_path)
+            if not _npz_is_fresh(keras_path, scaler_path):
+                print(f"[FAIL] {name}: .npz 가 현재 .keras/스케일러와 다름 (export 필요)")
+                ok = False
+                continue
+            np_model, np_scaler = _load_npz(npz_path_for(keras_path))
+
+            scaled = np_scaler.transform(ref[f"{name}/input"])
+            scaler_diff = float(np.max(np.abs(scaled - ref[f"{name}/scaled"])))
+            actual = np_model.predict(ref[f"{name}/scaled"])
+            actual = actual if isinstance(actual, (list, tuple)) else [actual]
+            expected = [ref[f"{name}/output_{i}"] for i in range(len(actual))]
+
+            model_ok = scaler_diff < 1e-9 and all(
+                e.shape == a.shape and np.allclose(e, a, atol=atol, rtol=rtol) for e, a in zip(expected, actual)
+            )
+            max_diff = max(float(np.max(np.abs(e - a))) for e, a in zip(expected, actual))
+            print(f"[{'OK' if model_ok else 'FAIL'}] {name}: max|keras-numpy|={max_diff:.2e}, "
+                  f"scaler diff={scaler_diff:.2e}, rows={len(scaled)}")
+            ok = ok and model_ok
+    return ok
+
+
+def _bench_all(n_calls: int = 200):
+    """단건(1행) 예측 지연시간: scaler.transform + predict (TensorFlow 가 있으면 Keras 와 비교)"""
+    try:
+        from tensorflow import keras
+    except ImportError:
+        keras = None
+
+    def timed(fn):
+        fn()  # warm-up
+        samples = []
+        for _ in range(n_calls):
+            started = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - started) * 1000)
+        return np.percentile(samples, [50, 99])
+
+    for name, (keras_path, scaler_path) in MODEL_ARTIFACTS.items():
+        np_model, np_scaler = _load_npz(npz_path_for(keras_path))
+        x = np_scaler.mean_.reshape(1, -1)
+        n50, n99 = timed(lambda: np_model.predict(np_scaler.transform(x)))
+        line = f"{name:26s} numpy p50={n50:8.4f}ms p99={n99:8.4f}ms"
+        if keras is not None:
+            keras_model = keras.models.load_model(keras_path)
+            sk_scaler = joblib.load(scaler_path)
+            k50, k99 = timed(lambda: keras_model.predict(sk_scaler.transform(x), verbose=0))
+            line += f" | keras p50={k50:8.3f}ms p99={k99:8.3f}ms | x{k50 / n50:,.0f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "export"
+    if command == "export":
+        _export_all()
+    elif command == "verify":
+        sys.exit(0 if _verify_all() else 1)
+    elif command == "bench":
+        _bench_all()
+    elif command == "reference":
+        _make_reference()
+    else:
+        print(__doc__)
+        sys.exit(2)
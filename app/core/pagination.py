@@ -0,0 +1,123 @@
+"""
+Keyset(커서) 페이지네이션 헬퍼
+
+OFFSET 대신 마지막 행의 정렬 키를 커서로 넘겨 다음 페이지를 조회한다.
+커서는 정렬 키 값 목록을 JSON -> base64url 로 인코딩한 문자열이다.
+"""
+import base64
+import json
+import os
+from datetime import date, datetime
+from uuid import UUID
+
+from sqlalchemy import tuple_, literal
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# 예상 건수가 이 값 이하일 때만 정확한 COUNT(*) 수행
+COUNT_EXACT_THRESHOLD = int(os.getenv("COUNT_EXACT_THRESHOLD", "10000"))
+
+
+def _to_json(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> list | None:
+    """잘못된 커서는 None (첫 페이지) 으로 처리"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+def clamp_page_size(limit_raw: str | int | None) -> int:
+    try:
+        limit = int(limit_raw) if limit_raw else DEFAULT_PAGE_SIZE
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def parse_datetime(raw: str | None) -> datetime | None:
+    """폼/쿼리 문자열 -> datetime (빈 값/형식 오류는 None)"""
+    if not raw:
+        return None
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        return None
+
+
+def decode_keyset(cursor: str | None, columns: list) -> list | None:
+    """커서 -> 정렬 컬럼 타입에 맞게 변환한 값 목록 (형식이 맞지 않으면 None)"""
+    values = decode_cursor(cursor)
+    if values is None or len(values) != len(columns):
+        return None
+    out = []
+    try:
+        for value, col in zip(values, columns):
+            python_type = col.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is UUID:
+                value = UUID(value)
+            out.append(value)
+    except (TypeError, ValueError, NotImplementedError):
+        return None
+    return out
+
+
+def keyset_after(columns: list, values: list, descending: bool):
+    """(정렬 컬럼들) 이 커서 값 다음인 행 조건 (row value 비교로 복합 인덱스 사용)"""
+    left = tuple_(*columns)
+    right = tuple_(*[literal(v, col.type) for v, col in zip(values, columns)])
+    return left < right if descending else left > right
+
+
+def paginate(query: Query, columns: list, descending: bool, cursor: str | None, limit: int) -> tuple[list, str | None]:
+    """keyset 페이지 조회: (이번 페이지 행, 다음 페이지 커서)"""
+    after = decode_keyset(cursor, columns)
+    if after is not None:
+        query = query.filter(keyset_after(columns, after, descending))
+    order = [col.desc() if descending else col.asc() for col in columns]
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_next:
+        last = rows[-1]
+        next_cursor = encode_cursor(*[getattr(last, col.key) for col in columns])
+    return rows, next_cursor
+
+
+def count_total(db, query: Query) -> tuple[int, bool]:
+    """
+    전체 건수: (건수, 추정치 여부)
+    플래너 예상 행 수(EXPLAIN)가 COUNT_EXACT_THRESHOLD 이하면 정확히 세고,
+    그보다 크면 예상치를 그대로 반환해 매 조회마다 전체 COUNT(*) 를 하지 않는다.
+    """
+    stmt = query.order_by(None).statement
+    compiled = stmt.compile(dialect=db.get_bind().dialect)
+    plan = db.connection().exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+    ).scalar()
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    if estimate <= COUNT_EXACT_THRESHOLD:
+        return query.order_by(None).count(), False
+    return estimate, True
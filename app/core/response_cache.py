@@ -0,0 +1,87 @@
+"""
+응답 캐시 (데이터 버전 + TTL, ETag)
+
+계산 결과를 캐시한 시점의 데이터 버전(core/data_version.py)과 함께 저장하고,
+버전이 바뀌었거나 TTL 이 지나면 다시 계산한다.
+동시에 여러 요청이 캐시 미스를 만나면 한 요청만 계산하고 나머지는 그 결과를 기다린다 (single-flight).
+ETag 는 결과 JSON 의 해시라서 같은 프로세스에서 다시 계산해도 내용이 같으면 그대로 유지된다 (폴링 화면은 304).
+"""
+import hashlib
+import json
+import threading
+import time
+
+from core.data_version import get_data_version
+
+
+class ResponseCache:
+
+    def __init__(self, name: str, ttl_sec: float, versioned: bool = True):
+        self.name = name
+        self.ttl_sec = ttl_sec
+        self.versioned = versioned    # False 면 데이터 버전과 무관하게 TTL 로만 갱신 (AI 예측 등 비싼 계산)
+        self._entry = None            # (데이터 버전, 만료 시각, 결과, ETag)
+        self._compute_lock = threading.Lock()
+        # 프로세스마다 다른 값 (재배포로 템플릿이 바뀌었는데 이전 ETag 로 304 가 나가지 않도록)
+        self._etag_salt = f"{name}:{time.time_ns()}"
+
+        # 지표
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._not_modified = 0
+        self._last_compute_ms = 0.0
+
+    def _fresh(self, entry) -> bool:
+        return (entry is not None and entry[1] > time.monotonic()
+                and (not self.versioned or entry[0] == get_data_version()))
+
+    def get(self, compute_fn) -> tuple:
+        """캐시된 (결과, ETag) 반환, 없거나 오래됐으면 compute_fn() 으로 다시 계산"""
+        entry = self._entry
+        if self._fresh(entry):
+            self._hits += 1
+            return entry[2], entry[3]
+
+        with self._compute_lock:
+            # 기다리는 동안 다른 요청이 계산을 끝냈으면 그 결과 사용
+            entry = self._entry
+            if self._fresh(entry):
+                self._coalesced += 1
+                return entry[2], entry[3]
+
+            self._misses += 1
+            version = get_data_version()   # 계산 중 쓰기가 있으면 다음 요청에서 다시 계산됨
+            started = time.monotonic()
+            data = compute_fn()
+            self._last_compute_ms = (time.monotonic() - started) * 1000
+
+            body = json.dumps(data, sort_keys=True, default=str, ensure_ascii=False)
+            etag = f'"{hashlib.sha1((self._etag_salt + body).encode()).hexdigest()}"'
+            self._entry = (version, time.monotonic() + self.ttl_sec, data, etag)
+            return data, etag
+
+    @staticmethod
+    def etag_matches(if_none_match: str | None, etag: str) -> bool:
+        if not if_none_match:
+            return False
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    def count_not_modified(self):
+        self._not_modified += 1
+
+    def invalidate(self):
+        self._entry = None
+
+    def get_metrics(self) -> dict:
+        lookups = self._hits + self._coalesced + self._misses
+        return {
+            "ttl_sec": self.ttl_sec,
+            "hits": self._hits,
+            "coalesced": self._coalesced,
+            "misses": self._misses,
+            "hit_rate": round((self._hits + self._coalesced) / lookups, 4) if lookups else 0.0,
+            "not_modified": self._not_modified,
+            "last_compute_ms": round(self._last_compute_ms, 2),
+        }
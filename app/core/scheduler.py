@@ -0,0 +1,94 @@
+"""
+주기 작업 실행기
+
+파티션 관리, 롤업 재집계 등 서버 내부 주기 작업을 백그라운드 스레드로 실행한다.
+"""
+import threading
+import time
+from typing import Callable
+
+from core.metrics import register_metrics
+
+
+class PeriodicJob:
+
+    def __init__(self, name: str, interval_sec: float, func: Callable[[], None], run_on_start: bool = True):
+        self.name = name
+        self.interval_sec = interval_sec
+        self.func = func
+        self.run_on_start = run_on_start
+
+        self._stop = threading.Event()
+        self._thread = None
+
+        # 지표
+        self.run_count = 0
+        self.error_count = 0
+        self.last_run_ts = None
+        self.last_duration_ms = 0.0
+        self.last_error = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"job-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self):
+        started = time.monotonic()
+        try:
+            self.func()
+            self.last_error = None
+        except Exception as e:
+            self.error_count += 1
+            self.last_error = str(e)
+            print(f"주기 작업 실패 ({self.name}): {e}")
+        finally:
+            self.run_count += 1
+            self.last_run_ts = time.time()
+            self.last_duration_ms = (time.monotonic() - started) * 1000
+
+    def _run(self):
+        if self.run_on_start:
+            self.run_once()
+        while not self._stop.wait(self.interval_sec):
+            self.run_once()
+
+    def get_metrics(self) -> dict:
+        return {
+            "interval_sec": self.interval_sec,
+            "run_count": self.run_count,
+            "error_count": self.error_count,
+            "last_run_ts": self.last_run_ts,
+            "last_duration_ms": round(self.last_duration_ms, 2),
+            "last_error": self.last_error,
+        }
+
+
+_jobs: dict[str, PeriodicJob] = {}
+
+
+def schedule_job(name: str, interval_sec: float, func: Callable[[], None], run_on_start: bool = True) -> PeriodicJob:
+    """주기 작업 등록 (start_jobs() 호출 시 실행 시작)"""
+    job = PeriodicJob(name, interval_sec, func, run_on_start)
+    _jobs[name] = job
+    return job
+
+
+def start_jobs():
+    for job in _jobs.values():
+        job.start()
+    print(f"주기 작업 {len(_jobs)}개 시작")
+
+
+def stop_jobs():
+    for job in _jobs.values():
+        job.stop()
+
+
+register_metrics("jobs", lambda: {name: job.get_metrics() for name, job in _jobs.items()})
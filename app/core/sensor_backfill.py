@@ -0,0 +1,265 @@
+"""
+센서 이력 대량 적재 (CSV / Parquet -> equipment_sensor_data)
+
+HTTP 재전송 대신 파일을 청크 단위로 읽어 PostgreSQL COPY FROM STDIN 으로 적재한다.
+- 청크 크기만큼만 메모리에 올림 (수백만 행 파일도 메모리 사용량 일정)
+- master_equipment 에 없는 설비, 시각 파싱 실패, 보존기간 경과 데이터는 건너뛰고 건수 집계
+- 청크마다 COPY 와 진행 상태(sensor_backfill_checkpoint) 갱신을 한 트랜잭션으로 커밋
+  -> 중단 후 같은 명령을 다시 실행하면 마지막 커밋 지점부터 이어서 적재 (중복 없음)
+- 적재 완료 후 해당 시각 범위의 1분/1시간 롤업을 재집계
+
+사용법 (app 디렉토리에서):
+    python -m core.sensor_backfill /data/equipment_sensor_data.csv
+    python -m core.sensor_backfill /data/sensor_2024.parquet --chunk-size 200000
+    python -m core.sensor_backfill /data/equipment_sensor_data.csv --restart   # 진행 상태 무시하고 처음부터
+
+파일 컬럼: timestamp, equipment_id, temperature, vibration, current, rpm, pressure [, status]
+(Parquet 은 pyarrow 필요)
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from core.database import engine, SessionLocal
+from core.sensor_partition import ensure_sensor_partitions_for, retention_cutoff
+from models.master_equipment import MasterEquipment
+from models.sensor_backfill_checkpoint import SensorBackfillCheckpoint
+from services.sensor_rollup import reaggregate_sensor_rollups
+
+SENSOR_BACKFILL_CHUNK_SIZE = int(os.getenv("SENSOR_BACKFILL_CHUNK_SIZE", "50000"))
+
+METRICS = ["temperature", "vibration", "current", "rpm", "pressure"]
+COPY_COLUMNS = ["sensor_id", "timestamp", "equipment_id", *METRICS, "status"]
+COPY_SQL = (
+    f"COPY equipment_sensor_data ({', '.join(COPY_COLUMNS)}) "
+    "FROM STDIN WITH (FORMAT csv, NULL '')"
+)
+
+
+def source_key(path: str) -> str:
+    """같은 파일인지 판별하는 키 (내용이 바뀌면 새 작업으로 취급)"""
+    st = os.stat(path)
+    return f"{os.path.abspath(path)}:{st.st_size}:{int(st.st_mtime)}"
+
+
+def count_rows(path: str) -> int | None:
+    """전체 행 수 (진행률 표시용)"""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+    lines = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            lines += block.count(b"\n")
+    return max(lines - 1, 0)   # 헤더 제외 (마지막 줄 개행 없는 경우 1행 차이는 무시)
+
+
+def iter_chunks(path: str, skip_rows: int, chunk_size: int):
+    """skip_rows 행 이후부터 chunk_size 단위 DataFrame 반환"""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        skipped = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            df = batch.to_pandas()
+            if skipped + len(df) <= skip_rows:
+                skipped += len(df)
+                continue
+            if skipped < skip_rows:
+                df = df.iloc[skip_rows - skipped:]
+                skipped = skip_rows
+            yield df
+        return
+
+    reader = pd.read_csv(
+        path,
+        chunksize=chunk_size,
+        skiprows=range(1, skip_rows + 1) if skip_rows else None,
+        dtype={"equipment_id": str},
+    )
+    for df in reader:
+        yield df
+
+
+def prepare_chunk(df: pd.DataFrame, known_equipment: set, cutoff) -> tuple[pd.DataFrame, dict]:
+    """청크 정제: 컬럼 타입 변환, 거부 행 제외, COPY 컬럼 순서로 정렬"""
+    if "timestamp" not in df.columns or "equipment_id" not in df.columns:
+        raise ValueError("파일에 timestamp, equipment_id 컬럼이 필요합니다.")
+
+    rejected = {}
+    ts = pd.to_datetime(df["timestamp"], errors="coerce")
+    if getattr(ts.dt, "tz", None) is not None:
+        ts = ts.dt.tz_localize(None)
+
+    bad_ts = ts.isna()
+    unknown = ~df["equipment_id"].isin(known_equipment) & ~bad_ts
+    expired = (ts.dt.date < cutoff) & ~bad_ts & ~unknown if cutoff is not None else None
+
+    keep = ~bad_ts & ~unknown
+    rejected["invalid timestamp"] = int(bad_ts.sum())
+    rejected["unknown equipment_id"] = int(unknown.sum())
+    if expired is not None:
+        keep &= ~expired
+        rejected["outside retention"] = int(expired.sum())
+
+    out = pd.DataFrame({"timestamp": ts[keep], "equipment_id": df.loc[keep, "equipment_id"]})
+    for m in METRICS:
+        col = pd.to_numeric(df.loc[keep, m], errors="coerce") if m in df.columns else None
+        if m == "rpm" and col is not None:
+            col = col.round().astype("Int64")
+        out[m] = col
+    if "status" in df.columns:
+        out["status"] = df.loc[keep, "status"].map(
+            lambda v: None if pd.isna(v) else str(v).strip().lower() in ("1", "true", "t", "y")
+        )
+    else:
+        out["status"] = None
+    out.insert(0, "sensor_id", [uuid.uuid4() for _ in range(len(out))])
+    return out[COPY_COLUMNS], {k: v for k, v in rejected.items() if v}
+
+
+def copy_chunk(cursor, df: pd.DataFrame):
+    buf = io.StringIO()
+    df.to_csv(buf, index=False, header=False, date_format="%Y-%m-%d %H:%M:%S.%f")
+    buf.seek(0)
+    cursor.copy_expert(COPY_SQL, buf)
+
+
+def save_checkpoint(cursor, key: str, values: dict):
+    stmt = pg_insert(SensorBackfillCheckpoint).values(source_key=key, updated_at=datetime.now(), **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["source_key"],
+        set_={**values, "updated_at": stmt.excluded.updated_at},
+    )
+    compiled = stmt.compile(dialect=engine.dialect)
+    cursor.execute(str(compiled), compiled.params)
+
+
+def reaggregate_range(start: datetime, end: datetime):
+    """적재된 범위의 롤업 재집계 (일 단위로 나눠 한 번에 처리하는 양을 제한)"""
+    db = SessionLocal()
+    try:
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day <= end:
+            reaggregate_sensor_rollups(db, max(day, start), min(day + timedelta(days=1), end + timedelta(microseconds=1)))
+            day += timedelta(days=1)
+    finally:
+        db.close()
+
+
+def backfill(path: str, chunk_size: int = SENSOR_BACKFILL_CHUNK_SIZE, restart: bool = False):
+    key = source_key(path)
+    db = SessionLocal()
+    try:
+        known_equipment = {r.equipment_id for r in db.query(MasterEquipment.equipment_id).all()}
+        checkpoint = db.get(SensorBackfillCheckpoint, key)
+        if checkpoint is not None and restart:
+            db.delete(checkpoint)
+            db.commit()
+            checkpoint = None
+    finally:
+        db.close()
+
+    if checkpoint is not None and checkpoint.completed:
+        print(f"이미 적재 완료된 파일입니다: {path} ({checkpoint.rows_loaded}건). 다시 적재하려면 --restart")
+        return
+
+    state = {
+        "rows_done": checkpoint.rows_done if checkpoint else 0,
+        "rows_loaded": checkpoint.rows_loaded if checkpoint else 0,
+        "rows_rejected": checkpoint.rows_rejected if checkpoint else 0,
+        "min_ts": checkpoint.min_ts if checkpoint else None,
+        "max_ts": checkpoint.max_ts if checkpoint else None,
+        "completed": False,
+    }
+    total = count_rows(path)
+    cutoff = retention_cutoff()
+    reasons = {}
+    if state["rows_done"]:
+        print(f"{state['rows_done']:,}행까지 적재된 상태에서 이어서 진행합니다.")
+
+    started = time.monotonic()
+    run_rows = 0
+    raw = engine.raw_connection()
+    try:
+        for df in iter_chunks(path, state["rows_done"], chunk_size):
+            rows, rejected = prepare_chunk(df, known_equipment, cutoff)
+            for reason, n in rejected.items():
+                reasons[reason] = reasons.get(reason, 0) + n
+
+            if len(rows):
+                # 파티션 DDL 은 별도 트랜잭션 (COPY 전에 커밋되어 있어야 함)
+                ensure_sensor_partitions_for(
+                    datetime.combine(d, datetime.min.time()) for d in rows["timestamp"].dt.date.unique()
+                )
+                lo, hi = rows["timestamp"].min().to_pydatetime(), rows["timestamp"].max().to_pydatetime()
+                state["min_ts"] = lo if state["min_ts"] is None else min(state["min_ts"], lo)
+                state["max_ts"] = hi if state["max_ts"] is None else max(state["max_ts"], hi)
+
+            state["rows_done"] += len(df)
+            state["rows_loaded"] += len(rows)
+            state["rows_rejected"] += len(df) - len(rows)
+
+            # COPY + 진행 상태를 한 트랜잭션으로 커밋
+            cursor = raw.cursor()
+            try:
+                if len(rows):
+                    copy_chunk(cursor, rows)
+                save_checkpoint(cursor, key, state)
+                raw.commit()
+            except Exception:
+                raw.rollback()
+                raise
+            finally:
+                cursor.close()
+
+            run_rows += len(df)
+            elapsed = time.monotonic() - started
+            rate = run_rows / elapsed if elapsed > 0 else 0
+            progress = f"{state['rows_done']:,}/{total:,} ({state['rows_done'] / total * 100:.1f}%)" \
+                if total else f"{state['rows_done']:,}"
+            eta = f", 남은 시간 {(total - state['rows_done']) / rate:.0f}초" if total and rate else ""
+            print(f"[backfill] {progress} 적재 {state['rows_loaded']:,} 거부 {state['rows_rejected']:,} "
+                  f"| {rate:,.0f} rows/s{eta}", flush=True)
+    finally:
+        raw.close()
+
+    # 롤업 재집계 + 통계 갱신 후 완료 표시
+    if state["min_ts"] is not None:
+        print(f"롤업 재집계: {state['min_ts']} ~ {state['max_ts']}")
+        reaggregate_range(state["min_ts"], state["max_ts"])
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE equipment_sensor_data"))
+
+    db = SessionLocal()
+    try:
+        db.query(SensorBackfillCheckpoint).filter(SensorBackfillCheckpoint.source_key == key) \
+            .update({"completed": True, "updated_at": datetime.now()})
+        db.commit()
+    finally:
+        db.close()
+
+    print(f"백필 완료: {state['rows_loaded']:,}건 적재, {state['rows_rejected']:,}건 거부 "
+          f"({time.monotonic() - started:.1f}초)")
+    for reason, n in reasons.items():
+        print(f"  - {reason}: {n:,}건")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="센서 이력 대량 적재 (COPY)")
+    parser.add_argument("path", help="CSV 또는 Parquet 파일 경로")
+    parser.add_argument("--chunk-size", type=int, default=SENSOR_BACKFILL_CHUNK_SIZE)
+    parser.add_argument("--restart", action="store_true", help="진행 상태를 지우고 처음부터 적재")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"파일이 없습니다: {args.path}")
+        sys.exit(2)
+    backfill(args.path, args.chunk_size, args.restart)
@@ -0,0 +1,180 @@
+"""
+equipment_sensor_data 일 단위 파티션 관리
+
+- 오늘 기준 SENSOR_PARTITION_DAYS_AHEAD 일 앞까지 파티션을 미리 생성
+- SENSOR_RETENTION_DAYS 보다 오래된 파티션은 DELETE 대신 DROP TABLE 로 삭제
+- 적재 시점에 파티션이 없는 날짜(과거 데이터 백필 등)는 ensure_sensor_partitions_for() 로 생성
+
+사용법 (app 디렉토리에서):
+    python -m core.sensor_partition maintain   # 파티션 생성 + 보존기간 경과 파티션 삭제
+    python -m core.sensor_partition migrate    # 기존 일반 테이블을 파티션 테이블로 전환
+"""
+import os
+import sys
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from core.database import engine
+
+PARENT_TABLE = "equipment_sensor_data"
+PARTITION_PREFIX = f"{PARENT_TABLE}_p"
+
+SENSOR_PARTITION_DAYS_AHEAD = int(os.getenv("SENSOR_PARTITION_DAYS_AHEAD", "7"))   # 미리 만들어 둘 일수
+SENSOR_RETENTION_DAYS = int(os.getenv("SENSOR_RETENTION_DAYS", "90"))              # 보존 일수 (0이면 무기한)
+
+# 이미 존재하는 파티션 날짜 캐시 (적재 경로에서 매번 카탈로그를 조회하지 않도록)
+_known_partitions: set[date] = set()
+_lock = threading.Lock()
+
+
+def partition_name(day: date) -> str:
+    return f"{PARTITION_PREFIX}{day.strftime('%Y%m%d')}"
+
+
+def retention_cutoff() -> date | None:
+    """보존기간 시작일 (이 날짜 이전 데이터는 보관하지 않음)"""
+    if SENSOR_RETENTION_DAYS <= 0:
+        return None
+    return date.today() - timedelta(days=SENSOR_RETENTION_DAYS)
+
+
+def partition_day(ts: datetime) -> date:
+    """측정 시각이 들어갈 파티션 날짜 (naive UTC 로 저장되는 값 기준, 시간대가 있으면 UTC 로 변환)"""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc)
+    return ts.date()
+
+
+def is_within_retention(ts: datetime) -> bool:
+    cutoff = retention_cutoff()
+    return cutoff is None or partition_day(ts) >= cutoff
+
+
+def is_partitioned(conn: Connection) -> bool:
+    return bool(conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+    ), {"name": PARENT_TABLE}).scalar())
+
+
+def list_partitions(conn: Connection) -> dict[date, str]:
+    """현재 파티션 목록 {날짜: 테이블명}"""
+    rows = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :name AND pg_table_is_visible(p.oid)"
+    ), {"name": PARENT_TABLE}).scalars().all()
+
+    partitions = {}
+    for name in rows:
+        suffix = name[len(PARTITION_PREFIX):] if name.startswith(PARTITION_PREFIX) else ""
+        try:
+            partitions[datetime.strptime(suffix, "%Y%m%d").date()] = name
+        except ValueError:
+            continue
+    return partitions
+
+
+def _create_partitions(conn: Connection, days: Iterable[date]) -> int:
+    created = 0
+    for day in sorted(set(days)):
+        if day in _known_partitions:
+            continue
+        conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{partition_name(day)}" PARTITION OF {PARENT_TABLE} '
+            f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+        ))
+        _known_partitions.add(day)
+        created += 1
+    return created
+
+
+def ensure_sensor_partitions_for(timestamps: Iterable[datetime]):
+    """적재할 데이터의 날짜에 해당하는 파티션이 없으면 생성"""
+    days = {partition_day(ts) for ts in timestamps}
+    missing = days - _known_partitions
+    if not missing:
+        return
+    with _lock:
+        with engine.begin() as conn:
+            if not is_partitioned(conn):
+                return
+            _known_partitions.update(list_partitions(conn).keys())
+            _create_partitions(conn, missing)
+
+
+def maintain_sensor_partitions():
+    """파티션 사전 생성 + 보존기간 경과 파티션 삭제 (주기 작업)"""
+    with _lock:
+        with engine.begin() as conn:
+            if not is_partitioned(conn):
+                print(f"{PARENT_TABLE} 테이블이 파티션 테이블이 아닙니다. "
+                      f"'python -m core.sensor_partition migrate' 로 전환하세요.")
+                return
+
+            existing = list_partitions(conn)
+            _known_partitions.clear()
+            _known_partitions.update(existing.keys())
+
+            # 1) 어제 ~ N일 후 파티션 생성
+            today = date.today()
+            created = _create_partitions(
+                conn, (today + timedelta(days=d) for d in range(-1, SENSOR_PARTITION_DAYS_AHEAD + 1))
+            )
+
+            # 2) 보존기간이 지난 파티션 삭제
+            dropped = 0
+            cutoff = retention_cutoff()
+            if cutoff is not None:
+                for day, name in existing.items():
+                    if day < cutoff:
+                        conn.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+                        _known_partitions.discard(day)
+                        dropped += 1
+
+    if created or dropped:
+        print(f"센서 파티션 관리: {created}개 생성, {dropped}개 삭제")
+
+
+def migrate_legacy_sensor_table():
+    """기존 일반(heap) 테이블을 파티션 테이블로 전환 (데이터 복사)"""
+    from models.equipment_sensor_data import EquipmentSensorData
+
+    legacy = f"{PARENT_TABLE}_legacy"
+    with engine.begin() as conn:
+        if is_partitioned(conn):
+            print("이미 파티션 테이블입니다.")
+            return
+
+        bounds = conn.execute(text(f'SELECT min("timestamp"), max("timestamp") FROM {PARENT_TABLE}')).first()
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} RENAME TO {legacy}"))
+        conn.execute(text(f"ALTER TABLE {legacy} RENAME CONSTRAINT {PARENT_TABLE}_pkey TO {legacy}_pkey"))
+        EquipmentSensorData.__table__.create(bind=conn)
+
+        _known_partitions.clear()
+        cutoff = retention_cutoff()
+        if bounds[0] is not None:
+            start = bounds[0].date() if cutoff is None else max(bounds[0].date(), cutoff)
+            end = bounds[1].date()
+            _create_partitions(conn, (start + timedelta(days=d) for d in range((end - start).days + 1)))
+
+        copy_filter = "" if cutoff is None else f"WHERE \"timestamp\" >= '{cutoff.isoformat()}'"
+        result = conn.execute(text(f"INSERT INTO {PARENT_TABLE} SELECT * FROM {legacy} {copy_filter}"))
+        conn.execute(text(f"DROP TABLE {legacy}"))
+        print(f"{PARENT_TABLE} 파티션 전환 완료 ({result.rowcount}건 이관)")
+
+    maintain_sensor_partitions()
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "maintain"
+    if command == "migrate":
+        migrate_legacy_sensor_table()
+    else:
+        maintain_sensor_partitions()
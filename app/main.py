@@ -8,6 +8,10 @@ from core.templates import templates
 from core.init_database import create_tables
 from core.init_master_data import seed_master_data
 from core.load_ai_resource import setup_global_ai_assets
+from core.metrics import collect_metrics
+from core.scheduler import schedule_job, start_jobs, stop_jobs
+from core.sensor_partition import maintain_sensor_partitions
+from services.sensor_rollup import reaggregate_recent_sensor_rollups
 # 라우터 등록
 from routers import work
 from routers import dashboard
@@ -21,7 +25,24 @@ app = FastAPI(title="MES Project")
 def startup_event():
     create_tables()
     seed_master_data()
+    # 대시보드 집계 테이블 최초 생성 (이후에는 작업지시/실적 쓰기와 함께 갱신)
+    from services.dashboard_summary import init_dashboard_summary
+    init_dashboard_summary()
+    # 센서 데이터 파티션 생성 + 보존기간 관리 (1시간 주기)
+    maintain_sensor_partitions()
+    schedule_job("sensor_partitions", 3600, maintain_sensor_partitions, run_on_start=False)
+    # 지연 도착 센서 데이터 롤업 재집계 (10분 주기)
+    schedule_job("sensor_rollups", 600, reaggregate_recent_sensor_rollups)
     setup_global_ai_assets(app)
+    from services.sensor_anomaly import init_sensor_anomaly_scorer
+    init_sensor_anomaly_scorer(getattr(app.state, "ai_models", {}))
+    from services.inference_broker import init_delivery_quality_broker
+    init_delivery_quality_broker(getattr(app.state, "ai_models", {}))
+    # 미완료 작업지시 납기/품질 재예측 (기본 1시간 주기)
+    from services.order_rescoring import init_order_rescorer, ORDER_RESCORE_INTERVAL_SEC
+    rescorer = init_order_rescorer(getattr(app.state, "ai_models", {}))
+    if rescorer is not None:
+        schedule_job("order_rescoring", ORDER_RESCORE_INTERVAL_SEC, rescorer.run)
     print("데이터베이스 테이블 초기화 완료")
     from services.ai_production_qty_prediction import get_production_qty_sklearn_service, get_production_qty_tensorflow_service
     get_production_qty_sklearn_service()
@@ -29,6 +50,29 @@ def startup_event():
     from services.ai_work_time_prediction import get_work_time_sklearn_service, get_work_time_tensorflow_service
     get_work_time_sklearn_service()
     get_work_time_tensorflow_service()
+    from services.sensor_ingest import get_sensor_ingest_buffer
+    get_sensor_ingest_buffer().start()
+    start_jobs()
+
+
+@app.on_event("startup")
+async def attach_event_loop():
+    # 스레드(적재 경로)에서 SSE 구독자를 깨울 수 있도록 이벤트 루프 연결
+    import asyncio
+    from services.sensor_stream import get_sensor_stream_hub
+    get_sensor_stream_hub().attach_loop(asyncio.get_running_loop())
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    # 버퍼에 남은 센서 데이터 기록 후 종료
+    from services.sensor_ingest import get_sensor_ingest_buffer
+    get_sensor_ingest_buffer().stop()
+    from services.inference_broker import get_delivery_quality_broker
+    broker = get_delivery_quality_broker()
+    if broker is not None:
+        broker.stop()
+    stop_jobs()
     
 
 @app.get("/", response_class=HTMLResponse)
@@ -42,6 +86,11 @@ def health():
 		# 해당 요청((http://localhost:8000/health/)에 대해 JSON 형식의 응답을 반환
     return {"status": "ok"}
 
+# 운영 지표 (버퍼 깊이, 배치 크기, 지연 등)
+@app.get("/metrics")
+def metrics():
+    return collect_metrics()
+
 # DB 헬스 체크 엔드포인트
 @app.get("/db-health")
 def db_health(db: Session = Depends(get_db)):
@@ -0,0 +1,62 @@
+from sqlalchemy import Column, String, Integer, BigInteger, Float, Date
+
+from core.database import Base
+
+# 대시보드 집계 테이블
+# 작업지시/실적을 쓰는 트랜잭션 안에서 증감(delta)으로 갱신 (services/dashboard_summary.py)
+
+
+class DashboardStatusCount(Base):
+    """상태별 작업지시 건수"""
+    __tablename__ = "dashboard_status_counts"
+
+    status = Column(String(20), primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+
+
+class DashboardProductTotal(Base):
+    """제품별 작업지시 건수/수량"""
+    __tablename__ = "dashboard_product_totals"
+
+    product_id = Column(String(100), primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    total_qty = Column(BigInteger, nullable=False, default=0)
+
+
+class DashboardOperationTotal(Base):
+    """
+    공정별 실적 건수/작업시간 합계 + 표준시간 대비 편차율 합계
+    평균은 time_sec_sum / result_count, deviation_sum / deviation_count (표준시간 없는 실적은 편차 제외)
+    """
+    __tablename__ = "dashboard_operation_totals"
+
+    operation_seq = Column(Integer, primary_key=True)
+    result_count = Column(Integer, nullable=False, default=0)
+    time_sec_sum = Column(Float, nullable=False, default=0)
+    deviation_count = Column(Integer, nullable=False, default=0)
+    deviation_sum = Column(Float, nullable=False, default=0)
+
+
+class DashboardEquipmentCount(Base):
+    """설비별 실적 건수"""
+    __tablename__ = "dashboard_equipment_counts"
+
+    equipment_id = Column(String(50), primary_key=True)
+    result_count = Column(Integer, nullable=False, default=0)
+
+
+class DashboardDailyProduction(Base):
+    """완료일별 생산량 (S5_DONE 작업지시의 end_ts 날짜 기준)"""
+    __tablename__ = "dashboard_daily_production"
+
+    prod_date = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    total_qty = Column(BigInteger, nullable=False, default=0)
+
+
+class DashboardDeviationBin(Base):
+    """편차율 히스토그램 구간별 실적 건수 (구간 정의: services/dashboard_summary.DEVIATION_BINS)"""
+    __tablename__ = "dashboard_deviation_bins"
+
+    bin_index = Column(Integer, primary_key=True)
+    result_count = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Text, Boolean, PrimaryKeyConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
@@ -9,7 +9,7 @@ from core.database import Base
 class EquipmentSensorData(Base):
     __tablename__ = "equipment_sensor_data"
 
-    sensor_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    sensor_id = Column(UUID(as_uuid=True), nullable=False, default=uuid.uuid4)
     timestamp = Column(DateTime, nullable=False)
     equipment_id = Column(String(50), ForeignKey("master_equipment.equipment_id"), nullable=False)
     temperature = Column(Float, nullable=True)      # 온도 (°C)
@@ -18,3 +18,16 @@ class EquipmentSensorData(Base):
     rpm = Column(Integer, nullable=True)            # RPM
     pressure = Column(Float, nullable=True)         # 압력 (bar)
     status = Column(Boolean, nullable=True)         # 상태 (0: 정상, 1: 이상)
+
+    # 일 단위 RANGE 파티션 (파티션 생성/삭제는 core/sensor_partition.py)
+    # 파티션 테이블의 PK에는 파티션 키가 포함되어야 함
+    __table_args__ = (
+        PrimaryKeyConstraint("sensor_id", "timestamp", name="pk_equipment_sensor_data"),
+        # 목록 keyset 페이지네이션 / 설비별 시간 구간 조회용
+        Index("ix_equipment_sensor_data_ts_id", "timestamp", "sensor_id"),
+        Index("ix_equipment_sensor_data_equipment_ts", "equipment_id", "timestamp", "sensor_id"),
+        # 이상 데이터만 조회하는 경우 (부분 인덱스)
+        Index("ix_equipment_sensor_data_anomaly_ts", "timestamp", "sensor_id",
+              postgresql_where=text("status IS TRUE")),
+        {"postgresql_partition_by": 'RANGE ("timestamp")'},
+    )
@@ -0,0 +1,48 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime
+
+from core.database import Base
+
+
+class SensorRollupMixin:
+    """
+    설비별 시간 구간 센서 집계 (min/max/sum/count)
+    평균은 sum / cnt 로 계산 (측정값이 NULL인 행은 cnt에서 제외)
+    """
+
+    equipment_id = Column(String(50), primary_key=True)
+    bucket_ts = Column(DateTime, primary_key=True)            # 구간 시작 시각
+    sample_count = Column(Integer, nullable=False, default=0)  # 구간 내 전체 측정 건수
+
+    # 온도 (°C)
+    temperature_min = Column(Float, nullable=True)
+    temperature_max = Column(Float, nullable=True)
+    temperature_sum = Column(Float, nullable=True)
+    temperature_cnt = Column(Integer, nullable=False, default=0)
+    # 진동
+    vibration_min = Column(Float, nullable=True)
+    vibration_max = Column(Float, nullable=True)
+    vibration_sum = Column(Float, nullable=True)
+    vibration_cnt = Column(Integer, nullable=False, default=0)
+    # 전류 (A)
+    current_min = Column(Float, nullable=True)
+    current_max = Column(Float, nullable=True)
+    current_sum = Column(Float, nullable=True)
+    current_cnt = Column(Integer, nullable=False, default=0)
+    # RPM
+    rpm_min = Column(Float, nullable=True)
+    rpm_max = Column(Float, nullable=True)
+    rpm_sum = Column(Float, nullable=True)
+    rpm_cnt = Column(Integer, nullable=False, default=0)
+    # 압력 (bar)
+    pressure_min = Column(Float, nullable=True)
+    pressure_max = Column(Float, nullable=True)
+    pressure_sum = Column(Float, nullable=True)
+    pressure_cnt = Column(Integer, nullable=False, default=0)
+
+
+class EquipmentSensorRollup1m(SensorRollupMixin, Base):
+    __tablename__ = "equipment_sensor_rollup_1m"
+
+
+class EquipmentSensorRollup1h(SensorRollupMixin, Base):
+    __tablename__ = "equipment_sensor_rollup_1h"
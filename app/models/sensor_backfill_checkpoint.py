@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, BigInteger, DateTime, Boolean
+from datetime import datetime
+
+from core.database import Base
+
+
+class SensorBackfillCheckpoint(Base):
+    """
+    센서 이력 백필 진행 상태 (파일 단위)
+    COPY 와 같은 트랜잭션에서 갱신되므로 중단 후 재실행 시 rows_done 이후부터 이어서 적재한다.
+    """
+    __tablename__ = "sensor_backfill_checkpoint"
+
+    source_key = Column(String(500), primary_key=True)        # 파일 경로 + 크기 + 수정시각
+    rows_done = Column(BigInteger, nullable=False, default=0)   # 처리 완료한 원본 행 수 (거부 포함)
+    rows_loaded = Column(BigInteger, nullable=False, default=0)
+    rows_rejected = Column(BigInteger, nullable=False, default=0)
+    min_ts = Column(DateTime, nullable=True)                    # 적재된 데이터 시각 범위 (롤업 재집계용)
+    max_ts = Column(DateTime, nullable=True)
+    completed = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
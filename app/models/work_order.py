@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Enum, DateTime, Boolean, Float
+from sqlalchemy import Column, String, Integer, Enum, DateTime, Boolean, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
@@ -28,4 +28,15 @@ class WorkOrder(Base):
     status = Column(OrderStatus, nullable=False, default="S0_PLANNED")
     created_ts = Column(DateTime, nullable=False, default=datetime.utcnow)
     start_ts = Column(DateTime, nullable=True)
-    end_ts = Column(DateTime, nullable=True)
\ No newline at end of file
+    end_ts = Column(DateTime, nullable=True)
+    claimed_by = Column(String(50), nullable=True)    # 작업을 가져간 스테이션 (equipment_id)
+    claimed_ts = Column(DateTime, nullable=True)      # 가져간 시각 (CLAIM_TTL 경과 시 다른 스테이션이 가져갈 수 있음)
+
+    # 목록 정렬/필터용 (keyset 페이지네이션: 정렬 키 + order_id)
+    __table_args__ = (
+        Index("ix_work_orders_due_id", "due_date", "order_id"),
+        Index("ix_work_orders_status_due_id", "status", "due_date", "order_id"),
+        Index("ix_work_orders_created_id", "created_ts", "order_id"),
+        # 완료일 범위 조회 (일별 생산량)
+        Index("ix_work_orders_status_end", "status", "end_ts"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
@@ -15,4 +15,11 @@ class WorkResult(Base):
     equipment_id = Column(String(50), ForeignKey("master_equipment.equipment_id"), nullable=True)
 
     start_ts = Column(DateTime, nullable=False)
-    end_ts = Column(DateTime, nullable=False)
\ No newline at end of file
+    end_ts = Column(DateTime, nullable=False)
+
+    # 목록 정렬/필터용 (keyset 페이지네이션: start_ts + result_id)
+    __table_args__ = (
+        Index("ix_work_results_start_id", "start_ts", "result_id"),
+        Index("ix_work_results_equipment_start_id", "equipment_id", "start_ts", "result_id"),
+        Index("ix_work_results_order_seq", "order_id", "operation_seq"),
+    )
@@ -1,28 +1,101 @@
-from fastapi import APIRouter, Request, Depends
-from fastapi.responses import HTMLResponse
+import os
+from datetime import date, datetime, timedelta
+
+from fastapi import APIRouter, Request, Depends, HTTPException
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from sqlalchemy.orm import Session
 
 from core.database import get_db
 from core.templates import templates
+from core.metrics import register_metrics
+from core.response_cache import ResponseCache
 from services import dashboard as svc
 from services.ai_production_qty_prediction import get_production_qty_sklearn_service, get_production_qty_tensorflow_service
 
 router = APIRouter(tags=["dashboard"])
 
+# 위젯별 응답 캐시: 작업/품질 데이터가 바뀌면(데이터 버전) 또는 TTL 경과 시 다시 계산
+# AI 생산량 예측은 계산이 비싸므로 데이터 버전과 무관하게 TTL 로만 갱신
+DASHBOARD_CACHE_TTL_SEC = float(os.getenv("DASHBOARD_CACHE_TTL_SEC", "60"))
+DASHBOARD_PREDICTION_TTL_SEC = float(os.getenv("DASHBOARD_PREDICTION_TTL_SEC", "600"))
+widget_caches = {
+    name: ResponseCache(f"dashboard.{name}", DASHBOARD_CACHE_TTL_SEC) for name in svc.SUMMARY_WIDGETS
+}
+widget_caches["prediction"] = ResponseCache("dashboard.prediction", DASHBOARD_PREDICTION_TTL_SEC, versioned=False)
+register_metrics("dashboard_cache", lambda: {name: c.get_metrics() for name, c in widget_caches.items()})
+
+# 다일 생산량 예측 최대 기간 (일)
+FORECAST_MAX_DAYS = int(os.getenv("FORECAST_MAX_DAYS", "60"))
+FORECAST_SERVICES = {
+    "sklearn": get_production_qty_sklearn_service,
+    "tensorflow": get_production_qty_tensorflow_service,
+}
+
+
+def _compute_prediction(db: Session) -> dict:
+    # 생산량 AI 예측(sklearn 모델 사용): 다음 영업일 (내일이 일요일이면 월요일)
+    tomorrow = (date.today() + timedelta(days=1)).strftime('%Y-%m-%d')
+    forecast = get_production_qty_sklearn_service().forecast(db, tomorrow, 2)
+    prediction = {**forecast["days"][0], "model_type": forecast["model_type"],
+                  "model_performance": forecast["model_performance"]}
+
+    print(f"생산량 AI 예측 결과 ({prediction['target_date']}):", prediction)
+    return prediction
+
+
 @router.get("/", response_class=HTMLResponse)
-def dashboard(request: Request, db: Session = Depends(get_db)):
-    # 대시보드 페이지
-    data = svc.get_dashboard_data(db)
-    # 생산량 AI 예측(sklearn 모델 사용)
-    production_qty_service = get_production_qty_sklearn_service()
-    #tomorrow = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
-    tomorrow = "2025-09-01"
-    prediction = production_qty_service.predict(db, tomorrow)
-    
-    data['prediction'] = prediction
-        
-    print(f"생산량 AI 예측 결과 ({tomorrow}):", prediction)
-    return templates.TemplateResponse(
-        "dashboard.html",
-        {"request": request, **data}
-    )
+def dashboard(request: Request):
+    # 대시보드 페이지 (화면 틀만 바로 응답, 위젯 데이터는 브라우저에서 /dashboard/api/{widget} 병렬 조회)
+    return templates.TemplateResponse("dashboard.html", {"request": request})
+
+
+# GET localhost:8080/dashboard/forecast?start=2025-09-01&days=14&model=sklearn
+@router.get("/forecast")
+def dashboard_forecast(start: str | None = None, days: str = "7", model: str = "sklearn",
+                       db: Session = Depends(get_db)):
+    # 다일 생산량 예측 (과거 실적 1회 조회 + 전체 기간 일괄 예측)
+    if start is None:
+        start = (date.today() + timedelta(days=1)).strftime('%Y-%m-%d')
+    try:
+        start_date = datetime.strptime(start, '%Y-%m-%d').date()
+        n_days = int(days)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="start 는 YYYY-MM-DD, days 는 정수여야 합니다")
+    if not 1 <= n_days <= FORECAST_MAX_DAYS:
+        raise HTTPException(status_code=422, detail=f"days 는 1 ~ {FORECAST_MAX_DAYS} 사이여야 합니다")
+    # 예측 구간은 내일부터 이어지므로 시작일도 제한 (먼 미래는 반복 횟수/오차 누적이 커짐)
+    if start_date > date.today() + timedelta(days=FORECAST_MAX_DAYS):
+        raise HTTPException(status_code=422, detail=f"start 는 오늘부터 {FORECAST_MAX_DAYS}일 이내여야 합니다")
+    get_service = FORECAST_SERVICES.get(model)
+    if get_service is None:
+        raise HTTPException(status_code=422, detail=f"알 수 없는 모델: {model} (sklearn, tensorflow)")
+
+    try:
+        return get_service().forecast(db, start, n_days)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+# GET localhost:8080/dashboard/api/kpi
+@router.get("/api/{widget}")
+def dashboard_widget(widget: str, request: Request, db: Session = Depends(get_db)):
+    # 위젯 데이터 JSON (kpi, product, status, operation, equipment, daily, deviation, prediction)
+    cache = widget_caches.get(widget)
+    if cache is None:
+        raise HTTPException(status_code=404, detail=f"알 수 없는 위젯: {widget}")
+
+    if widget == "prediction":
+        compute = lambda: _compute_prediction(db)
+    else:
+        compute = lambda: svc.get_dashboard_widget(db, widget)
+    try:
+        data, etag = cache.get(compute)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    # 폴링 화면은 If-None-Match 로 재검증 -> 변경 없으면 304
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if ResponseCache.etag_matches(request.headers.get("if-none-match"), etag):
+        cache.count_not_modified()
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=data, headers=headers)
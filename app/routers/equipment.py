@@ -1,33 +1,101 @@
-from fastapi import APIRouter, Request, Depends, Form, Body
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import APIRouter, Request, Depends, Form, Body, HTTPException, Query, Header
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from core.database import get_db
 from core.templates import templates
 from services import equipment as svc
+from services.sensor_ingest import get_sensor_ingest_buffer
+from services.sensor_stream import sensor_event_stream
+from schemas.equipment import SensorReading
 
 router = APIRouter(tags=["equipment"])
 
 # GET localhost:8080/equipment/sensor
 @router.get("/sensor", response_class=HTMLResponse)
 def list_equipment_sensor_data(
-    request: Request, db: Session = Depends(get_db)):
+    request: Request,
+    equipment_id: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    status: str | None = None,
+    cursor: str | None = None,
+    limit: str | None = None,
+    db: Session = Depends(get_db)):
     
-    # 장비 센서 데이터 목록 조회
-    data = svc.list_equipment_sensor_data(db)
+    # 장비 센서 데이터 목록 조회 (필터 + 커서 페이지네이션)
+    data = svc.list_equipment_sensor_data(request, db, equipment_id, start, end, status, cursor, limit)
     return templates.TemplateResponse(
         "equipment_sensor_list.html",
         {"request": request, **data}    
     )
 
+# GET localhost:8080/equipment/sensor/live
+@router.get("/sensor/live", response_class=HTMLResponse)
+def equipment_sensor_live(request: Request):
+    # 실시간 센서 모니터링 (SSE 구독 화면)
+    return templates.TemplateResponse("equipment_sensor_live.html", {"request": request})
+
+# GET localhost:8080/equipment/sensor/stream?equipment_id=STN-A&equipment_id=STN-B
+@router.get("/sensor/stream")
+async def equipment_sensor_stream(
+    request: Request,
+    equipment_id: list[str] | None = Query(None),
+    backlog: int = 50,
+    last_event_id: str | None = Header(None)
+):
+    # 실시간 센서 스트림 (SSE, 메모리 링버퍼에서 전달 - DB 조회 없음)
+    return StreamingResponse(
+        sensor_event_stream(request, equipment_id, backlog, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# GET localhost:8080/equipment/sensor/trend?equipment_id=STN-A&start=...&end=...
+@router.get("/sensor/trend")
+def equipment_sensor_trend(
+    equipment_id: str,
+    start: str | None = None,
+    end: str | None = None,
+    db: Session = Depends(get_db)
+):
+    # 설비 센서 추이 (구간 길이에 따라 원본/1분/1시간 롤업 사용)
+    try:
+        return svc.get_equipment_sensor_trend(db, equipment_id, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
 # POST localhost:8080/equipment/sensor
-@router.post("/sensor")
+@router.post("/sensor", status_code=202)
 def create_equipment_sensor_data(
     request: Request,
     db: Session = Depends(get_db), 
-    data: dict = Body(...)
+    data: SensorReading = Body(...)
 ):
-    # 장비 센서 데이터 등록   
-    svc.create_equipment_sensor_data(request, db, data)
-    
-    return RedirectResponse(url="/equipment/sensor", status_code=303)
\ No newline at end of file
+    # 장비 센서 데이터 등록 (버퍼 적재 후 즉시 응답)
+    try:
+        accepted = svc.create_equipment_sensor_data(request, db, data)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not accepted:
+        # 버퍼 포화: DB 연결을 더 잡지 않고 재시도 안내
+        raise HTTPException(
+            status_code=503,
+            detail="센서 데이터 버퍼가 가득 찼습니다",
+            headers={"Retry-After": str(svc.SENSOR_RETRY_AFTER_SEC)},
+        )
+    return {"accepted": True, "queue_depth": get_sensor_ingest_buffer().depth}
+
+# POST localhost:8080/equipment/sensor/batch
+@router.post("/sensor/batch")
+def create_equipment_sensor_data_batch(
+    db: Session = Depends(get_db),
+    readings: list[dict] = Body(...)
+):
+    # 장비 센서 데이터 일괄 등록 (JSON 배열)
+    if len(readings) > svc.SENSOR_BATCH_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"배치당 최대 {svc.SENSOR_BATCH_MAX_ROWS}건까지 등록할 수 있습니다",
+        )
+    return svc.create_equipment_sensor_data_batch(db, readings)
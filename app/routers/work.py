@@ -1,17 +1,28 @@
-from fastapi import APIRouter, Request, Depends, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import APIRouter, Request, Depends, Form, Body, File, UploadFile, HTTPException
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, Response
 from sqlalchemy.orm import Session
 
 from core.database import get_db
 from core.templates import templates
 from services import work as svc
+from services import station_dispatch
+from services import production_scheduler
 
 router = APIRouter(tags=["work"])
 
 @router.get("/orders", response_class=HTMLResponse)
-def list_orders(request: Request, db: Session = Depends(get_db)):
-		# services/work.py 의 list_orders 함수 호출
-    data = svc.list_orders(db)
+def list_orders(
+    request: Request,
+    status: str | None = None,
+    product_id: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    sort: str | None = None,
+    cursor: str | None = None,
+    limit: str | None = None,
+    db: Session = Depends(get_db)):
+		# services/work.py 의 list_orders 함수 호출 (필터 + 커서 페이지네이션)
+    data = svc.list_orders(db, status, product_id, start, end, sort, cursor, limit)
 
     # orders_list.html에 request, data 변수를 전달하여 최종 HTML 문서를 완성
     return templates.TemplateResponse(
@@ -30,6 +41,41 @@ def create_order(
     svc.create_order(request, db, product_id, planned_qty, due_date)
     return RedirectResponse(url="/work/orders", status_code=303)
 
+def _create_orders_bulk(request: Request, db: Session, orders: list):
+    if len(orders) > svc.ORDER_BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"한 번에 최대 {svc.ORDER_BULK_MAX_ROWS}건까지 등록할 수 있습니다",
+        )
+    result = svc.create_orders_bulk(request, db, orders)
+    if result["rejected"]:
+        return JSONResponse(status_code=422, content=result)
+    return JSONResponse(status_code=201, content=result)
+
+# POST localhost:8080/work/orders/bulk
+@router.post("/orders/bulk")
+def create_orders_bulk(
+    request: Request,
+    db: Session = Depends(get_db),
+    orders: list[dict] = Body(...)
+):
+    # 작업지시 일괄 등록 (JSON 배열, 전체 성공 또는 전체 실패)
+    return _create_orders_bulk(request, db, orders)
+
+# POST localhost:8080/work/orders/bulk/csv
+@router.post("/orders/bulk/csv")
+def create_orders_bulk_csv(
+    request: Request,
+    db: Session = Depends(get_db),
+    file: UploadFile = File(...)
+):
+    # 작업지시 일괄 등록 (CSV 업로드: product_id, planned_qty, due_date)
+    try:
+        orders = svc.parse_orders_csv(file.file.read())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return _create_orders_bulk(request, db, orders)
+
 @router.get("/orders/{order_id}", response_class=HTMLResponse)
 def order_detail(order_id: str, request: Request, db: Session = Depends(get_db)):
     data = svc.get_order_detail(db, order_id)
@@ -43,10 +89,12 @@ def order_detail(order_id: str, request: Request, db: Session = Depends(get_db))
 
 @router.post("/orders/{order_id}/update")
 def order_update(order_id: str,
+                 request: Request,
                  planned_qty: str = Form(...),
                  due_date: str = Form(...),
                  db: Session = Depends(get_db)):
     updated = svc.update_order(
+                                request,
                                 db, 
                                 order_id, 
                                 planned_qty_raw=planned_qty, 
@@ -64,9 +112,19 @@ def order_delete(order_id: str, db: Session = Depends(get_db)):
     return RedirectResponse(url="/work/orders", status_code=303)    
 
 @router.get("/results", response_class=HTMLResponse)
-def list_results(request: Request, db: Session = Depends(get_db)):
-    # services/work.py 의 list_results 함수 호출
-    data = svc.list_results(db)
+def list_results(
+    request: Request,
+    product_id: str | None = None,
+    equipment_id: str | None = None,
+    operation_seq: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    sort: str | None = None,
+    cursor: str | None = None,
+    limit: str | None = None,
+    db: Session = Depends(get_db)):
+    # services/work.py 의 list_results 함수 호출 (필터 + 커서 페이지네이션)
+    data = svc.list_results(db, product_id, equipment_id, operation_seq, start, end, sort, cursor, limit)
     # results_list.html에 request, data 변수를 전달하여 최종 HTML 문서를 완성
     return templates.TemplateResponse(
         "results_list.html",
@@ -75,9 +133,15 @@ def list_results(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/progress", response_class=HTMLResponse)
-def list_progress(request: Request, db: Session = Depends(get_db)):
-		# services/work.py 의 list_progress 함수 호출
-    data = svc.list_progress(db)
+def list_progress(
+    request: Request,
+    status: str | None = None,
+    product_id: str | None = None,
+    cursor: str | None = None,
+    limit: str | None = None,
+    db: Session = Depends(get_db)):
+		# services/work.py 의 list_progress 함수 호출 (필터 + 커서 페이지네이션)
+    data = svc.list_progress(db, status, product_id, cursor, limit)
     # progress_list.html에 request, data 변수를 전달하여 최종 HTML 문서를 완성
     return templates.TemplateResponse(
         "progress_list.html",
@@ -92,4 +156,61 @@ def advance_progress(
     equipment_id: str = Form(None)
 ):
     svc.advance_progress(db, order_id, operation_seq, equipment_id)
-    return RedirectResponse(url="/work/progress", status_code=303)
\ No newline at end of file
+    return RedirectResponse(url="/work/progress", status_code=303)
+
+# POST localhost:8080/work/progress/events
+@router.post("/progress/events")
+def apply_progress_events(
+    db: Session = Depends(get_db),
+    events: list[dict] = Body(...)
+):
+    # 공정 완료 이벤트 일괄 반영 (바코드 스캐너/PLC, 재전송 시 duplicate 처리)
+    if len(events) > svc.PROGRESS_EVENTS_MAX:
+        raise HTTPException(
+            status_code=413,
+            detail=f"한 번에 최대 {svc.PROGRESS_EVENTS_MAX}건까지 전송할 수 있습니다",
+        )
+    return svc.apply_progress_events(db, events)
+
+# POST localhost:8080/work/stations/STN-A/claim
+@router.post("/stations/{equipment_id}/claim")
+def claim_station_job(equipment_id: str, db: Session = Depends(get_db)):
+    # 스테이션 다음 작업 가져오기 (없으면 204)
+    try:
+        job = station_dispatch.claim_next_job(db, equipment_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if job is None:
+        return Response(status_code=204)
+    return job
+
+# POST localhost:8080/work/stations/STN-A/release?order_id=...
+@router.post("/stations/{equipment_id}/release")
+def release_station_job(equipment_id: str, order_id: str, db: Session = Depends(get_db)):
+    # 가져간 작업 반납
+    if not station_dispatch.release_job(db, equipment_id, order_id):
+        raise HTTPException(status_code=404, detail="이 스테이션이 가져간 작업이 아닙니다")
+    return {"released": True}
+
+# POST localhost:8080/work/stations/STN-A/complete?order_id=...
+@router.post("/stations/{equipment_id}/complete")
+def complete_station_job(equipment_id: str, order_id: str, db: Session = Depends(get_db)):
+    # 가져간 작업 완료 (실적 기록 + 다음 단계 진행)
+    try:
+        result = station_dispatch.complete_job(db, equipment_id, order_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="이 스테이션이 가져간 작업이 아닙니다")
+    return result
+
+# GET localhost:8080/work/schedule
+@router.get("/schedule")
+def get_schedule(db: Session = Depends(get_db)):
+    # 미완료 작업지시 유한 능력 일정 계획 (스테이션별 작업 + 주문별 예상 완료/지연)
+    return production_scheduler.build_schedule(db)
+
+@router.get("/schedule/gantt", response_class=HTMLResponse)
+def schedule_gantt(request: Request):
+    # 일정 계획 간트 차트 (데이터는 /work/schedule 에서 조회)
+    return templates.TemplateResponse("schedule_gantt.html", {"request": request})
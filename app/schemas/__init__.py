@@ -0,0 +1,13 @@
+"""
+Package exports for app.schemas
+
+API 요청/응답 본문 검증용 Pydantic 스키마 모음.
+"""
+from .equipment import SensorReading
+from .work import WorkOrderCreate, ProgressEvent
+
+__all__ = [
+    "SensorReading",
+    "WorkOrderCreate",
+    "ProgressEvent",
+]
@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+from pydantic import BaseModel, Field, field_validator
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """시간대가 있는 시각은 UTC 로 변환 후 tzinfo 제거 (DB 는 naive UTC 로 저장, datetime.utcnow() 와 같은 기준)"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class SensorReading(BaseModel):
+    """SCADA 센서 측정값 1건"""
+
+    timestamp: datetime
+    equipment_id: str = Field(..., min_length=1, max_length=50)
+    temperature: float | None = None     # 온도 (°C)
+    vibration: float | None = None       # 진동
+    current: float | None = None         # 전류 (A)
+    rpm: int | None = None               # RPM
+    pressure: float | None = None        # 압력 (bar)
+
+    @field_validator("timestamp")
+    @classmethod
+    def normalize_timestamp(cls, v: datetime) -> datetime:
+        return to_naive_utc(v)
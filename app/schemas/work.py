@@ -0,0 +1,35 @@
+from datetime import datetime
+from uuid import UUID
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from schemas.equipment import to_naive_utc
+
+
+class WorkOrderCreate(BaseModel):
+    """작업지시 등록 1건 (일괄 등록 API)"""
+
+    product_id: str = Field(..., min_length=1, max_length=100)
+    planned_qty: int = Field(..., gt=0)
+    due_date: datetime
+
+
+class ProgressEvent(BaseModel):
+    """공정 완료 이벤트 1건 (바코드 스캐너/PLC 일괄 전송)"""
+
+    order_id: UUID
+    operation_seq: int = Field(..., ge=1, le=5)
+    equipment_id: str | None = Field(None, max_length=50)
+    start_ts: datetime
+    end_ts: datetime
+
+    @field_validator("start_ts", "end_ts")
+    @classmethod
+    def normalize_ts(cls, v: datetime) -> datetime:
+        # 시간대가 있으면 UTC 로 변환 (advance_progress/complete_job 의 utcnow() 와 같은 기준)
+        return to_naive_utc(v)
+
+    @model_validator(mode="after")
+    def check_period(self):
+        if self.end_ts < self.start_ts:
+            raise ValueError("end_ts 는 start_ts 이후여야 합니다")
+        return self
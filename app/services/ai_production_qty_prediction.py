@@ -2,11 +2,19 @@ import joblib
 import numpy as np
 import json
 from pathlib import Path
-import tensorflow as tf
-from tensorflow import keras
-from datetime import datetime, timedelta
+from core.numpy_inference import load_dnn_model
+from services.prediction_cache import get_prediction_cache
+import os
+import time
+from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from services.production_series import get_daily_production_series, query_daily_production
+
+# 과거 생산량 특징: 최근 50일 중 영업일(일요일 제외) 24일
+PAST_PRODUCTION_LOOKBACK_DAYS = 50
+PAST_PRODUCTION_BUSINESS_DAYS = 24
+# 다일 예측 반복 종료 기준 (이전 반복과의 최대 차이, 개)
+FORECAST_TOLERANCE = float(os.getenv("FORECAST_TOLERANCE", "0.5"))
 
 
 class ProductionQuantityPredictionService:
@@ -22,6 +30,11 @@ class ProductionQuantityPredictionService:
         else:
             raise ValueError(f"지원하지 않는 모델 타입: {model_type}")
 
+        # 예측 캐시 (로드한 모델/스케일러 객체에 묶임, 서비스를 다시 만들면 초기화)
+        self.prediction_cache = get_prediction_cache(
+            f"production_qty_{model_type}", self.model, getattr(self, "scaler", None),
+        )
+
     # Scikit-learn 모델 로드    
     def _load_production_qty_sklearn_model(self):
         try:
@@ -36,8 +49,8 @@ class ProductionQuantityPredictionService:
     # TensorFlow 모델 로드    
     def _load_production_qty_tensorflow_model(self):
         try:
-            self.model = keras.models.load_model(self.model_dir / 'dnn_production_qty_model.keras')
-            self.scaler = joblib.load(self.model_dir / 'dnn_production_qty_model_scaler.pkl')
+            self.artifacts = [self.model_dir / 'dnn_production_qty_model.keras', self.model_dir / 'dnn_production_qty_model_scaler.pkl']
+            self.model, self.scaler = load_dnn_model(*self.artifacts)
             with open(self.model_dir / 'dnn_production_qty_model_info.json', 'r') as f:
                 self.model_info = json.load(f)
 
@@ -91,12 +104,12 @@ class ProductionQuantityPredictionService:
                 production_trend_6
             ]])
             
-            # 예측
+            # 예측 (같은 날짜/과거 생산량이면 캐시 사용)
             if self.model_type == 'sklearn':
-                predicted_qty = self.model.predict(X)[0]
+                predict_fn = lambda rows: self.model.predict(rows)
             else:  # tensorflow
-                scaled_x = self.scaler.transform(X)
-                predicted_qty = self.model.predict(scaled_x)[0][0]
+                predict_fn = lambda rows: self.model.predict(self.scaler.transform(rows), verbose=0)
+            predicted_qty = self.prediction_cache.predict(X, predict_fn)[0][0]
 
             # 결과 반환
             return {
@@ -128,57 +141,140 @@ class ProductionQuantityPredictionService:
             raise RuntimeError(f"예측 실패: {e}")
     
     def _get_past_production(self, db: Session, target_date: datetime) -> list:
+        """
+        target_date 이전 영업일(일요일 제외) 생산량, 최근일부터 최대 24일
+        최근 50일을 한 번에 조회 (메모리 시리즈 또는 end_ts 범위 GROUP BY 1회) 후 NumPy 로 0 채움/일요일 제외
+        """
+        end = target_date.date()
+        _, qty = self._business_day_production(db, end - timedelta(days=PAST_PRODUCTION_LOOKBACK_DAYS), end)
+        return qty[::-1][:PAST_PRODUCTION_BUSINESS_DAYS].tolist()
 
-        from models.work_order import WorkOrder
-        
-        production_data = []
-        current_date = target_date - timedelta(days=1) 
-        
-        # 최대 50일 전까지 조회 (영업일 24일 확보용)
-        for _ in range(50):
-            # 일요일 제외
-            if current_date.weekday() != 6:
-                # 해당 날짜 생산량 조회 (완료된 작업의 planned_qty 합계)
-                daily_qty = db.query(
-                    func.sum(WorkOrder.planned_qty)
-                ).filter(
-                    and_(
-                        WorkOrder.status == 'S5_DONE',
-                        func.date(WorkOrder.end_ts) == current_date.date()
-                    )
-                ).scalar()
-                
-                production_data.append(float(daily_qty) if daily_qty else 0.0)
-                
-                # 24개 영업일 확보되면 종료
-                if len(production_data) >= 24:
-                    break
-            
-            current_date -= timedelta(days=1)
-        
-        return production_data
+    @staticmethod
+    def _business_day_production(db: Session, start: date, end: date) -> tuple[list, np.ndarray]:
+        """start <= 날짜 < end 영업일(일요일 제외) 날짜와 생산량 (오래된 날 -> 최근 순, 실적 없는 날은 0)"""
+        series = get_daily_production_series()
+        daily = series.get(start, end) if series is not None else None
+        if daily is None:
+            daily = query_daily_production(db, start, end)
+
+        # datetime64[D]: 1970-01-01 은 목요일 -> (일수 + 3) % 7 이 월=0 ... 일=6
+        days = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D'))
+        qty = np.zeros(len(days), dtype=np.float64)
+        if daily:
+            offsets = np.array([(d - start).days for d in daily], dtype=np.int64)
+            qty[offsets] = np.fromiter(daily.values(), dtype=np.float64, count=len(daily))
+        business = (days.astype(np.int64) + 3) % 7 != 6
+
+        return days[business].astype(object).tolist(), qty[business]
     
     def predict_next_n_days(self, db: Session, start_date: str, n_days: int = 7) -> list:
+        """start_date 부터 n_days 일(일요일 제외) 예측 (forecast 의 일별 결과)"""
+        return self.forecast(db, start_date, n_days)["days"]
 
-        results = []
-        current_date = datetime.strptime(start_date, '%Y-%m-%d')
-        
-        for i in range(n_days):
-            # 일요일은 건너뛰기
-            if current_date.weekday() == 6:
-                current_date += timedelta(days=1)
-                continue
-            
-            try:
-                result = self.predict(db, current_date.strftime('%Y-%m-%d'))
-                results.append(result)
-            except Exception as e:
-                print(f"예측 실패 ({current_date.strftime('%Y-%m-%d')}): {e}")
-            
-            current_date += timedelta(days=1)
-        
-        return results
-    
+    def forecast(self, db: Session, start_date: str, n_days: int = 7) -> dict:
+        """
+        다일(multi-horizon) 생산량 예측
+
+        과거 생산량은 한 번만 조회한다. 실적이 있는 날(오늘까지)은 lag/rolling 특징에 실적을 그대로 쓰고,
+        마지막 실적일 이후(내일부터)의 날짜에만 앞선 날의 예측값을 넣는다.
+        날짜별로 모델을 순차 호출하는 대신 전체 기간 특징 행렬을 한 번에 만들어 예측하고,
+        예측값을 특징에 다시 넣어 값이 바뀌지 않을 때까지 반복한다 (Jacobi 방식 고정점 반복).
+        k 번째 반복 후 실적 이후 앞의 k 일은 순차 예측과 같아지므로 최대 (예측일수 + 1) 번이면 끝나고,
+        보통은 수렴 허용치(FORECAST_TOLERANCE) 안에 몇 번 만에 끝난다.
+        이미 수렴한 행(실적만 쓰는 날 포함)은 예측 캐시에서 바로 나오므로 반복마다 모델에는 바뀐 행만 들어간다.
+        """
+        started = time.monotonic()
+        start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        horizon_end = start + timedelta(days=n_days)
+
+        # 실적 구간: 오늘까지 (과거 기간이면 기간 끝까지), 그 뒤로는 예측 구간
+        tomorrow = date.today() + timedelta(days=1)
+        actual_end = min(horizon_end, tomorrow)
+        history_days, history = self._business_day_production(
+            db, min(start, tomorrow) - timedelta(days=PAST_PRODUCTION_LOOKBACK_DAYS), actual_end)
+        chain_days = [
+            actual_end + timedelta(days=i)
+            for i in range((horizon_end - actual_end).days)
+            if (actual_end + timedelta(days=i)).weekday() != 6
+        ]
+        H, M = len(history), len(chain_days)
+
+        # 예측 행: 기간 내 실적일 + 예측 구간 전체 (시작일 전 예측일은 lag 용)
+        # timeline = [실적 H일] + [예측 M일], 행별 timeline 위치
+        row_days = [d for d in history_days if d >= start] + chain_days
+        if not row_days:
+            return {"start_date": start_date, "n_days": n_days, "model_type": self.model_type, "days": [],
+                    "stats": {"predicted_days": 0, "passes": 0, "runtime_ms": 0.0}}
+        row_index = np.arange(H + M)[-len(row_days):]
+        if row_index[0] < 6:
+            raise RuntimeError(f"예측 실패: 과거 생산 데이터 부족 (최소 6일 필요, 현재 {row_index[0]}일)")
+
+        # 날짜 특징 (고정) + 행별 과거 24영업일 위치 (최근 -> 과거)
+        date_features = np.array(
+            [[d.month, d.day, d.weekday(), d.isocalendar()[1]] for d in row_days], dtype=np.float64
+        )
+        window = min(int(row_index[0]), PAST_PRODUCTION_BUSINESS_DAYS)
+        positions = row_index[:, None] - 1 - np.arange(window)[None, :]
+
+        if self.model_type == 'sklearn':
+            predict_fn = lambda rows: self.model.predict(rows)
+        else:  # tensorflow
+            predict_fn = lambda rows: self.model.predict(self.scaler.transform(rows), verbose=0)
+
+        # 초기값: 최근 6영업일 실적 평균 (실적만 쓰는 행은 첫 반복에서 확정)
+        predicted = np.full(M, history[-6:].mean())
+        passes = 0
+        for passes in range(1, M + 2):
+            X = self._lag_features(date_features, np.concatenate([history, predicted])[positions])
+            output = self.prediction_cache.predict(X, predict_fn).reshape(-1)
+            updated = output[len(row_days) - M:]
+            converged = M == 0 or np.max(np.abs(updated - predicted)) <= FORECAST_TOLERANCE
+            predicted = updated
+            if converged:
+                break
+        if not np.all(np.isfinite(output)):
+            raise RuntimeError("예측 실패: 예측값이 발산했습니다 (예측 기간을 줄여 주세요)")
+
+        days = [
+            {
+                'predicted_production_qty': round(float(qty), 0),
+                'target_date': d.strftime('%Y-%m-%d'),
+                'day_of_week': ['월', '화', '수', '목', '금', '토'][d.weekday()],
+            }
+            for d, qty in zip(row_days, output)
+            if d >= start
+        ]
+        return {
+            "start_date": start_date,
+            "n_days": n_days,
+            "model_type": self.model_type,
+            "model_performance": {
+                'mae': self.model_info['mae'],
+                'rmse': self.model_info['rmse'],
+                'r2_score': self.model_info['score']
+            },
+            "days": days,
+            "stats": {
+                "actual_days": len(row_days) - M,
+                "predicted_days": M,
+                "passes": passes,
+                "runtime_ms": round((time.monotonic() - started) * 1000, 2),
+            },
+        }
+
+    @staticmethod
+    def _lag_features(date_features: np.ndarray, past: np.ndarray) -> np.ndarray:
+        """
+        predict() 와 같은 특징 행렬 (N건)
+        past: (N, W) 예측일별 과거 영업일 생산량 (최근 -> 과거), W <= 24
+        """
+        lag_1 = past[:, 0]
+        lag_6 = past[:, 5]
+        lag_12 = past[:, 11] if past.shape[1] > 11 else past[:, 5]
+        rolling_6 = past[:, :6].mean(axis=1)
+        rolling_24 = past[:, :24].mean(axis=1)
+        trend_6 = np.divide(lag_1 - lag_6, lag_6, out=np.zeros_like(lag_1), where=lag_6 != 0)
+        return np.column_stack([date_features, lag_1, lag_6, lag_12, rolling_6, rolling_24, trend_6])
     
     # 모델 정보 반환    
     def get_model_info(self) -> dict:
@@ -2,8 +2,8 @@ import joblib
 import numpy as np
 import json
 from pathlib import Path
-import tensorflow as tf
-from tensorflow import keras
+from core.numpy_inference import load_dnn_model
+from services.prediction_cache import get_prediction_cache
 
 
 class WorkTimePredictionService:
@@ -22,6 +22,15 @@ class WorkTimePredictionService:
         self.le_product = joblib.load(self.model_dir / 'label_encoder_product.pkl')
         self.le_equipment = joblib.load(self.model_dir / 'label_encoder_equipment.pkl')
 
+        # 범주 -> 코드 조회표 (LabelEncoder.transform 의 정렬 검색/검증을 건당 반복하지 않도록)
+        self.product_codes = {c: i for i, c in enumerate(self.le_product.classes_.tolist())}
+        self.equipment_codes = {c: i for i, c in enumerate(self.le_equipment.classes_.tolist())}
+
+        # 예측 캐시 (로드한 모델/스케일러/인코더 객체에 묶임, 서비스를 다시 만들면 초기화)
+        self.prediction_cache = get_prediction_cache(
+            f"work_time_{model_type}", self.model, getattr(self, "scaler", None), self.le_product, self.le_equipment,
+        )
+
     # Scikit-learn 모델 로드    
     def _load_work_time_sklearn_model(self):
         try:
@@ -36,8 +45,8 @@ class WorkTimePredictionService:
     # TensorFlow 모델 로드    
     def _load_work_time_tensorflow_model(self):
         try:
-            self.model = keras.models.load_model(self.model_dir / 'dnn_work_time_model.keras')
-            self.scaler = joblib.load(self.model_dir / 'dnn_work_time_model_scaler.pkl')
+            self.artifacts = [self.model_dir / 'dnn_work_time_model.keras', self.model_dir / 'dnn_work_time_model_scaler.pkl']
+            self.model, self.scaler = load_dnn_model(*self.artifacts)
             with open(self.model_dir / 'dnn_work_time_model_info.json', 'r') as f:
                 self.model_info = json.load(f)
 
@@ -53,15 +62,11 @@ class WorkTimePredictionService:
             product_encoded = self._encode_product(product_id)
             equipment_encoded = self._encode_equipment(equipment_id)
 
-            # 입력 데이터 준비
-            X = np.array([[product_encoded, operation_seq, equipment_encoded, planned_qty]])
+            # 입력 데이터 준비 (학습 시 특징 순서: model_info['features'])
+            X = np.array([[product_encoded, equipment_encoded, operation_seq, planned_qty]])
             
             # 예측
-            if self.model_type == 'sklearn':
-                predicted_sec = self.model.predict(X)[0]
-            else:  # tensorflow
-                scaled_x = self.scaler.transform(X)
-                predicted_sec = self.model.predict(scaled_x)[0][0]
+            predicted_sec = self._predict_X(X)[0]
 
             # 결과 반환
             return {
@@ -84,19 +89,71 @@ class WorkTimePredictionService:
         except Exception as e:
             raise RuntimeError(f"예측 실패: {e}")
     
-    # 제품 ID Label Encoding    
+    def predict_many(self, product_ids, operation_seqs=None, equipment_ids=None, planned_qtys=None):
+        """
+        여러 건 작업시간(초) 일괄 예측
+
+        입력: 같은 길이의 배열 4개, 또는 product_id / operation_seq / equipment_id / planned_qty
+              컬럼을 가진 DataFrame 하나 (product_ids 자리에 전달)
+        제품/설비는 조회표로 인코딩하고 알려진 행만 모아 모델을 한 번 호출한다.
+        반환: (예측 초 배열 - 실패 행은 NaN, [{"index", "reason"}] 실패 목록)
+        """
+        if hasattr(product_ids, "columns"):
+            frame = product_ids
+            product_ids = frame["product_id"].to_numpy()
+            operation_seqs = frame["operation_seq"].to_numpy()
+            equipment_ids = frame["equipment_id"].to_numpy()
+            planned_qtys = frame["planned_qty"].to_numpy()
+
+        n = len(product_ids)
+        product_encoded = np.fromiter((self.product_codes.get(p, -1) for p in product_ids), dtype=np.int64, count=n)
+        equipment_encoded = np.fromiter((self.equipment_codes.get(e, -1) for e in equipment_ids), dtype=np.int64, count=n)
+
+        errors = []
+        for i in np.flatnonzero((product_encoded < 0) | (equipment_encoded < 0)):
+            reasons = []
+            if product_encoded[i] < 0:
+                reasons.append(f"알 수 없는 제품 ID: {product_ids[i]}")
+            if equipment_encoded[i] < 0:
+                reasons.append(f"알 수 없는 설비 ID: {equipment_ids[i]}")
+            errors.append({"index": int(i), "reason": ", ".join(reasons)})
+
+        predicted = np.full(n, np.nan, dtype=np.float64)
+        valid = (product_encoded >= 0) & (equipment_encoded >= 0)
+        if not valid.any():
+            return predicted, errors
+
+        # 학습 시 특징 순서: product, equipment, operation_seq, planned_qty
+        X = np.column_stack([
+            product_encoded[valid],
+            equipment_encoded[valid],
+            np.asarray(operation_seqs, dtype=np.float64)[valid],
+            np.asarray(planned_qtys, dtype=np.float64)[valid],
+        ]).astype(np.float64)
+
+        predicted[valid] = self._predict_X(X)
+        return predicted, errors
+
+    def _predict_X(self, X: np.ndarray) -> np.ndarray:
+        """인코딩된 입력 행렬 -> 작업시간(초) 배열 (캐시에 없는 행만 모델 호출)"""
+        if self.model_type == 'sklearn':
+            predict_fn = lambda rows: self.model.predict(rows)
+        else:  # tensorflow
+            predict_fn = lambda rows: self.model.predict(self.scaler.transform(rows), verbose=0)
+        return self.prediction_cache.predict(X, predict_fn).reshape(-1)
+
+    # 제품 ID Label Encoding
     def _encode_product(self, product_id: str) -> int:
         try:
-            return self.le_product.transform([product_id])[0]
-        except ValueError:
+            return self.product_codes[product_id]
+        except KeyError:
             raise ValueError(f"알 수 없는 제품 ID: {product_id}")
     
     # 설비 ID Label Encoding
     def _encode_equipment(self, equipment_id: str) -> int:
-        print("equipment_id:", equipment_id)
         try:
-            return self.le_equipment.transform([equipment_id])[0]
-        except ValueError:
+            return self.equipment_codes[equipment_id]
+        except KeyError:
             raise ValueError(f"알 수 없는 설비 ID: {equipment_id}")
     
     # 사용 가능한 제품 목록
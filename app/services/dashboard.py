@@ -1,228 +1,305 @@
-import pandas as pd
+import os
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import select, union_all, func, case, cast, literal, literal_column, and_, String, Float
 from models.work_order import WorkOrder
 from models.work_result import WorkResult
 from models.master_operation import MasterOperation
 from models.master_equipment import MasterEquipment
 from models.master_product import MasterProduct
 from models.master_operation_standard import MasterOperationStandard
-from datetime import datetime, timedelta
+from models.dashboard_summary import (
+    DashboardStatusCount,
+    DashboardProductTotal,
+    DashboardOperationTotal,
+    DashboardEquipmentCount,
+    DashboardDailyProduction,
+    DashboardDeviationBin,
+)
+from services.dashboard_summary import DEVIATION_BINS
+from datetime import date, datetime, timedelta
+
+# 대시보드 데이터 출처: summary (집계 테이블, 기본) / sql (원본 테이블 GROUP BY, 집계 테이블 검증용)
+DASHBOARD_SOURCE = os.getenv("DASHBOARD_SOURCE", "summary")
+DAILY_CHART_DAYS = 30
+
+STATUS_NAMES = {
+    "S0_PLANNED": "계획",
+    "S1_READY": "부품준비",
+    "S2_ASSEMBLY": "조립",
+    "S3_INSPECTION": "검사",
+    "S4_PACK": "포장",
+    "S5_DONE": "완료",
+}
 
 
 def get_dashboard_data(db: Session):
-    
-    # 1. 작업지시 데이터 조회
-    orders_query = (
-        db.query(
-            WorkOrder.order_id,
-            WorkOrder.product_id,
-            WorkOrder.planned_qty,
-            WorkOrder.status,
-            WorkOrder.created_ts,
-            WorkOrder.start_ts,
-            WorkOrder.end_ts,
-            MasterProduct.name.label("product_name"),
-        )
-        .join(MasterProduct, WorkOrder.product_id == MasterProduct.product_id)
+    """대시보드 데이터 (DASHBOARD_SOURCE 에 따라 집계 테이블 또는 SQL 집계)"""
+    if DASHBOARD_SOURCE == "sql":
+        return get_dashboard_data_sql(db)
+    return get_dashboard_data_summary(db)
+
+
+def get_dashboard_widget(db: Session, name: str) -> dict:
+    """대시보드 위젯 1개 데이터 (위젯별 JSON API 용)"""
+    if DASHBOARD_SOURCE == "sql":
+        # SQL 집계는 왕복 1회로 전체를 계산하므로 필요한 위젯만 잘라서 반환
+        return get_dashboard_data_sql(db)[WIDGET_KEYS[name]]
+    return SUMMARY_WIDGETS[name](db)
+
+
+def _daily_range():
+    end_date = datetime.now().date()
+    return end_date - timedelta(days=DAILY_CHART_DAYS), end_date
+
+
+# 위젯별 응답 조립 (집계 출처와 무관하게 같은 형식)
+def _kpi(status_counts: dict, deviation_avg: float | None) -> dict:
+    total_orders = sum(status_counts.values())
+    completed_orders_count = status_counts.get("S5_DONE", 0)
+    in_progress_count = sum(status_counts.get(s, 0) for s in ["S1_READY", "S2_ASSEMBLY", "S3_INSPECTION", "S4_PACK"])
+    planned_count = status_counts.get("S0_PLANNED", 0)
+    completion_rate = (completed_orders_count / total_orders * 100) if total_orders > 0 else 0
+
+    return {
+        "total_orders": total_orders,
+        "completed_orders": completed_orders_count,
+        "in_progress": in_progress_count,
+        "planned": planned_count,
+        "completion_rate": round(completion_rate, 1),
+        "avg_deviation_rate": round(deviation_avg or 0, 2),
+    }
+
+
+def _ranked_chart(pairs: list, limit: int | None = None, digits: int | None = None) -> dict:
+    """[(라벨, 값)] -> 값 내림차순 차트"""
+    pairs = sorted(pairs, key=lambda kv: kv[1], reverse=True)[:limit]
+    return {
+        "labels": [label for label, _ in pairs],
+        "data": [round(v, digits) if digits is not None else v for _, v in pairs],
+    }
+
+
+def _status_chart(status_counts: dict) -> dict:
+    return _ranked_chart([(STATUS_NAMES.get(status, status), count) for status, count in status_counts.items()])
+
+
+def _daily_chart(daily_qty: list) -> dict:
+    daily_qty = sorted(daily_qty)
+    return {
+        "labels": [d.strftime('%m/%d') for d, _ in daily_qty],
+        "data": [qty for _, qty in daily_qty],
+    }
+
+
+def _deviation_chart(deviation_counts: dict, result_count: int) -> dict:
+    """deviation_counts: {구간 번호(0~9): 건수}"""
+    if not result_count:
+        return {"labels": [], "data": []}
+    return {
+        "labels": [f"({lo}, {hi}]" for lo, hi in zip(DEVIATION_BINS, DEVIATION_BINS[1:])],
+        "data": [deviation_counts.get(i, 0) for i in range(len(DEVIATION_BINS) - 1)],
+    }
+
+
+# 집계 테이블 조회 (위젯마다 작은 테이블 1~2개)
+def _summary_status_counts(db: Session) -> dict:
+    return {
+        r.status: r.order_count
+        for r in db.query(DashboardStatusCount).filter(DashboardStatusCount.order_count > 0).all()
+    }
+
+
+def _summary_operation_rows(db: Session) -> list:
+    return (
+        db.query(DashboardOperationTotal, MasterOperation.operation_name)
+        .join(MasterOperation, DashboardOperationTotal.operation_seq == MasterOperation.operation_seq)
+        .filter(DashboardOperationTotal.result_count > 0)
+        .all()
+    )
+
+
+def summary_kpi(db: Session) -> dict:
+    totals = db.query(
+        func.coalesce(func.sum(DashboardOperationTotal.deviation_sum), 0),
+        func.coalesce(func.sum(DashboardOperationTotal.deviation_count), 0),
+    ).one()
+    return _kpi(_summary_status_counts(db), totals[0] / totals[1] if totals[1] else 0)
+
+
+def summary_product_chart(db: Session) -> dict:
+    return _ranked_chart([
+        (r.product_name, r.order_count) for r in
+        db.query(DashboardProductTotal.order_count, MasterProduct.name.label("product_name"))
+        .join(MasterProduct, DashboardProductTotal.product_id == MasterProduct.product_id)
+        .filter(DashboardProductTotal.order_count > 0)
         .all()
+    ])
+
+
+def summary_status_chart(db: Session) -> dict:
+    return _status_chart(_summary_status_counts(db))
+
+
+def summary_operation_chart(db: Session) -> dict:
+    return _ranked_chart(
+        [(name, t.time_sec_sum / t.result_count / 60) for t, name in _summary_operation_rows(db)], digits=2
     )
-    
-    # DataFrame 변환
-    df_orders = pd.DataFrame([{
-        "order_id": str(r.order_id),
-        "product_id": r.product_id,
-        "product_name": r.product_name,
-        "planned_qty": r.planned_qty,
-        "status": r.status,
-        "created_ts": r.created_ts,
-        "start_ts": r.start_ts,
-        "end_ts": r.end_ts,
-    } for r in orders_query])
-    
-    # 2. 작업실적 데이터 조회
-    results_query = (
-        db.query(
-            WorkResult.result_id,
-            WorkResult.order_id,
+
+
+def summary_equipment_chart(db: Session) -> dict:
+    return _ranked_chart([
+        (r.equipment_name, r.result_count) for r in
+        db.query(DashboardEquipmentCount.result_count, MasterEquipment.name.label("equipment_name"))
+        .join(MasterEquipment, DashboardEquipmentCount.equipment_id == MasterEquipment.equipment_id)
+        .filter(DashboardEquipmentCount.result_count > 0)
+        .order_by(DashboardEquipmentCount.result_count.desc())
+        .limit(10)
+        .all()
+    ], limit=10)
+
+
+def summary_daily_chart(db: Session) -> dict:
+    start_date, end_date = _daily_range()
+    return _daily_chart([
+        (r.prod_date, r.total_qty) for r in
+        db.query(DashboardDailyProduction)
+        .filter(
+            DashboardDailyProduction.prod_date >= start_date,
+            DashboardDailyProduction.prod_date <= end_date,
+            DashboardDailyProduction.total_qty > 0,
+        )
+        .all()
+    ])
+
+
+def summary_deviation_chart(db: Session) -> dict:
+    result_count = db.query(func.coalesce(func.sum(DashboardOperationTotal.result_count), 0)).scalar()
+    deviation_counts = {r.bin_index: r.result_count for r in db.query(DashboardDeviationBin).all()}
+    return _deviation_chart(deviation_counts, result_count)
+
+
+# 위젯 이름 -> (집계 테이블 조회 함수), 전체 응답에서의 키
+SUMMARY_WIDGETS = {
+    "kpi": summary_kpi,
+    "product": summary_product_chart,
+    "status": summary_status_chart,
+    "operation": summary_operation_chart,
+    "equipment": summary_equipment_chart,
+    "daily": summary_daily_chart,
+    "deviation": summary_deviation_chart,
+}
+WIDGET_KEYS = {
+    "kpi": "kpi",
+    "product": "product_chart",
+    "status": "status_chart",
+    "operation": "operation_chart",
+    "equipment": "equipment_chart",
+    "daily": "daily_chart",
+    "deviation": "deviation_chart",
+}
+
+
+def get_dashboard_data_summary(db: Session):
+    """
+    대시보드 데이터 (집계 테이블 조회)
+    집계 테이블은 작업지시/실적을 쓰는 트랜잭션에서 함께 갱신된다 (services/dashboard_summary.py)
+    """
+    return {WIDGET_KEYS[name]: fn(db) for name, fn in SUMMARY_WIDGETS.items()}
+
+
+def get_dashboard_data_sql(db: Session):
+    """
+    대시보드 데이터 (원본 테이블을 SQL 로 집계, 왕복 1회)
+
+    시리즈별 GROUP BY 를 UNION ALL 로 묶어 (series, label, v1, v2) 행으로 받는다.
+    표준시간은 master_operation_standards 조인, 편차율 구간은 width_bucket 으로 계산
+    (구간이 오른쪽 닫힘 (lo, hi] 이므로 부호를 뒤집어 width_bucket 의 [lo, hi) 에 맞춤).
+    """
+    def series(name, label, v1, v2=None):
+        return select(
+            literal(name).label("series"),
+            cast(label, String).label("label"),
+            cast(v1, Float).label("v1"),
+            cast(v2 if v2 is not None else literal(None), Float).label("v2"),
+        )
+
+    actual_sec = func.extract("epoch", WorkResult.end_ts - WorkResult.start_ts)
+    std = MasterOperationStandard.standard_cycle_time_sec
+    results = (
+        select(
             WorkResult.operation_seq,
             WorkResult.equipment_id,
-            WorkResult.start_ts,
-            WorkResult.end_ts,
-            WorkOrder.product_id,
-            WorkOrder.planned_qty,
-            MasterOperation.operation_name,
-            MasterEquipment.name.label("equipment_name"),
+            actual_sec.label("actual_sec"),
+            case(
+                (and_(std > 0, WorkOrder.planned_qty > 0),
+                 (actual_sec / WorkOrder.planned_qty - std) / std * 100),
+                else_=None,
+            ).label("deviation"),
         )
         .join(WorkOrder, WorkResult.order_id == WorkOrder.order_id)
         .join(MasterOperation, WorkResult.operation_seq == MasterOperation.operation_seq)
-        .outerjoin(MasterEquipment, WorkResult.equipment_id == MasterEquipment.equipment_id)
-        .all()
+        .outerjoin(MasterOperationStandard, and_(
+            MasterOperationStandard.product_id == WorkOrder.product_id,
+            MasterOperationStandard.operation_seq == WorkResult.operation_seq,
+        ))
+        .cte("r")
+    )
+    start_date, end_date = _daily_range()
+    completion_date = func.date(WorkOrder.end_ts)
+    # SELECT 와 GROUP BY 의 식이 같아야 하므로 상수는 바인드 파라미터 대신 SQL 리터럴로
+    n_bins = len(DEVIATION_BINS) - 1
+    bucket = literal_column(str(n_bins)) - func.width_bucket(
+        -results.c.deviation,
+        literal_column(str(-DEVIATION_BINS[-1])), literal_column(str(-DEVIATION_BINS[0])), literal_column(str(n_bins)),
     )
-    
-    # DataFrame 변환
-    df_results = pd.DataFrame([{
-        "result_id": str(r.result_id),
-        "order_id": str(r.order_id),
-        "operation_seq": r.operation_seq,
-        "operation_name": r.operation_name,
-        "equipment_id": r.equipment_id,
-        "equipment_name": r.equipment_name,
-        "start_ts": r.start_ts,
-        "end_ts": r.end_ts,
-        "product_id": r.product_id,
-        "planned_qty": r.planned_qty,
-    } for r in results_query])
-    
-    # 3. 표준시간 데이터 조회
-    standards_query = db.query(MasterOperationStandard).all()
-    standard_times = {
-        (s.product_id, s.operation_seq): s.standard_cycle_time_sec
-        for s in standards_query
-    }
 
-    # 4. 작업시간 계산
-    if not df_results.empty:
-        df_results['actual_time_sec'] = (
-            pd.to_datetime(df_results['end_ts']) - pd.to_datetime(df_results['start_ts'])
-        ).dt.total_seconds()
-        df_results['actual_time_min'] = df_results['actual_time_sec'] / 60
-        
-        # 표준시간 추가
-        df_results['standard_time_sec'] = df_results.apply(
-            lambda row: standard_times.get((row['product_id'], row['operation_seq']), 0),
-            axis=1
-        )
-        
-        # 단위당 실제시간 및 편차율 계산
-        df_results['actual_time_per_unit'] = df_results['actual_time_sec'] / df_results['planned_qty']
-        df_results['deviation_rate'] = (
-            (df_results['actual_time_per_unit'] - df_results['standard_time_sec']) 
-            / df_results['standard_time_sec'] * 100
-        )
-    
-    # 5. 제품별 생산 현황
-    product_summary = df_orders.groupby(['product_id', 'product_name']).agg({
-        'order_id': 'count',
-        'planned_qty': 'sum',
-    }).reset_index()
-    product_summary.columns = ['product_id', 'product_name', 'order_count', 'total_qty']
-    product_summary = product_summary.sort_values('order_count', ascending=False)
-    
-    # Chart.js 데이터 형식
-    product_chart = {
-        "labels": product_summary['product_name'].tolist(),
-        "data": product_summary['order_count'].tolist(),
-    }
+    query = union_all(
+        series("product", MasterProduct.name, func.count(), func.sum(WorkOrder.planned_qty))
+        .join_from(WorkOrder, MasterProduct, WorkOrder.product_id == MasterProduct.product_id)
+        .group_by(MasterProduct.product_id, MasterProduct.name),
 
-    # 6. 상태별 작업지시 분포
-    status_names = {
-        "S0_PLANNED": "계획",
-        "S1_READY": "부품준비",
-        "S2_ASSEMBLY": "조립",
-        "S3_INSPECTION": "검사",
-        "S4_PACK": "포장",
-        "S5_DONE": "완료",
-    }
-    #status를 일반 컬럼으로 변경하고 index를 0부터 재할당
-    status_summary = df_orders['status'].value_counts().reset_index() 
-    status_summary.columns = ['status', 'count']
-    status_summary['status_name'] = status_summary['status'].map(status_names)
-    
-    status_chart = {
-        "labels": status_summary['status_name'].tolist(),
-        "data": status_summary['count'].tolist(),
-    }
+        series("status", WorkOrder.status, func.count())
+        .select_from(WorkOrder)
+        .group_by(WorkOrder.status),
 
-    # 7. 공정별 평균 작업시간
-    if not df_results.empty:
-        operation_summary = df_results.groupby('operation_name')['actual_time_min'].mean().reset_index()
-        operation_summary.columns = ['operation_name', 'avg_time_min']
-        operation_summary = operation_summary.sort_values('avg_time_min', ascending=False)
-        
-        operation_chart = {
-            "labels": operation_summary['operation_name'].tolist(),
-            "data": operation_summary['avg_time_min'].round(2).tolist(),
-        }
-    else:
-        operation_chart = {"labels": [], "data": []}
-
-    # 8. 설비별 작업 건수 (Top 10)
-    if not df_results.empty and df_results['equipment_name'].notna().any():
-        equipment_summary = df_results['equipment_name'].value_counts().head(10).reset_index()
-        equipment_summary.columns = ['equipment_name', 'count']
-        
-        equipment_chart = {
-            "labels": equipment_summary['equipment_name'].tolist(),
-            "data": equipment_summary['count'].tolist(),
-        }
-    else:
-        equipment_chart = {"labels": [], "data": []}
-    
-    # 9. 일별 생산량 추이 (최근 30일)
-    completed_orders = df_orders[df_orders['status'] == 'S5_DONE'].copy()
-    if not completed_orders.empty:
-        completed_orders['completion_date'] = pd.to_datetime(completed_orders['end_ts']).dt.date
-        
-        # 최근 30일
-        end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=30)
-        
-        daily_production = completed_orders[
-            (completed_orders['completion_date'] >= start_date) &
-            (completed_orders['completion_date'] <= end_date)
-        ].groupby('completion_date')['planned_qty'].sum().reset_index()
-        
-        daily_production.columns = ['date', 'qty']
-        daily_production = daily_production.sort_values('date')
-        
-        daily_chart = {
-            "labels": [d.strftime('%m/%d') for d in daily_production['date'].tolist()],
-            "data": daily_production['qty'].tolist(),
-        }
-    else:
-        daily_chart = {"labels": [], "data": []}
-    
-    # 10. 편차율 분포 (히스토그램)
-    if not df_results.empty and 'deviation_rate' in df_results.columns:
-        # -50% ~ 50% 범위를 10개 구간으로
-        bins = [-50, -40, -30, -20, -10, 0, 10, 20, 30, 40, 50]
-        df_results['deviation_bin'] = pd.cut(df_results['deviation_rate'], bins=bins)
-        deviation_hist = df_results['deviation_bin'].value_counts().sort_index()
-        
-        deviation_chart = {
-            "labels": [str(interval) for interval in deviation_hist.index],
-            "data": deviation_hist.values.tolist(),
-        }
-    else:
-        deviation_chart = {"labels": [], "data": []}
-    
-    # 11. KPI 요약 지표
-    total_orders = len(df_orders)
-    completed_orders_count = len(df_orders[df_orders['status'] == 'S5_DONE'])
-    in_progress_count = len(df_orders[df_orders['status'].isin(['S1_READY', 'S2_ASSEMBLY', 'S3_INSPECTION', 'S4_PACK'])])
-    planned_count = len(df_orders[df_orders['status'] == 'S0_PLANNED'])
-    
-    completion_rate = (completed_orders_count / total_orders * 100) if total_orders > 0 else 0
-    
-    avg_deviation = df_results['deviation_rate'].mean() if not df_results.empty and 'deviation_rate' in df_results.columns else 0
-    
-    kpi = {
-        "total_orders": total_orders,
-        "completed_orders": completed_orders_count,
-        "in_progress": in_progress_count,
-        "planned": planned_count,
-        "completion_rate": round(completion_rate, 1),
-        "avg_deviation_rate": round(avg_deviation, 2),
-    }
-    
-    # 반환 데이터
+        series("operation", MasterOperation.operation_name, func.avg(results.c.actual_sec), func.count())
+        .join_from(results, MasterOperation, results.c.operation_seq == MasterOperation.operation_seq)
+        .group_by(MasterOperation.operation_name),
+
+        series("equipment", MasterEquipment.name, func.count())
+        .join_from(results, MasterEquipment, results.c.equipment_id == MasterEquipment.equipment_id)
+        .group_by(MasterEquipment.name),
+
+        series("daily", completion_date, func.sum(WorkOrder.planned_qty))
+        .select_from(WorkOrder)
+        .where(WorkOrder.status == "S5_DONE", completion_date >= start_date, completion_date <= end_date)
+        .group_by(completion_date),
+
+        series("deviation", bucket, func.count())
+        .select_from(results)
+        .where(results.c.deviation > DEVIATION_BINS[0], results.c.deviation <= DEVIATION_BINS[-1])
+        .group_by(bucket),
+
+        series("deviation_avg", literal(""), func.avg(results.c.deviation), func.count(results.c.deviation))
+        .select_from(results),
+    )
+
+    rows = {}
+    for r in db.execute(query):
+        rows.setdefault(r.series, []).append(r)
+
+    operation_rows = rows.get("operation", [])
+    status_counts = {r.label: int(r.v1) for r in rows.get("status", [])}
+    deviation_avg = rows["deviation_avg"][0].v1 if rows.get("deviation_avg") else None
     return {
-        "kpi": kpi,
-        "product_chart": product_chart,
-        "status_chart": status_chart,
-        "operation_chart": operation_chart,
-        "equipment_chart": equipment_chart,
-        "daily_chart": daily_chart,
-        "deviation_chart": deviation_chart,
+        "kpi": _kpi(status_counts, deviation_avg),
+        "product_chart": _ranked_chart([(r.label, int(r.v1)) for r in rows.get("product", [])]),
+        "status_chart": _status_chart(status_counts),
+        "operation_chart": _ranked_chart([(r.label, r.v1 / 60) for r in operation_rows], digits=2),
+        "equipment_chart": _ranked_chart([(r.label, int(r.v1)) for r in rows.get("equipment", [])], limit=10),
+        "daily_chart": _daily_chart([(date.fromisoformat(r.label), int(r.v1)) for r in rows.get("daily", [])]),
+        "deviation_chart": _deviation_chart(
+            {int(r.label): int(r.v1) for r in rows.get("deviation", [])},
+            int(sum(r.v2 for r in operation_rows)),
+        ),
     }
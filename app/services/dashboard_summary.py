@@ -0,0 +1,208 @@
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from core.database import SessionLocal
+from services.production_series import get_daily_production_series
+from models.work_order import WorkOrder
+from models.work_result import WorkResult
+from models.master_operation_standard import MasterOperationStandard
+from models.dashboard_summary import (
+    DashboardStatusCount,
+    DashboardProductTotal,
+    DashboardOperationTotal,
+    DashboardEquipmentCount,
+    DashboardDailyProduction,
+    DashboardDeviationBin,
+)
+
+# 편차율 히스토그램 구간 (-50% ~ 50%, 10% 단위, 오른쪽 닫힘: (-50, -40], ..., (40, 50])
+DEVIATION_BINS = [-50, -40, -30, -20, -10, 0, 10, 20, 30, 40, 50]
+
+DONE_STATUS = "S5_DONE"
+_COUNT_COLUMNS = {"order_count", "total_qty", "result_count", "deviation_count"}
+REBUILD_CHUNK_SIZE = 5000
+
+# 집계 테이블별 (모델, 키 컬럼)
+_TABLES = {
+    "status": (DashboardStatusCount, "status"),
+    "product": (DashboardProductTotal, "product_id"),
+    "operation": (DashboardOperationTotal, "operation_seq"),
+    "equipment": (DashboardEquipmentCount, "equipment_id"),
+    "daily": (DashboardDailyProduction, "prod_date"),
+    "deviation": (DashboardDeviationBin, "bin_index"),
+}
+
+
+class SummaryDelta:
+    """
+    대시보드 집계 증감 누적기
+
+    작업지시 생성/수정/삭제, 공정 실적 추가를 (변경 전, 변경 후) 로 받아
+    집계 테이블 키별 증감을 모은 뒤 apply() 에서 테이블마다 INSERT ... ON CONFLICT 1회로 반영한다.
+    호출한 쪽의 트랜잭션 안에서 실행되므로 원본 데이터와 함께 commit/rollback 된다.
+    """
+
+    def __init__(self):
+        self.deltas = {name: defaultdict(lambda: defaultdict(float)) for name in _TABLES}
+
+    def add(self, table: str, key, **values):
+        if key is None:
+            return
+        row = self.deltas[table][key]
+        for col, v in values.items():
+            row[col] += v
+
+    def order(self, before: tuple | None, after: tuple | None):
+        """
+        작업지시 변경 반영
+        before/after: (product_id, planned_qty, status, end_ts) - 생성은 before=None, 삭제는 after=None
+        """
+        for snapshot, sign in ((before, -1), (after, 1)):
+            if snapshot is None:
+                continue
+            product_id, planned_qty, status, end_ts = snapshot
+            self.add("status", status, order_count=sign)
+            self.add("product", product_id, order_count=sign, total_qty=sign * planned_qty)
+            if status == DONE_STATUS and end_ts is not None:
+                self.add("daily", end_ts.date(), order_count=sign, total_qty=sign * planned_qty)
+
+    def result(self, operation_seq: int, equipment_id: str | None, start_ts: datetime, end_ts: datetime,
+               product_id: str, planned_qty: int, standard_sec: float | None, sign: int = 1):
+        """공정 실적 1건 반영 (sign=-1 이면 제거: 수량 변경 시 편차율 재계산용)"""
+        actual_sec = (end_ts - start_ts).total_seconds()
+        values = {"result_count": sign, "time_sec_sum": sign * actual_sec}
+        if standard_sec and planned_qty:
+            deviation = (actual_sec / planned_qty - standard_sec) / standard_sec * 100
+            values.update(deviation_count=sign, deviation_sum=sign * deviation)
+            bin_index = bisect_left(DEVIATION_BINS, deviation) - 1
+            if 0 <= bin_index < len(DEVIATION_BINS) - 1:
+                self.add("deviation", bin_index, result_count=sign)
+        self.add("operation", operation_seq, **values)
+        self.add("equipment", equipment_id, result_count=sign)
+
+    def apply(self, db: Session):
+        for name, (model, key_col) in _TABLES.items():
+            # 키 순서로 갱신 (동시 트랜잭션 간 교착 방지), 증감이 0 인 키는 생략
+            rows = [
+                {key_col: key, **values}
+                for key, values in sorted(self.deltas[name].items())
+                if any(values.values())
+            ]
+            if not rows:
+                continue
+            # 여러 행 VALUES 는 컬럼이 같아야 하므로 없는 컬럼은 0 으로 채움
+            cols = sorted({c for r in rows for c in r if c != key_col})
+            for r in rows:
+                for c in cols:
+                    v = r.get(c, 0)
+                    r[c] = int(round(v)) if c in _COUNT_COLUMNS else v
+            stmt = pg_insert(model).values(rows)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[key_col],
+                set_={c: getattr(model, c) + stmt.excluded[c] for c in cols},
+            ))
+
+
+    def after_commit(self):
+        """commit 후 호출: 일별 생산량 메모리 시리즈(사용 시)에 증감 반영"""
+        series = get_daily_production_series()
+        if series is None:
+            return
+        daily = {d: v["total_qty"] for d, v in self.deltas["daily"].items() if v.get("total_qty")}
+        if daily:
+            series.apply(daily)
+
+
+def load_standards(db: Session, product_ids) -> dict:
+    """(product_id, operation_seq) -> 단위당 표준시간(초)"""
+    product_ids = list(set(product_ids))
+    if not product_ids:
+        return {}
+    return {
+        (r.product_id, r.operation_seq): r.standard_cycle_time_sec
+        for r in db.query(
+            MasterOperationStandard.product_id,
+            MasterOperationStandard.operation_seq,
+            MasterOperationStandard.standard_cycle_time_sec,
+        ).filter(MasterOperationStandard.product_id.in_(product_ids)).all()
+    }
+
+
+def record_order_change(db: Session, before: tuple | None, after: tuple | None, results: list = ()):
+    """
+    작업지시 1건 변경 집계 반영 (commit 은 호출한 쪽에서, commit 후 반환값의 after_commit() 호출)
+    results: 수량이 바뀐 경우 해당 작업지시의 기존 실적 (편차율 재계산)
+    """
+    delta = SummaryDelta()
+    delta.order(before, after)
+    if results and before and after and before[1] != after[1]:
+        standards = load_standards(db, [before[0], after[0]])
+        for r in results:
+            delta.result(r.operation_seq, r.equipment_id, r.start_ts, r.end_ts,
+                         before[0], before[1], standards.get((before[0], r.operation_seq)), sign=-1)
+            delta.result(r.operation_seq, r.equipment_id, r.start_ts, r.end_ts,
+                         after[0], after[1], standards.get((after[0], r.operation_seq)))
+    delta.apply(db)
+    return delta
+
+
+def rebuild_dashboard_summary(db: Session):
+    """원본 테이블에서 집계 테이블 전체 재생성 (최초 1회 / 직접 수정된 데이터 보정용)"""
+    for model, _ in _TABLES.values():
+        db.query(model).delete(synchronize_session=False)
+
+    delta = SummaryDelta()
+    orders = (
+        db.query(
+            WorkOrder.product_id,
+            WorkOrder.status,
+            func.date(WorkOrder.end_ts).label("end_date"),
+            func.count().label("order_count"),
+            func.coalesce(func.sum(WorkOrder.planned_qty), 0).label("total_qty"),
+        )
+        .group_by(WorkOrder.product_id, WorkOrder.status, func.date(WorkOrder.end_ts))
+        .all()
+    )
+    for r in orders:
+        delta.add("status", r.status, order_count=r.order_count)
+        delta.add("product", r.product_id, order_count=r.order_count, total_qty=r.total_qty)
+        if r.status == DONE_STATUS and r.end_date is not None:
+            delta.add("daily", r.end_date, order_count=r.order_count, total_qty=r.total_qty)
+
+    # 편차율 구간은 행 단위 계산이 필요하므로 실적을 청크 단위로 읽어 누적
+    standards = load_standards(db, [r.product_id for r in orders])
+    results = (
+        db.query(
+            WorkResult.operation_seq,
+            WorkResult.equipment_id,
+            WorkResult.start_ts,
+            WorkResult.end_ts,
+            WorkOrder.product_id,
+            WorkOrder.planned_qty,
+        )
+        .join(WorkOrder, WorkResult.order_id == WorkOrder.order_id)
+        .yield_per(REBUILD_CHUNK_SIZE)
+    )
+    for r in results:
+        delta.result(r.operation_seq, r.equipment_id, r.start_ts, r.end_ts,
+                     r.product_id, r.planned_qty, standards.get((r.product_id, r.operation_seq)))
+
+    delta.apply(db)
+    db.commit()
+
+
+def init_dashboard_summary():
+    """집계 테이블이 비어 있고 작업지시가 있으면 재생성 (집계 도입 전 데이터)"""
+    db = SessionLocal()
+    try:
+        if db.query(DashboardStatusCount.status).first() is None \
+                and db.query(WorkOrder.order_id).first() is not None:
+            rebuild_dashboard_summary(db)
+            print("대시보드 집계 테이블 생성 완료")
+    finally:
+        db.close()
@@ -1,29 +1,69 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, insert
+from pydantic import ValidationError
 
 from models.equipment_sensor_data import EquipmentSensorData
+from models.master_equipment import MasterEquipment
+from schemas.equipment import SensorReading
+from services.sensor_ingest import get_sensor_ingest_buffer, SENSOR_RETRY_AFTER_SEC
+from services.sensor_rollup import apply_sensor_rollups, get_sensor_trend
+from services.sensor_anomaly import get_sensor_anomaly_scorer
+from services.sensor_stream import get_sensor_stream_hub
+from core.sensor_partition import ensure_sensor_partitions_for, is_within_retention
+from core.pagination import clamp_page_size, parse_datetime, paginate
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from fastapi import Request
+import os
 
-def list_equipment_sensor_data(request: Request, db: Session):
-    """센서 데이터 목록 조회"""
-    q = (
-        db.query(
-            EquipmentSensorData.sensor_id,
-            EquipmentSensorData.timestamp,
-            EquipmentSensorData.equipment_id,
-            EquipmentSensorData.temperature,
-            EquipmentSensorData.vibration,
-            EquipmentSensorData.current,
-            EquipmentSensorData.rpm,
-            EquipmentSensorData.pressure,
-            EquipmentSensorData.status,
-        )
-        .order_by(EquipmentSensorData.timestamp.desc())
+# 배치 1회당 최대 허용 건수
+SENSOR_BATCH_MAX_ROWS = int(os.getenv("SENSOR_BATCH_MAX_ROWS", "10000"))
+
+def list_equipment_sensor_data(request: Request, db: Session,
+                               equipment_id: str | None = None,
+                               start_raw: str | None = None,
+                               end_raw: str | None = None,
+                               status: str | None = None,
+                               cursor: str | None = None,
+                               limit_raw: str | None = None):
+    """
+    센서 데이터 목록 조회 (keyset 페이지네이션)
+    정렬 키 (timestamp, sensor_id) 내림차순, 커서 이후 limit 건만 조회하므로
+    테이블 크기와 무관하게 페이지 조회 비용이 일정하다.
+    """
+    limit = clamp_page_size(limit_raw)
+    start = parse_datetime(start_raw)
+    end = parse_datetime(end_raw)
+
+    q = db.query(
+        EquipmentSensorData.sensor_id,
+        EquipmentSensorData.timestamp,
+        EquipmentSensorData.equipment_id,
+        EquipmentSensorData.temperature,
+        EquipmentSensorData.vibration,
+        EquipmentSensorData.current,
+        EquipmentSensorData.rpm,
+        EquipmentSensorData.pressure,
+        EquipmentSensorData.status,
     )
 
-    rows = q.all()
+    # 서버측 필터 (시간 조건은 파티션 pruning 에도 사용됨)
+    if equipment_id:
+        q = q.filter(EquipmentSensorData.equipment_id == equipment_id)
+    if start:
+        q = q.filter(EquipmentSensorData.timestamp >= start)
+    if end:
+        q = q.filter(EquipmentSensorData.timestamp < end)
+    if status == "anomaly":
+        q = q.filter(EquipmentSensorData.status.is_(True))
+    elif status == "normal":
+        q = q.filter(EquipmentSensorData.status.is_(False))
+    elif status == "unscored":
+        q = q.filter(EquipmentSensorData.status.is_(None))
+
+    # 커서 이후 limit 건 (정렬 키: timestamp, sensor_id 내림차순)
+    columns = [EquipmentSensorData.timestamp, EquipmentSensorData.sensor_id]
+    rows, next_cursor = paginate(q, columns, True, cursor, limit)
 
     # 템플릿에서 쓰기 편하도록 dict 리스트로 변환
     items = []
@@ -40,25 +80,105 @@ def list_equipment_sensor_data(request: Request, db: Session):
             "status": r.status,
         })
 
+    # 설비 목록 (필터용)
+    equipments = (
+        db.query(MasterEquipment.equipment_id, MasterEquipment.name)
+        .order_by(MasterEquipment.equipment_id)
+        .all()
+    )
+
     return {
         "items": items,
         "total": len(items),
+        "next_cursor": next_cursor,
+        "equipments": equipments,
+        "filters": {
+            "equipment_id": equipment_id or "",
+            "start": start_raw or "",
+            "end": end_raw or "",
+            "status": status or "",
+            "limit": limit,
+        },
     }
 
-def create_equipment_sensor_data(Request, db: Session, data: dict):
-    """센서 데이터 등록"""
-    sensor_data = EquipmentSensorData(
-        timestamp = data['timestamp'],
-        equipment_id = data['equipment_id'],
-        temperature = data['temperature'],
-        vibration = data['vibration'],
-        current = data['current'],
-        rpm = data['rpm'],
-        pressure = data['pressure'],
-        
-    )
-    db.add(sensor_data)
-    db.commit()
-    db.refresh(sensor_data)
-    
-    return sensor_data
\ No newline at end of file
+def create_equipment_sensor_data(request: Request, db: Session, reading: SensorReading) -> bool:
+    """센서 데이터 등록 (write-behind 버퍼에 적재, 커밋은 flusher가 그룹 단위로 수행)"""
+    if reading.equipment_id not in _get_known_equipment_ids(db, {reading.equipment_id}):
+        raise ValueError(f"알 수 없는 설비 ID: {reading.equipment_id}")
+    if not is_within_retention(reading.timestamp):
+        raise ValueError(f"보존기간이 지난 측정 시각: {reading.timestamp}")
+
+    return get_sensor_ingest_buffer().offer(reading.model_dump())
+
+# 설비 ID 캐시 (마스터는 거의 변하지 않으므로 모르는 ID가 들어올 때만 다시 조회)
+_known_equipment_ids: set = set()
+
+def _get_known_equipment_ids(db: Session, equipment_ids: set) -> set:
+    global _known_equipment_ids
+    if not equipment_ids <= _known_equipment_ids:
+        _known_equipment_ids = {r.equipment_id for r in db.query(MasterEquipment.equipment_id).all()}
+    return _known_equipment_ids
+
+def create_equipment_sensor_data_batch(db: Session, readings: list):
+    """센서 데이터 일괄 등록 (검증 후 multi-row INSERT 1회, commit 1회)"""
+    rows = []
+    rejected = []
+
+    # 1) 스키마 검증 (행 단위로 거부 사유 기록)
+    for idx, raw in enumerate(readings):
+        try:
+            reading = SensorReading.model_validate(raw)
+        except ValidationError as e:
+            rejected.append({
+                "index": idx,
+                "reason": "; ".join(
+                    f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+                ),
+            })
+            continue
+        rows.append((idx, reading.model_dump()))
+
+    # 2) 설비 ID 검증 (캐시에 없는 ID가 있을 때만 쿼리 1회)
+    known_ids = _get_known_equipment_ids(db, {row["equipment_id"] for _, row in rows})
+
+    valid_rows = []
+    for idx, row in rows:
+        if row["equipment_id"] not in known_ids:
+            rejected.append({"index": idx, "reason": f"알 수 없는 설비 ID: {row['equipment_id']}"})
+            continue
+        if not is_within_retention(row["timestamp"]):
+            rejected.append({"index": idx, "reason": f"보존기간이 지난 측정 시각: {row['timestamp']}"})
+            continue
+        valid_rows.append(row)
+
+    # 3) 이상 탐지 (배치 전체를 한 번에 판정, 실패해도 미판정으로 저장)
+    scorer = get_sensor_anomaly_scorer()
+    if scorer is not None and valid_rows:
+        try:
+            scorer.apply(valid_rows)
+        except Exception as e:
+            print(f"센서 이상 판정 실패 (미판정으로 저장): {e}")
+
+    # 4) multi-row INSERT (해당 날짜 파티션이 없으면 먼저 생성)
+    if valid_rows:
+        ensure_sensor_partitions_for(row["timestamp"] for row in valid_rows)
+        db.execute(insert(EquipmentSensorData), valid_rows)
+        apply_sensor_rollups(db, valid_rows)
+        db.commit()
+        get_sensor_stream_hub().publish(valid_rows)
+
+    rejected.sort(key=lambda r: r["index"])
+    return {
+        "received": len(readings),
+        "inserted": len(valid_rows),
+        "rejected": rejected,
+    }
+
+def get_equipment_sensor_trend(db: Session, equipment_id: str, start_raw: str | None, end_raw: str | None):
+    """설비 센서 추이 (기본: 최근 24시간, 형식이 잘못된 시각은 ValueError)"""
+    start, end = parse_datetime(start_raw), parse_datetime(end_raw)
+    if (start_raw and start is None) or (end_raw and end is None):
+        raise ValueError("start/end 는 ISO 8601 시각이어야 합니다 (예: 2025-09-01T09:00)")
+    end = end or datetime.now()
+    start = start or end - timedelta(hours=24)
+    return get_sensor_trend(db, equipment_id, start, end)
@@ -0,0 +1,189 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from core.metrics import register_metrics
+
+# 납기/품질 예측 브로커 설정 (환경변수)
+DELIVERY_BROKER_MAX_BATCH_SIZE = int(os.getenv("DELIVERY_BROKER_MAX_BATCH_SIZE", "64"))   # 1회 추론 최대 행 수
+DELIVERY_BROKER_MAX_WAIT_MS = float(os.getenv("DELIVERY_BROKER_MAX_WAIT_MS", "5"))        # 첫 요청 후 최대 대기 시간
+DELIVERY_BROKER_TIMEOUT_SEC = float(os.getenv("DELIVERY_BROKER_TIMEOUT_SEC", "10"))       # 호출자 최대 대기 시간
+
+
+class _PendingRequest:
+    __slots__ = ("X", "future", "enqueued")
+
+    def __init__(self, X: np.ndarray):
+        self.X = X
+        self.future = Future()
+        self.enqueued = time.monotonic()
+
+
+class InferenceBroker:
+    """
+    추론 요청 병합기 (request coalescing)
+
+    여러 요청 스레드가 predict()를 호출하면 큐에 넣고 결과를 기다린다.
+    워커 스레드는 첫 요청 도착 후 max_wait_ms 동안(또는 max_batch_size 행이 찰 때까지)
+    들어온 요청을 한 배치로 묶어 모델을 1회 호출하고, 결과를 행 단위로 잘라 돌려준다.
+    max_batch_size 이상인 요청(일괄 등록 등)은 이미 배치이므로 큐를 거치지 않고 바로 추론한다.
+    """
+
+    def __init__(self, name: str, predict_fn,
+                 max_batch_size: int = DELIVERY_BROKER_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DELIVERY_BROKER_MAX_WAIT_MS):
+        self.name = name
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue = deque()
+        self._queued_rows = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+        # 지표 (배치 크기 히스토그램은 2의 거듭제곱 구간: <=1, <=2, <=4, ...)
+        self._buckets = [1 << i for i in range(max(max_batch_size - 1, 1).bit_length() + 1)]
+        self._batch_hist = [0] * len(self._buckets)
+        self._requests = 0
+        self._batches = 0
+        self._direct_calls = 0
+        self._max_queue_depth = 0
+        self._wait_ms_sum = 0.0
+        self._forward_ms_sum = 0.0
+        self._forward_ms_max = 0.0
+
+    # 요청 스레드
+    def predict(self, X, timeout: float | None = DELIVERY_BROKER_TIMEOUT_SEC):
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        if len(X) >= self.max_batch_size or self._thread is None:
+            with self._cond:
+                self._direct_calls += 1
+            return self.predict_fn(X)
+
+        req = _PendingRequest(X)
+        with self._cond:
+            self._queue.append(req)
+            self._queued_rows += len(X)
+            self._requests += 1
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+            self._cond.notify()
+        return req.future.result(timeout)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-broker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    # 워커 스레드
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+
+                # 첫 요청 기준으로 max_wait 동안 추가 요청 수집
+                deadline = self._queue[0].enqueued + self.max_wait
+                while self._queued_rows < self.max_batch_size and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = [self._queue.popleft()]
+                rows = len(batch[0].X)
+                while self._queue and rows + len(self._queue[0].X) <= self.max_batch_size:
+                    req = self._queue.popleft()
+                    batch.append(req)
+                    rows += len(req.X)
+                self._queued_rows -= rows
+
+            self._forward(batch, rows)
+
+    def _forward(self, batch: list, rows: int):
+        started = time.monotonic()
+        try:
+            outputs = self.predict_fn(np.vstack([req.X for req in batch]) if len(batch) > 1 else batch[0].X)
+        except Exception as e:
+            for req in batch:
+                req.future.set_exception(e)
+            return
+        forward_ms = (time.monotonic() - started) * 1000
+
+        # 다중 출력 모델은 출력별로 같은 구간을 잘라 전달
+        multi = isinstance(outputs, (list, tuple))
+        offset = 0
+        for req in batch:
+            n = len(req.X)
+            if multi:
+                req.future.set_result([np.asarray(o)[offset:offset + n] for o in outputs])
+            else:
+                req.future.set_result(np.asarray(outputs)[offset:offset + n])
+            offset += n
+
+        with self._cond:
+            self._batches += 1
+            self._batch_hist[min((rows - 1).bit_length(), len(self._buckets) - 1)] += 1
+            self._wait_ms_sum += sum(started - req.enqueued for req in batch) * 1000
+            self._forward_ms_sum += forward_ms
+            self._forward_ms_max = max(self._forward_ms_max, forward_ms)
+
+    def get_metrics(self) -> dict:
+        with self._cond:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self._max_queue_depth,
+                "requests": self._requests,
+                "batches": self._batches,
+                "direct_calls": self._direct_calls,
+                "avg_batch_requests": round(self._requests / self._batches, 2) if self._batches else 0.0,
+                "batch_size_histogram": {f"<={b}": n for b, n in zip(self._buckets, self._batch_hist)},
+                "avg_queue_wait_ms": round(self._wait_ms_sum / self._requests, 2) if self._requests else 0.0,
+                "avg_forward_ms": round(self._forward_ms_sum / self._batches, 2) if self._batches else 0.0,
+                "max_forward_ms": round(self._forward_ms_max, 2),
+            }
+
+
+# 전역 인스턴스 (서버 시작시 app.state.ai_models 로부터 생성)
+_delivery_quality_broker = None
+
+
+def init_delivery_quality_broker(ai_models: dict):
+    global _delivery_quality_broker
+    model = ai_models.get("dnn_delivery_quality_model")
+    if model is None:
+        print("납기/품질 예측 모델이 없어 추론 브로커를 시작하지 않습니다")
+        return None
+    _delivery_quality_broker = InferenceBroker(
+        "delivery_quality", lambda X: model.predict(X, verbose=0)
+    )
+    _delivery_quality_broker.start()
+    register_metrics("delivery_quality_broker", _delivery_quality_broker.get_metrics)
+    return _delivery_quality_broker
+
+
+def get_delivery_quality_broker() -> InferenceBroker | None:
+    return _delivery_quality_broker
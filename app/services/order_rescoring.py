@@ -0,0 +1,166 @@
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import update, values, column, cast, Integer, Boolean, Float, DateTime
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from core.database import SessionLocal
+from core.metrics import register_metrics
+from models.work_order import WorkOrder
+from services.work import predict_delivery_and_quality_batch
+
+# 미완료 작업지시 납기/품질 재예측 설정 (환경변수)
+ORDER_RESCORE_INTERVAL_SEC = int(os.getenv("ORDER_RESCORE_INTERVAL_SEC", "3600"))   # 실행 주기
+ORDER_RESCORE_CHUNK_SIZE = int(os.getenv("ORDER_RESCORE_CHUNK_SIZE", "2000"))       # 한 번에 읽고 예측할 건수
+
+
+class OrderRescorer:
+    """
+    미완료(S5_DONE 이외) 작업지시 납기/품질 예측 갱신 (주기 작업)
+
+    days_to_due 는 날짜가 지날수록 달라지고 수정된 수량/납기도 반영해야 하므로
+    작업지시를 order_id 순서로 청크 단위 조회 -> 청크 전체를 한 번에 예측 ->
+    예측값이 달라진 행만 VALUES 조인 UPDATE 1회로 갱신한다.
+    조회 후 update_order 가 수량/납기를 바꾸고 새 예측을 commit 했을 수 있으므로
+    읽었던 planned_qty/due_date 가 그대로인 행만 갱신한다 (바뀐 행은 다음 실행에서 다시 예측).
+    """
+
+    def __init__(self, ai_models: dict, chunk_size: int = ORDER_RESCORE_CHUNK_SIZE):
+        self.ai_models = ai_models
+        self.chunk_size = chunk_size
+        self.known_products = set(ai_models["dnn_delivery_quality_encoder"].classes_)
+
+        # 지표 (마지막 실행 기준)
+        self._runs = 0
+        self._last_run_ts = None
+        self._last_scanned = 0
+        self._last_scored = 0
+        self._last_changed = 0
+        self._last_duration_ms = 0.0
+
+    def run(self):
+        started = time.monotonic()
+        created_ts = datetime.now().replace(microsecond=0)   # 한 번의 실행은 같은 기준 시각으로 예측
+        scanned = scored = changed = 0
+        last_id = None
+
+        db = SessionLocal()
+        try:
+            while True:
+                q = (
+                    db.query(
+                        WorkOrder.order_id,
+                        WorkOrder.product_id,
+                        WorkOrder.planned_qty,
+                        WorkOrder.due_date,
+                        WorkOrder.pred_delivery,
+                        WorkOrder.pred_defect_rate,
+                    )
+                    .filter(WorkOrder.status != "S5_DONE")
+                    .order_by(WorkOrder.order_id)
+                    .limit(self.chunk_size)
+                )
+                if last_id is not None:
+                    q = q.filter(WorkOrder.order_id > last_id)
+                chunk = q.all()
+                if not chunk:
+                    break
+                last_id = chunk[-1].order_id
+                scanned += len(chunk)
+
+                # 예측 모델이 모르는 제품은 건너뜀
+                rows = [r for r in chunk if r.product_id in self.known_products]
+                if rows:
+                    scored += len(rows)
+                    changed += self._rescore_chunk(db, rows, created_ts)
+
+                if len(chunk) < self.chunk_size:
+                    break
+        finally:
+            db.close()
+
+        self._runs += 1
+        self._last_run_ts = datetime.now().isoformat(timespec="seconds")
+        self._last_scanned = scanned
+        self._last_scored = scored
+        self._last_changed = changed
+        self._last_duration_ms = (time.monotonic() - started) * 1000
+        if changed:
+            print(f"작업지시 예측 갱신: {scanned}건 조회, {changed}건 변경")
+
+    def _rescore_chunk(self, db, rows: list, created_ts: datetime) -> int:
+        pred_delivery, pred_defect_rate = predict_delivery_and_quality_batch(
+            self.ai_models,
+            [r.product_id for r in rows],
+            [r.planned_qty for r in rows],
+            [r.due_date for r in rows],
+            created_ts,
+        )
+        pred_defect_rate = np.round(pred_defect_rate, 1)
+
+        updates = [
+            (r.order_id, r.planned_qty, r.due_date, bool(d), float(q))
+            for r, d, q in zip(rows, pred_delivery, pred_defect_rate)
+            if r.pred_delivery is None or r.pred_defect_rate is None
+            or bool(d) != r.pred_delivery or float(q) != r.pred_defect_rate
+        ]
+        if not updates:
+            return 0
+
+        v = values(
+            column("order_id", PG_UUID(as_uuid=True)),
+            column("planned_qty", Integer),
+            column("due_date", DateTime),
+            column("pred_delivery", Boolean),
+            column("pred_defect_rate", Float),
+            name="v",
+        ).data(updates)
+        updated = db.execute(
+            update(WorkOrder)
+            .where(
+                WorkOrder.order_id == cast(v.c.order_id, PG_UUID(as_uuid=True)),
+                # 읽은 뒤 수량/납기가 바뀐 작업지시는 건너뜀 (더 최신 예측을 덮어쓰지 않도록)
+                WorkOrder.planned_qty == cast(v.c.planned_qty, Integer),
+                WorkOrder.due_date == cast(v.c.due_date, DateTime),
+            )
+            .values(
+                # VALUES 목록의 파라미터는 text 로 추론되므로 컬럼 타입으로 명시 변환
+                pred_delivery=cast(v.c.pred_delivery, Boolean),
+                pred_defect_rate=cast(v.c.pred_defect_rate, Float),
+            )
+            .returning(WorkOrder.order_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+        return len(updated)
+
+    def get_metrics(self) -> dict:
+        return {
+            "interval_sec": ORDER_RESCORE_INTERVAL_SEC,
+            "runs": self._runs,
+            "last_run_ts": self._last_run_ts,
+            "last_scanned": self._last_scanned,
+            "last_scored": self._last_scored,
+            "last_changed": self._last_changed,
+            "last_duration_ms": round(self._last_duration_ms, 2),
+        }
+
+
+# 전역 인스턴스 (서버 시작시 app.state.ai_models 로부터 생성)
+_order_rescorer = None
+
+
+def init_order_rescorer(ai_models: dict):
+    global _order_rescorer
+    if "dnn_delivery_quality_model" not in ai_models:
+        print("납기/품질 예측 모델이 없어 작업지시 재예측을 건너뜁니다")
+        return None
+    _order_rescorer = OrderRescorer(ai_models)
+    register_metrics("order_rescoring", _order_rescorer.get_metrics)
+    return _order_rescorer
+
+
+def get_order_rescorer() -> OrderRescorer | None:
+    return _order_rescorer
@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from core.metrics import register_metrics
+
+# AI 예측 결과 캐시 설정 (환경변수)
+PREDICTION_CACHE_ENABLED = os.getenv("PREDICTION_CACHE_ENABLED", "1") == "1"
+PREDICTION_CACHE_MAX_ENTRIES = int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "10000"))       # 모델별 최대 항목 수 (LRU)
+PREDICTION_CACHE_TTL_SEC = float(os.getenv("PREDICTION_CACHE_TTL_SEC", "3600"))              # 항목 유효 시간
+
+
+class PredictionCache:
+    """
+    AI 모델 예측 결과 캐시 (LRU + TTL)
+
+    키: 인코딩된 입력 특징 행(정규화 전 float64) 바이트, 값: 해당 행의 모델 출력 벡터.
+    작업시간/납기/생산량 모델 입력은 범주형 + 작은 정수라 같은 행이 반복되므로
+    캐시에 없는 행만 (중복 제거 후) 모델에 한 번 넘긴다.
+    항목은 현재 메모리에 로드된 모델 객체(모델/스케일러/인코더)에 묶인다.
+    파일이 바뀌어도 다시 로드하기 전까지는 같은 모델이 예측하므로 파일은 보지 않고,
+    다른 모델 객체로 bind() 되면(재로드) 전체 항목을 비운다.
+    """
+
+    def __init__(self, name: str, models: tuple,
+                 max_entries: int = PREDICTION_CACHE_MAX_ENTRIES, ttl_sec: float = PREDICTION_CACHE_TTL_SEC):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+
+        self._entries = OrderedDict()   # key -> (출력 벡터, 만료 시각)
+        self._lock = threading.Lock()
+        self._models = models           # 항목을 계산한 모델 객체들 (동일성 비교)
+        self._generation = 0            # bind() 로 모델이 바뀔 때마다 증가
+
+        # 지표
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def bind(self, models: tuple):
+        """예측에 쓰는 모델 객체가 이전과 다르면 (재로드) 전체 항목 비움"""
+        if len(models) == len(self._models) and all(a is b for a, b in zip(models, self._models)):
+            return
+        with self._lock:
+            self._models = models
+            self._generation += 1
+            self._entries.clear()
+            self._invalidations += 1
+        print(f"[{self.name}] 모델 재로드 감지, 예측 캐시 초기화")
+
+    def predict(self, X: np.ndarray, predict_fn) -> np.ndarray:
+        """
+        X: (N, F) 인코딩된 입력, predict_fn: (M, F) -> (M, K) 모델 출력
+        반환: (N, K) 출력 (캐시 적중 행 + 새로 예측한 행)
+        """
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        if not PREDICTION_CACHE_ENABLED or len(X) == 0:
+            return np.asarray(predict_fn(X), dtype=np.float64).reshape(len(X), -1)
+
+        keys = [row.tobytes() for row in X]
+        out = [None] * len(keys)
+        missing = {}   # key -> 처음 나온 행 번호 (배치 내 중복 제거)
+        now = time.monotonic()
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(key)
+                    out[i] = entry[0]
+                    self._hits += 1
+                    continue
+                if entry is not None:
+                    del self._entries[key]
+                    self._expirations += 1
+                missing.setdefault(key, i)
+                self._misses += 1
+            generation = self._generation
+
+        if missing:
+            rows = list(missing.values())
+            computed = np.asarray(predict_fn(X[rows]), dtype=np.float64).reshape(len(rows), -1)
+            fresh = dict(zip(missing, computed))
+            for i, key in enumerate(keys):
+                if out[i] is None:
+                    out[i] = fresh[key]
+
+            expires = time.monotonic() + self.ttl_sec
+            with self._lock:
+                # 예측 중 다른 모델로 bind 되었으면 이전 모델 결과는 저장하지 않음
+                if generation == self._generation:
+                    for key, value in fresh.items():
+                        self._entries[key] = (value, expires)
+                        self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self._evictions += 1
+
+        return np.vstack(out)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._invalidations += 1
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_sec": self.ttl_sec,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+
+# 모델별 캐시 (이름 -> PredictionCache), 지표는 /metrics 의 prediction_cache 항목으로 조회
+_caches: dict[str, PredictionCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_prediction_cache(name: str, *models) -> PredictionCache:
+    """이름별 캐시, models: 예측에 쓰는 모델/스케일러/인코더 객체 (바뀌면 캐시 초기화)"""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = PredictionCache(name, models)
+            if len(_caches) == 1:
+                register_metrics("prediction_cache", collect_prediction_cache_metrics)
+            return cache
+    cache.bind(models)
+    return cache
+
+
+def collect_prediction_cache_metrics() -> dict:
+    return {name: cache.get_metrics() for name, cache in list(_caches.items())}
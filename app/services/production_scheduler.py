@@ -0,0 +1,298 @@
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from models.work_order import WorkOrder
+from models.master_equipment import MasterEquipment
+from models.master_operation_standard import MasterOperationStandard
+from models.master_product import MasterProduct
+
+# 스테이션이 있는 공정 단계 (5: 완료는 설비 작업 없음)
+SCHEDULE_OPERATIONS = [1, 2, 3, 4]
+STATUS_STEP = {
+    "S0_PLANNED": 0, "S1_READY": 1, "S2_ASSEMBLY": 2, "S3_INSPECTION": 3, "S4_PACK": 4, "S5_DONE": 5,
+}
+
+SCHEDULER_SEARCH_MS = int(os.getenv("SCHEDULER_SEARCH_MS", "300"))       # 로컬 서치 시간 예산
+SCHEDULER_MOVE_WINDOW = int(os.getenv("SCHEDULER_MOVE_WINDOW", "30"))    # 지연 주문을 앞당길 최대 위치 수
+MIN_TASK_SEC = 1.0
+
+
+class ProductionScheduler:
+    """
+    유한 능력(finite capacity) 생산 일정 계획
+
+    1) 미완료 작업지시의 남은 공정 x 해당 공정 스테이션 조합별 작업시간을 작업시간 예측 모델로
+       한 번에 예측 (모델이 모르는 제품/설비는 표준시간 x 수량)
+    2) 주문 순서(초기: EDD / 최소 여유시간 중 좋은 쪽)대로 공정마다 가장 빨리 끝나는 스테이션에 배정
+    3) 지연 주문을 앞 순서로 옮기는 로컬 서치로 총 납기 지연을 줄임
+       (순서가 바뀐 위치부터만 다시 배정하도록 위치별 스테이션 가용시각을 저장)
+    시간은 계획 시작 시각(now) 기준 초 단위로 계산한다.
+    """
+
+    def __init__(self, orders: list, stations: list, standards: dict, work_time_service=None,
+                 now: datetime | None = None, search_ms: int = SCHEDULER_SEARCH_MS, seed: int = 0):
+        self.now = now or datetime.now().replace(microsecond=0)
+        self.orders = orders
+        self.stations = [s.equipment_id for s in stations]
+        self.station_index = {s: i for i, s in enumerate(self.stations)}
+        self.stations_by_op = {}
+        for s in stations:
+            self.stations_by_op.setdefault(s.operation_seq, []).append(self.station_index[s.equipment_id])
+        self.standards = standards
+        self.work_time_service = work_time_service
+        self.search_ms = search_ms
+        self.rng = random.Random(seed)
+        self.stats = {}
+
+        self.due = np.array([(o.due_date - self.now).total_seconds() for o in orders], dtype=np.float64)
+
+    # 1) 작업시간 예측 (고유 조합만, 모델 호출 1회)
+    def _build_tasks(self):
+        started = time.monotonic()
+        combos = {}
+        task_keys = []   # 주문별 [(공정, [(스테이션 인덱스, 조합 키)])]
+        for o in self.orders:
+            step = STATUS_STEP.get(o.status, 0)
+            ops = []
+            for op in SCHEDULE_OPERATIONS:
+                if op <= step or op not in self.stations_by_op:
+                    continue
+                candidates = self.stations_by_op[op]
+                # 이미 스테이션이 가져간 다음 공정은 그 스테이션에 고정
+                if op == step + 1 and o.claimed_by in self.station_index \
+                        and self.station_index[o.claimed_by] in candidates:
+                    candidates = [self.station_index[o.claimed_by]]
+                options = []
+                for si in candidates:
+                    key = (o.product_id, op, self.stations[si], o.planned_qty)
+                    combos.setdefault(key, None)
+                    options.append((si, key))
+                ops.append((op, options))
+            task_keys.append(ops)
+
+        durations, source = self._predict_durations(list(combos))
+        self.tasks = [
+            [(op, [(si, durations[key]) for si, key in options]) for op, options in ops]
+            for ops in task_keys
+        ]
+        # 주문별 최소 남은 작업시간 (여유시간 계산용)
+        self.min_work = np.array(
+            [sum(min(d for _, d in options) for _, options in ops) for ops in self.tasks], dtype=np.float64
+        )
+        self.stats.update({
+            "unique_predictions": len(combos),
+            "duration_source": source,
+            "predict_ms": round((time.monotonic() - started) * 1000, 2),
+        })
+
+    def _predict_durations(self, keys: list) -> tuple[dict, dict]:
+        durations = {}
+        model_calls = predicted = 0
+        svc = self.work_time_service
+        if svc is not None and keys:
+            try:
+                # 모델이 모르는 제품/설비 조합은 NaN 으로 돌아오고 표준시간으로 대체
+                pred, _ = svc.predict_many(
+                    [k[0] for k in keys], [k[1] for k in keys],
+                    [k[2] for k in keys], [k[3] for k in keys],
+                )
+                model_calls = 1
+                for k, sec in zip(keys, pred):
+                    if not np.isnan(sec):
+                        durations[k] = max(float(sec), MIN_TASK_SEC)
+                predicted = len(durations)
+            except Exception as e:
+                print(f"작업시간 예측 실패, 표준시간 사용: {e}")
+                durations.clear()
+
+        for k in keys:
+            if k not in durations:
+                durations[k] = max(float(self.standards.get((k[0], k[1]), 0) * k[3]), MIN_TASK_SEC)
+        self.stats["model_calls"] = model_calls
+        return durations, {"model": predicted, "standard": len(keys) - predicted}
+
+    # 2) 순서 -> 일정 (list scheduling, 공정마다 가장 빨리 끝나는 스테이션)
+    def _decode(self, seq: list, start_pos: int, free_snap: list, completion: np.ndarray, record: list | None = None):
+        free = list(free_snap[start_pos])
+        tasks = self.tasks
+        for pos in range(start_pos, len(seq)):
+            free_snap[pos] = free[:]
+            oi = seq[pos]
+            ready = 0.0
+            for op, options in tasks[oi]:
+                best_si, best_start, best_end = -1, 0.0, float("inf")
+                for si, dur in options:
+                    start = free[si] if free[si] > ready else ready
+                    end = start + dur
+                    if end < best_end:
+                        best_si, best_start, best_end = si, start, end
+                free[best_si] = best_end
+                ready = best_end
+                if record is not None:
+                    record.append((oi, op, best_si, best_start, best_end))
+            completion[oi] = ready
+        free_snap[len(seq)] = free
+
+    def _objective(self, completion: np.ndarray) -> float:
+        # 총 납기 지연(초) 우선, 동률이면 완료시각 합이 작은 쪽
+        return float(np.maximum(completion - self.due, 0).sum() + 1e-3 * completion.sum())
+
+    def _evaluate(self, seq: list):
+        free_snap = [None] * (len(seq) + 1)
+        free_snap[0] = [0.0] * len(self.stations)
+        completion = np.zeros(len(self.orders), dtype=np.float64)
+        self._decode(seq, 0, free_snap, completion)
+        return free_snap, completion, self._objective(completion)
+
+    # 3) 로컬 서치: 지연 주문을 앞으로 이동 (개선될 때만 채택)
+    def _local_search(self, seq: list, free_snap: list, completion: np.ndarray, best: float):
+        deadline = time.monotonic() + self.search_ms / 1000
+        iterations = accepted = 0
+        n = len(seq)
+        while n > 1 and time.monotonic() < deadline:
+            iterations += 1
+            pos_of = {oi: p for p, oi in enumerate(seq)}
+            late = [oi for oi in seq if completion[oi] > self.due[oi] and pos_of[oi] > 0]
+            if late and self.rng.random() < 0.8:
+                i = pos_of[self.rng.choice(late)]
+                j = self.rng.randint(max(0, i - SCHEDULER_MOVE_WINDOW), i - 1)
+            else:
+                i = self.rng.randint(1, n - 1)
+                j = i - 1
+
+            trial_seq = seq[:]
+            trial_seq.insert(j, trial_seq.pop(i))
+            trial_snap = free_snap[:]
+            trial_completion = completion.copy()
+            self._decode(trial_seq, j, trial_snap, trial_completion)
+            value = self._objective(trial_completion)
+            if value < best - 1e-9:
+                seq, free_snap, completion, best = trial_seq, trial_snap, trial_completion, value
+                accepted += 1
+            elif not late:
+                break
+        self.stats.update({"search_iterations": iterations, "search_accepted": accepted})
+        return seq, completion, best
+
+    def run(self) -> dict:
+        started = time.monotonic()
+        self._build_tasks()
+
+        # 초기 순서: EDD(납기순) / 최소 여유시간(납기 - 남은 작업시간) 중 목표값이 작은 쪽
+        t = time.monotonic()
+        candidates = {
+            "edd": sorted(range(len(self.orders)), key=lambda i: (self.due[i], str(self.orders[i].order_id))),
+            "min_slack": sorted(range(len(self.orders)), key=lambda i: (self.due[i] - self.min_work[i], str(self.orders[i].order_id))),
+        }
+        evaluated = {name: (seq, *self._evaluate(seq)) for name, seq in candidates.items()}
+        rule = min(evaluated, key=lambda name: evaluated[name][3])
+        seq, free_snap, completion, best = evaluated[rule]
+        initial_tardiness = float(np.maximum(completion - self.due, 0).sum())
+        self.stats["heuristic_ms"] = round((time.monotonic() - t) * 1000, 2)
+        self.stats["initial_rule"] = rule
+
+        t = time.monotonic()
+        seq, completion, best = self._local_search(seq, free_snap, completion, best)
+        self.stats["search_ms"] = round((time.monotonic() - t) * 1000, 2)
+
+        # 최종 일정 기록
+        record = []
+        snap = [None] * (len(seq) + 1)
+        snap[0] = [0.0] * len(self.stations)
+        self._decode(seq, 0, snap, completion, record)
+        self.stats["total_ms"] = round((time.monotonic() - started) * 1000, 2)
+        return self._result(seq, completion, record, initial_tardiness)
+
+    def _result(self, seq: list, completion: np.ndarray, record: list, initial_tardiness: float) -> dict:
+        ts = lambda sec: (self.now + timedelta(seconds=float(sec))).isoformat(timespec="seconds")
+        tasks = [
+            {
+                "order_id": str(self.orders[oi].order_id),
+                "product_id": self.orders[oi].product_id,
+                "operation_seq": op,
+                "equipment_id": self.stations[si],
+                "start": ts(start),
+                "end": ts(end),
+                "start_sec": round(start, 1),
+                "end_sec": round(end, 1),
+            }
+            for oi, op, si, start, end in record
+        ]
+        tardiness = np.maximum(completion - self.due, 0)
+        orders = [
+            {
+                "priority": rank + 1,
+                "order_id": str(self.orders[oi].order_id),
+                "product_id": self.orders[oi].product_id,
+                "planned_qty": self.orders[oi].planned_qty,
+                "status": self.orders[oi].status,
+                "due_date": self.orders[oi].due_date.isoformat(timespec="seconds"),
+                "planned_end": ts(completion[oi]),
+                "tardiness_sec": round(float(tardiness[oi]), 1),
+            }
+            for rank, oi in enumerate(seq)
+        ]
+        total_tardiness = float(tardiness.sum())
+        return {
+            "generated_at": self.now.isoformat(timespec="seconds"),
+            "stations": self.stations,
+            "tasks": tasks,
+            "orders": orders,
+            "kpi": {
+                "orders": len(self.orders),
+                "tasks": len(tasks),
+                "makespan_sec": round(float(completion.max()) if len(completion) else 0.0, 1),
+                "total_tardiness_sec": round(total_tardiness, 1),
+                "late_orders": int((tardiness > 0).sum()),
+                "initial_tardiness_sec": round(initial_tardiness, 1),
+            },
+            "stats": self.stats,
+        }
+
+
+def build_schedule(db: Session, search_ms: int | None = None) -> dict:
+    """미완료 작업지시 전체에 대한 일정 계획"""
+    orders = (
+        db.query(
+            WorkOrder.order_id,
+            WorkOrder.product_id,
+            WorkOrder.planned_qty,
+            WorkOrder.status,
+            WorkOrder.due_date,
+            WorkOrder.claimed_by,
+        )
+        .filter(WorkOrder.status != "S5_DONE")
+        .all()
+    )
+    stations = (
+        db.query(MasterEquipment.equipment_id, MasterEquipment.operation_seq)
+        .filter(MasterEquipment.enabled == True, MasterEquipment.operation_seq.in_(SCHEDULE_OPERATIONS))
+        .order_by(MasterEquipment.operation_seq, MasterEquipment.equipment_id)
+        .all()
+    )
+    standards = {
+        (r.product_id, r.operation_seq): r.standard_cycle_time_sec
+        for r in db.query(MasterOperationStandard).all()
+    }
+
+    try:
+        from services.ai_work_time_prediction import get_work_time_tensorflow_service
+        work_time_service = get_work_time_tensorflow_service()
+    except Exception as e:
+        print(f"작업시간 예측 모델 없음, 표준시간으로 계획: {e}")
+        work_time_service = None
+
+    scheduler = ProductionScheduler(
+        orders, stations, standards, work_time_service,
+        search_ms=SCHEDULER_SEARCH_MS if search_ms is None else search_ms,
+    )
+    result = scheduler.run()
+    result["products"] = {
+        r.product_id: r.name for r in db.query(MasterProduct.product_id, MasterProduct.name).all()
+    }
+    return result
@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from core.database import SessionLocal
+from models.work_order import WorkOrder
+
+# 일별 생산량 메모리 시리즈 (기본 꺼짐: 워커가 여러 개면 다른 워커의 완료 반영이 재조회 주기만큼 늦음)
+PRODUCTION_SERIES_IN_MEMORY = os.getenv("PRODUCTION_SERIES_IN_MEMORY", "0") == "1"
+PRODUCTION_SERIES_DAYS = int(os.getenv("PRODUCTION_SERIES_DAYS", "60"))                # 메모리에 유지할 일수
+PRODUCTION_SERIES_RELOAD_SEC = float(os.getenv("PRODUCTION_SERIES_RELOAD_SEC", "3600"))  # DB 재조회 주기 (보정용)
+
+
+def query_daily_production(db: Session, start: date, end: date) -> dict:
+    """
+    완료(S5_DONE) 작업지시의 일별 생산량 {날짜: planned_qty 합계}, start <= 날짜 < end
+    end_ts 범위 조건 + GROUP BY 1회 (ix_work_orders_status_end 사용)
+    """
+    day = func.date(WorkOrder.end_ts)
+    rows = (
+        db.query(day.label("day"), func.sum(WorkOrder.planned_qty).label("qty"))
+        .filter(
+            WorkOrder.status == "S5_DONE",
+            WorkOrder.end_ts >= datetime.combine(start, datetime.min.time()),
+            WorkOrder.end_ts < datetime.combine(end, datetime.min.time()),
+        )
+        .group_by(day)
+        .all()
+    )
+    return {r.day: float(r.qty or 0) for r in rows}
+
+
+class DailyProductionSeries:
+    """
+    최근 일별 생산량 메모리 시리즈
+
+    최초 조회 시 최근 PRODUCTION_SERIES_DAYS 일을 DB 에서 읽고, 이후에는 작업지시가 S5_DONE 이 되거나
+    완료 작업지시의 수량/완료일이 바뀔 때 commit 후 증감을 반영한다 (services/dashboard_summary.SummaryDelta).
+    누락 보정을 위해 PRODUCTION_SERIES_RELOAD_SEC 마다 다시 읽는다.
+    """
+
+    def __init__(self, days: int = PRODUCTION_SERIES_DAYS):
+        self.days = days
+        self._daily = None          # {날짜: 수량}
+        self._loaded_from = None    # 이 날짜 이후만 보유
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        loaded_from = date.today() - timedelta(days=self.days)
+        db = SessionLocal()
+        try:
+            daily = query_daily_production(db, loaded_from, date.today() + timedelta(days=1))
+        finally:
+            db.close()
+        self._daily, self._loaded_from, self._loaded_at = daily, loaded_from, time.monotonic()
+
+    def get(self, start: date, end: date) -> dict | None:
+        """start <= 날짜 < end 구간 일별 생산량 (보유 구간 밖이면 None -> 호출한 쪽에서 DB 조회)"""
+        with self._lock:
+            if self._daily is None or time.monotonic() - self._loaded_at > PRODUCTION_SERIES_RELOAD_SEC:
+                self._load()
+            if start < self._loaded_from:
+                return None
+            return {d: q for d, q in self._daily.items() if start <= d < end}
+
+    def apply(self, deltas: dict):
+        """commit 된 일별 생산량 증감 반영 {날짜: 수량 증감}"""
+        with self._lock:
+            if self._daily is None:
+                return
+            for d, qty in deltas.items():
+                if d >= self._loaded_from:
+                    self._daily[d] = self._daily.get(d, 0.0) + qty
+
+
+_daily_production_series = DailyProductionSeries() if PRODUCTION_SERIES_IN_MEMORY else None
+
+
+def get_daily_production_series() -> DailyProductionSeries | None:
+    return _daily_production_series
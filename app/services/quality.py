@@ -5,6 +5,7 @@ from models.master_defect_code import MasterDefectCode
 from models.work_order import WorkOrder
 from models.master_product import MasterProduct
 from datetime import datetime
+from core.data_version import bump_data_version
 
 def list_inspections(db: Session):
     # 품질검사 목록 조회 (작업지시 및 제품 정보 포함)
@@ -68,6 +69,7 @@ def create_inspection(db: Session, order_id: str, product_id: str,
     
     db.add(inspection)
     db.commit()
+    bump_data_version()
     db.refresh(inspection)
     return inspection
 
@@ -123,6 +125,7 @@ def update_inspection(db: Session, inspection_id: str, inspection_qty_raw: str,
     inspection.notes = notes
     
     db.commit()
+    bump_data_version()
     db.refresh(inspection)
     return inspection
 
@@ -137,6 +140,7 @@ def delete_inspection(db: Session, inspection_id: str):
     
     db.delete(inspection)
     db.commit()
+    bump_data_version()
     return True
 
 def list_results(db: Session):
@@ -237,5 +241,6 @@ def create_result(db: Session, inspection_id: str, inspector: str,
         inspection.status = "COMPLETED"
     
     db.commit()
+    bump_data_version()
     db.refresh(result)
     return result
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+센서 이상 탐지 (오토인코더 재구성 오차)
+
+임계값은 모델 info(dnn_sensor_anomaly_detection_info.json)의 threshold 를 사용하고,
+환경변수 SENSOR_ANOMALY_THRESHOLD 가 있으면 그 값으로 덮어쓴다.
+threshold 는 정상 데이터 재구성 오차의 상위 백분위수로 보정한다 (모델 재학습 후 다시 실행):
+    python -m services.sensor_anomaly calibrate [센서 CSV 경로]
+CSV(scada/data/equipment_sensor_data.csv 형식, status 열이 있으면 정상 행만)가 없으면
+스케일러에 저장된 학습 데이터 평균/표준편차의 정규분포 표본으로 보정한다.
+"""
+import csv
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from core.metrics import register_metrics
+
+METRICS = ["temperature", "vibration", "current", "rpm", "pressure"]
+
+# 재구성 오차(MSE, 정규화 공간) 임계값 재정의 (미설정이면 모델 info 의 보정값 사용)
+SENSOR_ANOMALY_THRESHOLD = os.getenv("SENSOR_ANOMALY_THRESHOLD")
+
+MODEL_PATH = "ai_models/sensor_anomaly_detection/dnn_sensor_anomaly_detection_model.keras"
+SCALER_PATH = "ai_models/sensor_anomaly_detection/dnn_sensor_anomaly_detection_scaler.pkl"
+INFO_PATH = "ai_models/sensor_anomaly_detection/dnn_sensor_anomaly_detection_info.json"
+CALIBRATION_PERCENTILE = 99.0
+
+
+class SensorAnomalyScorer:
+    """
+    센서 이상 탐지 (오토인코더 재구성 오차 기반)
+
+    건별 model.predict 대신 적재 배치(버퍼 flush / 배치 API) 단위로
+    scaler.transform 1회 + forward pass 1회로 판정한다.
+    측정값 중 하나라도 비어 있는 행은 판정하지 않는다 (status = NULL).
+    """
+
+    def __init__(self, model, scaler, threshold: float):
+        self.model = model
+        self.scaler = scaler
+        self.threshold = threshold
+
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._scored_rows = 0
+        self._anomalies = 0
+        self._last_batch_size = 0
+        self._last_inference_ms = 0.0
+        self._max_inference_ms = 0.0
+        self._total_inference_ms = 0.0
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        """(n, 5) 측정값 -> (n,) 이상 여부"""
+        scaled = self.scaler.transform(X)
+        reconstructed = np.asarray(self.model.predict_on_batch(scaled))
+        errors = np.mean((scaled - reconstructed) ** 2, axis=1)
+        return errors > self.threshold
+
+    def apply(self, rows: list):
+        """row dict 목록의 status 필드를 채움 (in-place)"""
+        # executemany INSERT 는 모든 행의 키가 같아야 하므로 먼저 기본값 지정
+        for row in rows:
+            row.setdefault("status", None)
+        complete = [r for r in rows if all(r.get(m) is not None for m in METRICS)]
+        if not complete:
+            return
+
+        X = np.array([[r[m] for m in METRICS] for r in complete], dtype=np.float64)
+        started = time.perf_counter()
+        flags = self.score(X)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        for row, flag in zip(complete, flags):
+            row["status"] = bool(flag)
+
+        with self._lock:
+            self._batches += 1
+            self._scored_rows += len(complete)
+            self._anomalies += int(flags.sum())
+            self._last_batch_size = len(complete)
+            self._last_inference_ms = elapsed_ms
+            self._max_inference_ms = max(self._max_inference_ms, elapsed_ms)
+            self._total_inference_ms += elapsed_ms
+
+    def get_metrics(self) -> dict:
+        return {
+            "threshold": self.threshold,
+            "batches": self._batches,
+            "scored_rows": self._scored_rows,
+            "anomalies": self._anomalies,
+            "last_batch_size": self._last_batch_size,
+            "last_inference_ms": round(self._last_inference_ms, 2),
+            "max_inference_ms": round(self._max_inference_ms, 2),
+            "avg_inference_ms": round(self._total_inference_ms / self._batches, 2) if self._batches else 0.0,
+        }
+
+
+# 전역 인스턴스 (서버 시작시 app.state.ai_models 로부터 생성)
+_sensor_anomaly_scorer = None
+
+
+def init_sensor_anomaly_scorer(ai_models: dict):
+    global _sensor_anomaly_scorer
+    if "dnn_sensor_anomaly_detection_model" not in ai_models:
+        print("센서 이상탐지 모델이 없어 판정을 건너뜁니다")
+        return None
+    threshold = SENSOR_ANOMALY_THRESHOLD or (ai_models.get("dnn_sensor_anomaly_detection_info") or {}).get("threshold")
+    if threshold is None:
+        print("센서 이상탐지 임계값이 없어 판정을 건너뜁니다 (python -m services.sensor_anomaly calibrate)")
+        return None
+    _sensor_anomaly_scorer = SensorAnomalyScorer(
+        ai_models["dnn_sensor_anomaly_detection_model"],
+        ai_models["dnn_sensor_anomaly_detection_scaler"],
+        float(threshold),
+    )
+    register_metrics("sensor_anomaly", _sensor_anomaly_scorer.get_metrics)
+    return _sensor_anomaly_scorer
+
+
+def get_sensor_anomaly_scorer() -> SensorAnomalyScorer | None:
+    return _sensor_anomaly_scorer
+
+
+# ---------------------------------------------------------------------------
+# 임계값 보정 CLI
+# ---------------------------------------------------------------------------
+
+def _read_normal_readings(csv_path: str) -> np.ndarray:
+    """센서 CSV -> (n, 5) 측정값 (status 열이 있으면 정상 행만, 빈 값이 있는 행 제외)"""
+    rows = []
+    with open(csv_path, newline="") as f:
+        for r in csv.DictReader(f):
+            if str(r.get("status", "0")).strip().lower() in ("1", "true", "anomaly"):
+                continue
+            try:
+                rows.append([float(r[m]) for m in METRICS])
+            except (KeyError, TypeError, ValueError):
+                continue
+    return np.array(rows, dtype=np.float64)
+
+
+def calibrate_threshold(csv_path: str | None = None, percentile: float = CALIBRATION_PERCENTILE,
+                        n_samples: int = 200_000) -> dict:
+    """정상 데이터 재구성 오차의 percentile 백분위수를 임계값으로 모델 info 에 기록"""
+    from core.numpy_inference import load_dnn_model
+
+    model, scaler = load_dnn_model(MODEL_PATH, SCALER_PATH)
+    if csv_path:
+        X = _read_normal_readings(csv_path)
+        if len(X) == 0:
+            raise ValueError(f"보정에 쓸 정상 측정값이 없습니다: {csv_path}")
+        scaled = scaler.transform(X)
+        source = f"csv:{os.path.basename(csv_path)}"
+    else:
+        # 학습 데이터 원본이 없으면 스케일러의 평균/표준편차 정규분포 (= 정규화 공간의 표준정규분포)
+        scaled = np.random.default_rng(0).standard_normal((n_samples, len(METRICS)))
+        source = "scaler_gaussian"
+
+    reconstructed = np.asarray(model.predict(scaled))
+    errors = np.mean((scaled - reconstructed) ** 2, axis=1)
+    threshold = float(np.percentile(errors, percentile))
+
+    with open(INFO_PATH, "r") as f:
+        info = json.load(f)
+    info["threshold"] = round(threshold, 6)
+    info["threshold_calibration"] = {
+        "metric": "reconstruction_mse_scaled",
+        "percentile": percentile,
+        "source": source,
+        "n_samples": int(len(errors)),
+        "error_p50": round(float(np.percentile(errors, 50)), 6),
+    }
+    with open(INFO_PATH, "w") as f:
+        json.dump(info, f, indent=2, ensure_ascii=False)
+    print(f"센서 이상탐지 임계값: {threshold:.4f} (p{percentile:g}, {source}, {len(errors)}건) -> {INFO_PATH}")
+    return info
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "calibrate":
+        print(__doc__)
+        sys.exit(2)
+    calibrate_threshold(sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,217 @@
+import os
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+from core.database import SessionLocal
+from core.metrics import register_metrics
+from core.sensor_partition import ensure_sensor_partitions_for
+from models.equipment_sensor_data import EquipmentSensorData
+from services.sensor_rollup import apply_sensor_rollups
+from services.sensor_anomaly import get_sensor_anomaly_scorer
+from services.sensor_stream import get_sensor_stream_hub
+
+# 버퍼 설정 (환경변수)
+SENSOR_BUFFER_MAX_SIZE = int(os.getenv("SENSOR_BUFFER_MAX_SIZE", "10000"))        # 최대 대기 건수
+SENSOR_FLUSH_SIZE = int(os.getenv("SENSOR_FLUSH_SIZE", "500"))                    # 그룹 커밋 건수
+SENSOR_FLUSH_INTERVAL_MS = int(os.getenv("SENSOR_FLUSH_INTERVAL_MS", "1000"))     # 최대 대기 시간
+SENSOR_RETRY_AFTER_SEC = int(os.getenv("SENSOR_RETRY_AFTER_SEC", "1"))            # 버퍼 포화 시 재시도 안내
+SENSOR_FLUSH_MAX_RETRIES = int(os.getenv("SENSOR_FLUSH_MAX_RETRIES", "30"))       # DB 연결 장애 시 배치당 최대 재시도
+
+
+class SensorIngestBuffer:
+    """
+    센서 데이터 write-behind 버퍼
+
+    요청 스레드는 offer()로 메모리 큐에 적재만 하고 즉시 반환한다.
+    백그라운드 flusher 스레드가 건수(flush_size) 또는 시간(flush_interval) 기준으로
+    모아서 multi-row INSERT + commit 1회로 기록한다.
+    큐가 가득 차면 offer()가 False를 반환하고, 라우터는 503 + Retry-After로 응답한다.
+    """
+
+    def __init__(self, max_size: int = SENSOR_BUFFER_MAX_SIZE,
+                 flush_size: int = SENSOR_FLUSH_SIZE,
+                 flush_interval_ms: int = SENSOR_FLUSH_INTERVAL_MS):
+        self.max_size = max_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval_ms / 1000
+
+        self._queue = deque()            # (적재 시각, row dict)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+        # 지표
+        self._accepted = 0
+        self._rejected_full = 0
+        self._flushed_rows = 0
+        self._failed_rows = 0
+        self._flush_count = 0
+        self._last_batch_size = 0
+        self._max_batch_size = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._last_flush_ms = 0.0
+
+    # 적재 (요청 스레드)
+    def offer(self, row: dict) -> bool:
+        with self._cond:
+            if len(self._queue) >= self.max_size:
+                self._rejected_full += 1
+                return False
+            self._queue.append((time.monotonic(), row))
+            self._accepted += 1
+            # 빈 큐에 첫 데이터가 들어오면 flusher 를 깨워 flush_interval 대기를 시작시키고,
+            # flush_size 에 도달하면 바로 기록하도록 다시 깨운다
+            if len(self._queue) == 1 or len(self._queue) >= self.flush_size:
+                self._cond.notify()
+        return True
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="sensor-ingest-flusher", daemon=True)
+        self._thread.start()
+        print("센서 데이터 수집 버퍼 시작")
+
+    def stop(self, timeout: float = 10.0):
+        """남은 데이터를 모두 기록한 뒤 종료"""
+        if self._thread is None:
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        self._thread = None
+        print("센서 데이터 수집 버퍼 종료")
+
+    # flusher 스레드
+    def _run(self):
+        retries = 0    # 현재 맨 앞 배치의 연속 재시도 횟수
+        while True:
+            with self._cond:
+                # 데이터가 없으면 대기
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if self._stopping and not self._queue:
+                    return
+
+                # 가장 오래된 데이터 기준으로 flush_interval 까지만 모음
+                deadline = self._queue[0][0] + self.flush_interval
+                while (len(self._queue) < self.flush_size and not self._stopping):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                n = min(len(self._queue), self.flush_size)
+                batch = [self._queue.popleft() for _ in range(n)]
+
+            try:
+                flushed = self._flush(batch)
+            except Exception as e:
+                # 예상하지 못한 오류: flusher 스레드가 죽지 않도록 배치만 폐기
+                self._failed_rows += len(batch)
+                retries = 0
+                print(f"센서 데이터 flush 오류 ({len(batch)}건 폐기): {e!r}")
+                continue
+
+            if flushed:
+                retries = 0
+                continue
+            retries += 1
+            if retries > SENSOR_FLUSH_MAX_RETRIES:
+                self._failed_rows += len(batch)
+                retries = 0
+                print(f"센서 데이터 flush {SENSOR_FLUSH_MAX_RETRIES}회 재시도 실패 ({len(batch)}건 폐기)")
+                continue
+            # DB 연결 장애: 큐 앞쪽으로 되돌리고 잠시 후 재시도
+            with self._cond:
+                self._queue.extendleft(reversed(batch))
+            time.sleep(SENSOR_RETRY_AFTER_SEC)
+
+    def _flush(self, batch: list) -> bool:
+        rows = [row for _, row in batch]
+        started = time.monotonic()
+
+        # 이상 탐지: flush 배치 단위로 한 번에 판정
+        scorer = get_sensor_anomaly_scorer()
+        if scorer is not None:
+            try:
+                scorer.apply(rows)
+            except Exception as e:
+                print(f"센서 이상 판정 실패 (미판정으로 저장): {e}")
+
+        db = SessionLocal()
+        try:
+            ensure_sensor_partitions_for(row["timestamp"] for row in rows)
+            db.execute(insert(EquipmentSensorData), rows)
+            apply_sensor_rollups(db, rows)
+            db.commit()
+        except OperationalError as e:
+            db.rollback()
+            print(f"센서 데이터 flush 실패 (재시도 예정): {e}")
+            return False
+        except DBAPIError as e:
+            # 데이터 오류는 재시도해도 실패하므로 폐기
+            db.rollback()
+            self._failed_rows += len(rows)
+            print(f"센서 데이터 flush 실패 ({len(rows)}건 폐기): {e}")
+            return True
+        finally:
+            db.close()
+
+        # 실시간 스트림 구독자에게 전달 (커밋된 데이터만, 실패해도 저장은 완료)
+        try:
+            get_sensor_stream_hub().publish(rows)
+        except Exception as e:
+            print(f"센서 실시간 스트림 전달 실패: {e!r}")
+
+        now = time.monotonic()
+        self._flush_count += 1
+        self._flushed_rows += len(rows)
+        self._last_batch_size = len(rows)
+        self._max_batch_size = max(self._max_batch_size, len(rows))
+        self._last_flush_ms = (now - started) * 1000
+        for enqueued_at, _ in batch:
+            latency = now - enqueued_at
+            self._latency_sum += latency
+            self._latency_max = max(self._latency_max, latency)
+        return True
+
+    def get_metrics(self) -> dict:
+        return {
+            "queue_depth": len(self._queue),
+            "queue_max_size": self.max_size,
+            "accepted": self._accepted,
+            "rejected_full": self._rejected_full,
+            "flushed_rows": self._flushed_rows,
+            "failed_rows": self._failed_rows,
+            "flush_count": self._flush_count,
+            "last_batch_size": self._last_batch_size,
+            "max_batch_size": self._max_batch_size,
+            "avg_batch_size": round(self._flushed_rows / self._flush_count, 1) if self._flush_count else 0.0,
+            "last_flush_ms": round(self._last_flush_ms, 2),
+            "avg_added_latency_ms": round(self._latency_sum / self._flushed_rows * 1000, 2) if self._flushed_rows else 0.0,
+            "max_added_latency_ms": round(self._latency_max * 1000, 2),
+        }
+
+
+# 전역 버퍼 인스턴스 (서버 시작시 한 번만 생성)
+_sensor_ingest_buffer = None
+
+
+def get_sensor_ingest_buffer() -> SensorIngestBuffer:
+    global _sensor_ingest_buffer
+    if _sensor_ingest_buffer is None:
+        _sensor_ingest_buffer = SensorIngestBuffer()
+        register_metrics("sensor_ingest", _sensor_ingest_buffer.get_metrics)
+    return _sensor_ingest_buffer
@@ -0,0 +1,186 @@
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from core.database import SessionLocal
+from models.equipment_sensor_data import EquipmentSensorData
+from models.equipment_sensor_rollup import EquipmentSensorRollup1m, EquipmentSensorRollup1h
+
+METRICS = ["temperature", "vibration", "current", "rpm", "pressure"]
+
+# 집계 단위: (모델, date_trunc 단위, 구간 길이)
+ROLLUP_LEVELS = {
+    "1m": (EquipmentSensorRollup1m, "minute", timedelta(minutes=1)),
+    "1h": (EquipmentSensorRollup1h, "hour", timedelta(hours=1)),
+}
+
+# 조회 구간 길이에 따른 데이터 소스 선택 기준
+SENSOR_TREND_RAW_MAX = timedelta(hours=int(os.getenv("SENSOR_TREND_RAW_MAX_HOURS", "6")))
+SENSOR_TREND_1M_MAX = timedelta(days=int(os.getenv("SENSOR_TREND_1M_MAX_DAYS", "31")))
+
+# 지연 도착 데이터 재집계 범위 (분)
+SENSOR_ROLLUP_LATE_WINDOW_MIN = int(os.getenv("SENSOR_ROLLUP_LATE_WINDOW_MIN", "120"))
+
+
+def _floor(ts: datetime, unit: str) -> datetime:
+    if unit == "minute":
+        return ts.replace(second=0, microsecond=0)
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def apply_sensor_rollups(db: Session, rows: list):
+    """
+    적재되는 배치로 롤업 증분 갱신 (raw INSERT 와 같은 트랜잭션에서 호출)
+    배치 내에서 먼저 (설비, 구간)별로 집계한 뒤 구간당 UPSERT 1행만 보낸다.
+    """
+    if not rows:
+        return
+
+    for model, unit, _ in ROLLUP_LEVELS.values():
+        acc = {}
+        for row in rows:
+            key = (row["equipment_id"], _floor(row["timestamp"], unit))
+            a = acc.get(key)
+            if a is None:
+                a = {"equipment_id": key[0], "bucket_ts": key[1], "sample_count": 0}
+                for m in METRICS:
+                    a[f"{m}_min"] = None
+                    a[f"{m}_max"] = None
+                    a[f"{m}_sum"] = None
+                    a[f"{m}_cnt"] = 0
+                acc[key] = a
+
+            a["sample_count"] += 1
+            for m in METRICS:
+                v = row.get(m)
+                if v is None:
+                    continue
+                if a[f"{m}_cnt"] == 0:
+                    a[f"{m}_min"] = a[f"{m}_max"] = a[f"{m}_sum"] = v
+                else:
+                    a[f"{m}_min"] = min(a[f"{m}_min"], v)
+                    a[f"{m}_max"] = max(a[f"{m}_max"], v)
+                    a[f"{m}_sum"] += v
+                a[f"{m}_cnt"] += 1
+
+        # 동시 갱신 시 교착을 피하도록 키 순서로 정렬
+        values = [acc[k] for k in sorted(acc)]
+        stmt = pg_insert(model).values(values)
+        t = model.__table__.c
+        ex = stmt.excluded
+        set_ = {"sample_count": t.sample_count + ex.sample_count}
+        for m in METRICS:
+            set_[f"{m}_min"] = func.least(t[f"{m}_min"], ex[f"{m}_min"])
+            set_[f"{m}_max"] = func.greatest(t[f"{m}_max"], ex[f"{m}_max"])
+            set_[f"{m}_sum"] = func.coalesce(t[f"{m}_sum"], 0) + func.coalesce(ex[f"{m}_sum"], 0)
+            set_[f"{m}_cnt"] = t[f"{m}_cnt"] + ex[f"{m}_cnt"]
+        db.execute(stmt.on_conflict_do_update(index_elements=["equipment_id", "bucket_ts"], set_=set_))
+
+
+def reaggregate_sensor_rollups(db: Session, start: datetime, end: datetime):
+    """
+    원본 데이터에서 구간을 다시 집계해 롤업을 덮어씀 (지연 도착 / 백필 데이터 반영)
+    구간 경계가 잘리지 않도록 각 집계 단위로 범위를 확장한다.
+    """
+    for model, unit, step in ROLLUP_LEVELS.values():
+        lo = _floor(start, unit)
+        hi = _floor(end, unit)
+        if hi < end:
+            hi += step
+
+        bucket = func.date_trunc(unit, EquipmentSensorData.timestamp)
+        columns = [EquipmentSensorData.equipment_id, bucket, func.count()]
+        targets = ["equipment_id", "bucket_ts", "sample_count"]
+        for m in METRICS:
+            col = getattr(EquipmentSensorData, m)
+            columns += [func.min(col), func.max(col), func.sum(col), func.count(col)]
+            targets += [f"{m}_min", f"{m}_max", f"{m}_sum", f"{m}_cnt"]
+
+        sel = (
+            select(*columns)
+            .where(EquipmentSensorData.timestamp >= lo, EquipmentSensorData.timestamp < hi)
+            .group_by(EquipmentSensorData.equipment_id, bucket)
+        )
+        stmt = pg_insert(model).from_select(targets, sel)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["equipment_id", "bucket_ts"],
+            set_={c: stmt.excluded[c] for c in targets[2:]},
+        )
+        db.execute(stmt)
+    db.commit()
+
+
+def reaggregate_recent_sensor_rollups():
+    """최근 구간 재집계 (주기 작업)"""
+    end = datetime.now()
+    start = end - timedelta(minutes=SENSOR_ROLLUP_LATE_WINDOW_MIN)
+    db = SessionLocal()
+    try:
+        reaggregate_sensor_rollups(db, start, end)
+    finally:
+        db.close()
+
+
+def get_sensor_trend(db: Session, equipment_id: str, start: datetime, end: datetime):
+    """
+    설비 센서 추이 조회
+    짧은 구간은 원본, 길어지면 1분/1시간 롤업에서 읽어 반환 행 수를 일정 수준으로 유지한다.
+    """
+    span = end - start
+    series = {m: {"avg": [], "min": [], "max": []} for m in METRICS}
+    labels = []
+
+    if span <= SENSOR_TREND_RAW_MAX:
+        resolution = "raw"
+        rows = (
+            db.query(
+                EquipmentSensorData.timestamp,
+                *[getattr(EquipmentSensorData, m) for m in METRICS],
+            )
+            .filter(
+                EquipmentSensorData.equipment_id == equipment_id,
+                EquipmentSensorData.timestamp >= start,
+                EquipmentSensorData.timestamp < end,
+            )
+            .order_by(EquipmentSensorData.timestamp)
+            .all()
+        )
+        for r in rows:
+            labels.append(r.timestamp.isoformat())
+            for m in METRICS:
+                v = getattr(r, m)
+                series[m]["avg"].append(v)
+                series[m]["min"].append(v)
+                series[m]["max"].append(v)
+    else:
+        resolution = "1m" if span <= SENSOR_TREND_1M_MAX else "1h"
+        model, unit, _ = ROLLUP_LEVELS[resolution]
+        rows = (
+            db.query(model)
+            .filter(
+                model.equipment_id == equipment_id,
+                model.bucket_ts >= _floor(start, unit),
+                model.bucket_ts < end,
+            )
+            .order_by(model.bucket_ts)
+            .all()
+        )
+        for r in rows:
+            labels.append(r.bucket_ts.isoformat())
+            for m in METRICS:
+                cnt = getattr(r, f"{m}_cnt")
+                series[m]["avg"].append(round(getattr(r, f"{m}_sum") / cnt, 3) if cnt else None)
+                series[m]["min"].append(getattr(r, f"{m}_min"))
+                series[m]["max"].append(getattr(r, f"{m}_max"))
+
+    return {
+        "equipment_id": equipment_id,
+        "resolution": resolution,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "labels": labels,
+        "series": series,
+    }
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from core.metrics import register_metrics
+
+METRICS = ["temperature", "vibration", "current", "rpm", "pressure"]
+
+SENSOR_STREAM_CAPACITY = int(os.getenv("SENSOR_STREAM_CAPACITY", "600"))   # 설비별 보관 건수
+SENSOR_STREAM_HEARTBEAT_SEC = 15
+
+
+class EquipmentRingBuffer:
+    """설비 1대의 최근 N건 (고정 크기 배열, 가장 오래된 값부터 덮어씀)"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.seq = np.zeros(capacity, dtype=np.int64)               # 0 = 빈 칸
+        self.ts = np.zeros(capacity, dtype=np.float64)              # epoch seconds
+        self.values = np.full((capacity, len(METRICS)), np.nan)
+        self.status = np.full(capacity, -1, dtype=np.int8)          # -1 미판정, 0 정상, 1 이상
+        self.pos = 0
+        self.last_seq = 0
+
+    def append(self, seq: int, row: dict):
+        i = self.pos
+        self.seq[i] = seq
+        self.ts[i] = row["timestamp"].timestamp()
+        self.values[i] = [np.nan if row.get(m) is None else row[m] for m in METRICS]
+        status = row.get("status")
+        self.status[i] = -1 if status is None else int(status)
+        self.pos = (i + 1) % self.capacity
+        self.last_seq = seq
+
+    def since(self, last_seq: int, limit: int | None = None) -> np.ndarray:
+        """last_seq 이후 항목의 인덱스 (seq 오름차순)"""
+        if self.last_seq <= last_seq:
+            return np.empty(0, dtype=np.int64)
+        idx = np.nonzero(self.seq > last_seq)[0]
+        idx = idx[np.argsort(self.seq[idx])]
+        return idx[-limit:] if limit else idx
+
+
+class SensorStreamHub:
+    """
+    실시간 센서 스트림 허브
+
+    적재 경로(flusher 스레드 / 배치 API)가 커밋 후 publish() 하면 설비별 링버퍼에 기록하고,
+    모든 구독자(SSE)가 공유하는 asyncio.Event 하나만 깨운다.
+    구독자는 각자 마지막으로 받은 seq 이후만 링버퍼에서 읽으므로 DB 조회가 없다.
+    """
+
+    def __init__(self, capacity: int = SENSOR_STREAM_CAPACITY):
+        self.capacity = capacity
+        self.buffers: dict[str, EquipmentRingBuffer] = {}
+        self.latest_seq = 0
+        self._lock = threading.Lock()
+        self._loop = None
+        self._event = None
+        self.subscribers = 0
+        self.published_rows = 0
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._event = asyncio.Event()
+
+    def _wake(self):
+        event, self._event = self._event, asyncio.Event()
+        event.set()
+
+    def publish(self, rows: list):
+        if not rows:
+            return
+        with self._lock:
+            for row in rows:
+                self.latest_seq += 1
+                buf = self.buffers.get(row["equipment_id"])
+                if buf is None:
+                    buf = self.buffers[row["equipment_id"]] = EquipmentRingBuffer(self.capacity)
+                buf.append(self.latest_seq, row)
+            self.published_rows += len(rows)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake)
+
+    def read_since(self, last_seq: int, equipment_ids: set | None = None, limit: int | None = None) -> tuple[list, int]:
+        """last_seq 이후 항목과 읽은 시점의 최신 seq 반환 (limit: 설비별 최근 N건)"""
+        items = []
+        with self._lock:
+            high_seq = self.latest_seq
+            if limit == 0:
+                return items, high_seq
+            for equipment_id, buf in self.buffers.items():
+                if equipment_ids and equipment_id not in equipment_ids:
+                    continue
+                for i in buf.since(last_seq, limit):
+                    values = buf.values[i]
+                    status = int(buf.status[i])
+                    item = {
+                        "seq": int(buf.seq[i]),
+                        "equipment_id": equipment_id,
+                        "timestamp": datetime.fromtimestamp(buf.ts[i]).isoformat(),
+                        "status": None if status < 0 else bool(status),
+                    }
+                    for m, v in zip(METRICS, values):
+                        item[m] = None if np.isnan(v) else float(v)
+                    items.append(item)
+        items.sort(key=lambda it: it["seq"])
+        return items, high_seq
+
+    async def wait(self, last_seq: int, timeout: float) -> bool:
+        """last_seq 이후 데이터가 생길 때까지 대기 (timeout 시 False)"""
+        event = self._event
+        if self.latest_seq > last_seq:
+            return True
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def get_metrics(self) -> dict:
+        return {
+            "subscribers": self.subscribers,
+            "equipments": len(self.buffers),
+            "capacity_per_equipment": self.capacity,
+            "latest_seq": self.latest_seq,
+            "published_rows": self.published_rows,
+        }
+
+
+async def sensor_event_stream(request, equipment_ids: list | None, backlog: int, last_event_id: str | None):
+    """SSE 이벤트 생성기 (새 데이터가 생길 때마다 한 이벤트에 모아서 전송)"""
+    hub = get_sensor_stream_hub()
+    targets = set(equipment_ids) if equipment_ids else None
+
+    # 재접속 시 마지막 수신 seq 이후부터, 첫 접속 시 설비별 최근 backlog 건
+    try:
+        last_seq = int(last_event_id) if last_event_id else 0
+    except ValueError:
+        last_seq = 0
+    if last_seq > hub.latest_seq:
+        # 서버 재시작으로 seq 가 초기화된 경우
+        last_seq = 0
+    limit = None if last_seq else max(backlog, 0)
+
+    hub.subscribers += 1
+    try:
+        yield "retry: 3000\n\n"
+        items, last_seq = hub.read_since(last_seq, targets, limit)
+        if items:
+            yield f"id: {last_seq}\ndata: {json.dumps(items)}\n\n"
+
+        while not await request.is_disconnected():
+            if not await hub.wait(last_seq, SENSOR_STREAM_HEARTBEAT_SEC):
+                yield ": heartbeat\n\n"
+                continue
+            # 필터 대상이 아닌 설비 데이터만 들어온 경우에도 seq 는 전진
+            items, last_seq = hub.read_since(last_seq, targets)
+            if items:
+                yield f"id: {last_seq}\ndata: {json.dumps(items)}\n\n"
+    finally:
+        hub.subscribers -= 1
+
+
+# 전역 허브 인스턴스
+_sensor_stream_hub = None
+
+
+def get_sensor_stream_hub() -> SensorStreamHub:
+    global _sensor_stream_hub
+    if _sensor_stream_hub is None:
+        _sensor_stream_hub = SensorStreamHub()
+        register_metrics("sensor_stream", _sensor_stream_hub.get_metrics)
+    return _sensor_stream_hub
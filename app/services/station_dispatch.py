@@ -0,0 +1,131 @@
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+
+from models.work_order import WorkOrder
+from models.master_equipment import MasterEquipment
+from models.master_product import MasterProduct
+from services.work import STEP_TO_STATUS, apply_progress_events
+
+# 가져간 작업을 완료/반납하지 않은 채 이 시간이 지나면 다른 스테이션이 가져갈 수 있음
+CLAIM_TTL_SEC = int(os.getenv("CLAIM_TTL_SEC", "1800"))
+
+# 공정 단계 -> 해당 공정을 시작할 수 있는 작업지시 상태 (직전 단계 완료 상태)
+READY_STATUS = {1: "S0_PLANNED", **{seq + 1: status for seq, status in STEP_TO_STATUS.items() if seq < 5}}
+
+
+def _get_station(db: Session, equipment_id: str):
+    return (
+        db.query(MasterEquipment.equipment_id, MasterEquipment.operation_seq)
+        .filter(MasterEquipment.equipment_id == equipment_id, MasterEquipment.enabled == True)
+        .first()
+    )
+
+
+def _job_dict(order, operation_seq: int, product_name: str | None = None) -> dict:
+    return {
+        "order_id": str(order.order_id),
+        "product_id": order.product_id,
+        "product_name": product_name,
+        "planned_qty": order.planned_qty,
+        "status": order.status,
+        "due_date": order.due_date.isoformat(),
+        "operation_seq": operation_seq,
+        "claimed_by": order.claimed_by,
+        "claimed_ts": order.claimed_ts.isoformat() if order.claimed_ts else None,
+    }
+
+
+def claim_next_job(db: Session, equipment_id: str, skip_locked: bool = True):
+    """
+    스테이션이 처리할 다음 작업지시 가져오기
+
+    해당 설비 공정(master_equipment.operation_seq)의 직전 단계가 끝난 작업지시 중
+    납기가 가장 빠른 1건을 SELECT ... FOR UPDATE SKIP LOCKED 로 잠그고 claimed_by 를 기록한다.
+    다른 스테이션이 잠근 행은 기다리지 않고 건너뛰므로 스테이션 수가 늘어도 서로 막지 않는다.
+    이미 가져간(미완료) 작업이 있으면 그 작업을 다시 반환한다.
+    반환: 작업 dict / None (가져갈 작업 없음) / 설비가 없으면 ValueError
+    (skip_locked=False 는 비교용 벤치마크에서만 사용)
+    """
+    station = _get_station(db, equipment_id)
+    if station is None or station.operation_seq not in READY_STATUS:
+        raise ValueError(f"작업을 배정할 수 없는 설비: {equipment_id}")
+    ready_status = READY_STATUS[station.operation_seq]
+    now = datetime.utcnow()   # 작업지시/실적 시각은 UTC (advance_progress 와 같은 기준)
+
+    # 이미 이 스테이션이 가져간 작업 (재요청/재접속)
+    held = (
+        db.query(WorkOrder)
+        .filter(WorkOrder.claimed_by == equipment_id, WorkOrder.status == ready_status)
+        .order_by(WorkOrder.claimed_ts)
+        .first()
+    )
+    if held is not None:
+        return _job_dict(held, station.operation_seq)
+
+    order = (
+        db.query(WorkOrder)
+        .filter(
+            WorkOrder.status == ready_status,
+            or_(
+                WorkOrder.claimed_by.is_(None),
+                and_(WorkOrder.claimed_by != equipment_id,
+                     WorkOrder.claimed_ts < now - timedelta(seconds=CLAIM_TTL_SEC)),
+            ),
+        )
+        .order_by(WorkOrder.due_date, WorkOrder.order_id)
+        .with_for_update(skip_locked=skip_locked)
+        .limit(1)
+        .first()
+    )
+    if order is None:
+        db.rollback()
+        return None
+
+    order.claimed_by = equipment_id
+    order.claimed_ts = now
+    db.commit()
+
+    product_name = (
+        db.query(MasterProduct.name).filter(MasterProduct.product_id == order.product_id).scalar()
+    )
+    return _job_dict(order, station.operation_seq, product_name)
+
+
+def release_job(db: Session, equipment_id: str, order_id: str) -> bool:
+    """가져간 작업 반납 (다른 스테이션이 가져갈 수 있게)"""
+    updated = (
+        db.query(WorkOrder)
+        .filter(WorkOrder.order_id == order_id, WorkOrder.claimed_by == equipment_id)
+        .update({"claimed_by": None, "claimed_ts": None}, synchronize_session=False)
+    )
+    db.commit()
+    return updated > 0
+
+
+def complete_job(db: Session, equipment_id: str, order_id: str):
+    """
+    가져간 작업 완료: 가져간 시각 ~ 현재를 실적으로 기록하고 다음 단계로 진행
+    (공정 이벤트 일괄 반영과 같은 경로 사용, 완료 시 claim 해제)
+    """
+    station = _get_station(db, equipment_id)
+    if station is None:
+        raise ValueError(f"작업을 배정할 수 없는 설비: {equipment_id}")
+    order = (
+        db.query(WorkOrder.claimed_ts)
+        .filter(WorkOrder.order_id == order_id, WorkOrder.claimed_by == equipment_id)
+        .first()
+    )
+    if order is None:
+        return None
+
+    now = datetime.utcnow()
+    return apply_progress_events(db, [{
+        "order_id": order_id,
+        "operation_seq": station.operation_seq,
+        "equipment_id": equipment_id,
+        "start_ts": (order.claimed_ts or now).isoformat(),
+        "end_ts": now.isoformat(),
+    }])
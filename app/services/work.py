@@ -8,16 +8,66 @@ from models.master_equipment import MasterEquipment
 from models.master_product import MasterProduct
 from models.quality_inspection import QualityInspection
 from models.quality_result import QualityResult
+from schemas.work import WorkOrderCreate, ProgressEvent
+from services.inference_broker import get_delivery_quality_broker
+from services.prediction_cache import get_prediction_cache
+from services.dashboard_summary import SummaryDelta, load_standards, record_order_change
+from core.data_version import bump_data_version
+from core.pagination import clamp_page_size, parse_datetime, paginate, count_total
 from datetime import datetime
 from datetime import datetime
 from fastapi import Request
-
+from pydantic import ValidationError
+from sqlalchemy import insert, update, values, column, cast, String, DateTime
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+import io
+import os
+import uuid
+
+import numpy as np
 import pandas as pd
-import tensorflow as tf
-from tensorflow import keras
 
-def list_orders(db: Session):
-    """작업지시 목록 조회 (제품 정보 포함)"""
+ORDER_BULK_MAX_ROWS = int(os.getenv("ORDER_BULK_MAX_ROWS", "5000"))
+
+# 정렬 옵션: 정렬 키 (마지막은 유일 키) + 방향 (models/work_*.py 의 인덱스와 일치)
+ORDER_SORTS = {
+    "due_asc": ([WorkOrder.due_date, WorkOrder.order_id], False),
+    "due_desc": ([WorkOrder.due_date, WorkOrder.order_id], True),
+    "created_desc": ([WorkOrder.created_ts, WorkOrder.order_id], True),
+}
+RESULT_SORTS = {
+    "start_desc": ([WorkResult.start_ts, WorkResult.result_id], True),
+    "start_asc": ([WorkResult.start_ts, WorkResult.result_id], False),
+}
+ORDER_STATUSES = ["S0_PLANNED", "S1_READY", "S2_ASSEMBLY", "S3_INSPECTION", "S4_PACK", "S5_DONE"]
+
+def _filter_orders(q, status: str | None, product_id: str | None, start, end):
+    """작업지시 공통 필터 (status=open 은 완료 제외, 기간은 납기 기준)"""
+    if status == "open":
+        q = q.filter(WorkOrder.status != "S5_DONE")
+    elif status in ORDER_STATUSES:
+        q = q.filter(WorkOrder.status == status)
+    if product_id:
+        q = q.filter(WorkOrder.product_id == product_id)
+    if start:
+        q = q.filter(WorkOrder.due_date >= start)
+    if end:
+        q = q.filter(WorkOrder.due_date < end)
+    return q
+
+def list_orders(db: Session,
+                status: str | None = None,
+                product_id: str | None = None,
+                start_raw: str | None = None,
+                end_raw: str | None = None,
+                sort: str | None = None,
+                cursor: str | None = None,
+                limit_raw: str | None = None):
+    """작업지시 목록 조회 (제품 정보 포함, 필터 + keyset 페이지네이션)"""
+    limit = clamp_page_size(limit_raw)
+    sort = sort if sort in ORDER_SORTS else "due_asc"
+    columns, descending = ORDER_SORTS[sort]
+
     q = (
         db.query(
             WorkOrder.order_id,
@@ -25,15 +75,17 @@ def list_orders(db: Session):
             WorkOrder.planned_qty,
             WorkOrder.status,
             WorkOrder.due_date,
+            WorkOrder.created_ts,
             WorkOrder.pred_delivery,
             WorkOrder.pred_defect_rate,
             MasterProduct.name.label("product_name"),
         )
         .join(MasterProduct, WorkOrder.product_id == MasterProduct.product_id)
-        .order_by(WorkOrder.due_date.asc())
     )
+    q = _filter_orders(q, status, product_id, parse_datetime(start_raw), parse_datetime(end_raw))
 
-    rows = q.all()
+    total, total_estimated = count_total(db, q)
+    rows, next_cursor = paginate(q, columns, descending, cursor, limit)
 
     # 템플릿에서 쓰기 편하도록 dict 리스트로 변환
     items = []
@@ -54,8 +106,18 @@ def list_orders(db: Session):
 
     return {
         "items": items,
-        "total": len(items),
-        "products": products
+        "total": total,
+        "total_estimated": total_estimated,
+        "next_cursor": next_cursor,
+        "products": products,
+        "filters": {
+            "status": status or "",
+            "product_id": product_id or "",
+            "start": start_raw or "",
+            "end": end_raw or "",
+            "sort": sort,
+            "limit": limit,
+        },
     }
 
 def create_order(request: Request, db: Session, product_id: str, planned_qty_raw: str, due_date_raw: str):
@@ -72,51 +134,155 @@ def create_order(request: Request, db: Session, product_id: str, planned_qty_raw
     new_order = predict_delivery_and_quality(request,db, order)
 
     db.add(new_order)
+    record_order_change(db, None, (product_id, planned_qty, "S0_PLANNED", None))
     db.commit()
+    bump_data_version()
     db.refresh(order)
     return order
 
 def predict_delivery_and_quality(request: Request, db: Session, order: WorkOrder):
+    """작업지시 1건 납기/품질 예측"""
+    pred_delivery, pred_defect_rate = predict_delivery_and_quality_batch(
+        request.app.state.ai_models, [order.product_id], [order.planned_qty], [order.due_date]
+    )
 
-    # 모델, 스케일러, 인코더 로드
-    model = request.app.state.ai_models["dnn_delivery_quality_model"]
-    scaler = request.app.state.ai_models["dnn_delivery_quality_scaler"]
-    encoder = request.app.state.ai_models["dnn_delivery_quality_encoder"]
-
-    df = pd.DataFrame([{
-        'product_id': order.product_id,
-        'planned_qty': order.planned_qty,
-        'due_date': order.due_date,
-        'created_ts': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    }])
-    # 특징 추출
-    df['created_ts'] = pd.to_datetime(df['created_ts']) + pd.Timedelta(hours=9) # 한국시간 보정
-    df['month'] = df['created_ts'].dt.month
-    df['day_of_week'] = df['created_ts'].dt.dayofweek
-    df['days_to_due'] = (df['due_date'] - df['created_ts']).dt.days
-
-    # product_id 인코딩
-    df['product_encoded'] = encoder.transform(df[['product_id']])
-
-    # 예측에 사용할 특징 선택
-    features = ['product_encoded', 'planned_qty', 'month', 'day_of_week', 'days_to_due']
-    df_features = df[features].values
-    
-    # 정규화
-    features_scaled = scaler.transform(df_features)
-
-    # 예측
-    pred_delivery, pred_defect_rate = model.predict(features_scaled)
-    print(pred_delivery, pred_defect_rate)
-    pred_delivery = bool((pred_delivery > 0.5).item())
-    pred_defect_rate = float(pred_defect_rate.item())
-    
     # 작업지시에 예측 결과 저장
-    order.pred_delivery = pred_delivery
-    order.pred_defect_rate = round(pred_defect_rate, 1)
+    order.pred_delivery = bool(pred_delivery[0])
+    order.pred_defect_rate = round(float(pred_defect_rate[0]), 1)
 
     return order
 
+def build_delivery_features(encoder, product_ids, planned_qtys, due_dates, created_ts: datetime | None = None):
+    """
+    납기/품질 모델 입력 행렬 생성 (N건을 한 번에)
+    features: product_encoded, planned_qty, month, day_of_week, days_to_due
+    """
+    created = pd.Timestamp(created_ts or datetime.now().replace(microsecond=0)) + pd.Timedelta(hours=9)  # 한국시간 보정
+    due = np.asarray(due_dates, dtype="datetime64[s]")
+    days_to_due = (due - np.datetime64(created.to_pydatetime(), "s")) // np.timedelta64(1, "D")
+
+    X = np.empty((len(due), 5), dtype=np.float64)
+    X[:, 0] = encoder.transform(np.asarray(product_ids))
+    X[:, 1] = np.asarray(planned_qtys, dtype=np.float64)
+    X[:, 2] = created.month
+    X[:, 3] = created.dayofweek
+    X[:, 4] = days_to_due
+    return X
+
+def predict_delivery_and_quality_batch(ai_models: dict, product_ids, planned_qtys, due_dates, created_ts: datetime | None = None):
+    """
+    납기/품질 일괄 예측 (인코딩 1회, 캐시에 없는 행만 정규화 + 모델 호출 1회)
+    반환: (납기 준수 여부 bool 배열, 예측 불량률 배열)
+    """
+    model = ai_models["dnn_delivery_quality_model"]
+    scaler = ai_models["dnn_delivery_quality_scaler"]
+    encoder = ai_models["dnn_delivery_quality_encoder"]
+
+    X = build_delivery_features(encoder, product_ids, planned_qtys, due_dates, created_ts)
+
+    def predict_fn(rows: np.ndarray) -> np.ndarray:
+        features_scaled = scaler.transform(rows)
+        # 동시 요청은 브로커에서 한 배치로 묶어 추론 (브로커 미기동 시 직접 호출)
+        broker = get_delivery_quality_broker()
+        if broker is not None:
+            pred_delivery, pred_defect_rate = broker.predict(features_scaled)
+        else:
+            pred_delivery, pred_defect_rate = model.predict(features_scaled, verbose=0)
+        return np.column_stack([np.asarray(pred_delivery).reshape(-1), np.asarray(pred_defect_rate).reshape(-1)])
+
+    # 같은 (제품, 수량, 월, 요일, 남은 일수) 조합은 캐시된 예측 사용
+    # (app.state.ai_models 의 모델 객체가 바뀌면 캐시 초기화)
+    out = get_prediction_cache("delivery_quality", model, scaler, encoder).predict(X, predict_fn)
+    return out[:, 0] > 0.5, out[:, 1]
+
+def parse_orders_csv(content: bytes) -> list:
+    """작업지시 CSV 파싱 (컬럼: product_id, planned_qty, due_date)"""
+    df = pd.read_csv(io.BytesIO(content), dtype=str, keep_default_na=False)
+    missing = {"product_id", "planned_qty", "due_date"} - set(df.columns)
+    if missing:
+        raise ValueError(f"CSV에 필요한 컬럼이 없습니다: {', '.join(sorted(missing))}")
+    return df[["product_id", "planned_qty", "due_date"]].to_dict(orient="records")
+
+def _validation_reason(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+    )
+
+def create_orders_bulk(request: Request, db: Session, orders: list):
+    """
+    작업지시 일괄 등록
+    전체 검증 -> 일괄 예측 1회 -> multi-row INSERT 1회, commit 1회
+    한 건이라도 오류가 있으면 아무것도 등록하지 않고 오류 목록을 반환한다.
+    """
+    rows = []
+    rejected = []
+
+    # 1) 스키마 검증 (행 단위로 거부 사유 기록)
+    for idx, raw in enumerate(orders):
+        try:
+            order = WorkOrderCreate.model_validate(raw)
+        except ValidationError as e:
+            rejected.append({"index": idx, "reason": _validation_reason(e)})
+            continue
+        rows.append((idx, order))
+
+    # 2) 제품 검증 (마스터 + 예측 모델이 아는 제품)
+    product_ids = {order.product_id for _, order in rows}
+    known_products = {
+        r.product_id for r in
+        db.query(MasterProduct.product_id).filter(MasterProduct.product_id.in_(product_ids)).all()
+    } if product_ids else set()
+    encoder = request.app.state.ai_models["dnn_delivery_quality_encoder"]
+    model_products = set(encoder.classes_)
+    for idx, order in rows:
+        if order.product_id not in known_products:
+            rejected.append({"index": idx, "reason": f"알 수 없는 제품 ID: {order.product_id}"})
+        elif order.product_id not in model_products:
+            rejected.append({"index": idx, "reason": f"예측 모델에 없는 제품 ID: {order.product_id}"})
+
+    if rejected:
+        rejected.sort(key=lambda r: r["index"])
+        return {"received": len(orders), "created": 0, "rejected": rejected}
+
+    # 3) 일괄 예측
+    now = datetime.utcnow()
+    pred_delivery, pred_defect_rate = predict_delivery_and_quality_batch(
+        request.app.state.ai_models,
+        [o.product_id for _, o in rows],
+        [o.planned_qty for _, o in rows],
+        [o.due_date.replace(tzinfo=None) for _, o in rows],
+    )
+
+    # 4) multi-row INSERT
+    new_orders = [
+        {
+            "order_id": uuid.uuid4(),
+            "product_id": order.product_id,
+            "planned_qty": order.planned_qty,
+            "due_date": order.due_date.replace(tzinfo=None),
+            "status": "S0_PLANNED",
+            "pred_delivery": bool(pred_delivery[i]),
+            "pred_defect_rate": round(float(pred_defect_rate[i]), 1),
+            "created_ts": now,
+        }
+        for i, (_, order) in enumerate(rows)
+    ]
+    if new_orders:
+        db.execute(insert(WorkOrder), new_orders)
+        delta = SummaryDelta()
+        for v in new_orders:
+            delta.order(None, (v["product_id"], v["planned_qty"], v["status"], None))
+        delta.apply(db)
+        db.commit()
+        bump_data_version()
+
+    return {
+        "received": len(orders),
+        "created": len(new_orders),
+        "rejected": [],
+        "order_ids": [str(v["order_id"]) for v in new_orders],
+    }
+
 def get_order_detail(db: Session, order_id: str):
     """단일 작업지시 상세 조회 (제품명 포함)"""
     row = (
@@ -154,35 +320,67 @@ def get_order_detail(db: Session, order_id: str):
         "end_ts": row.end_ts,
     }
 
-def update_order(db: Session, order_id: str,
+def update_order(request: Request, db: Session, order_id: str,
                  planned_qty_raw: str,
                  due_date_raw: str):
-    """작업지시 수정"""
-    order = db.query(WorkOrder).filter(WorkOrder.order_id == order_id).first()
+    """작업지시 수정 (수량/납기가 바뀌므로 납기/품질 재예측)"""
+    order = db.query(WorkOrder).filter(WorkOrder.order_id == order_id).with_for_update().first()
     if not order: 
         return None
 
+    before = (order.product_id, order.planned_qty, order.status, order.end_ts)
     order.planned_qty = int(planned_qty_raw)
     order.due_date = datetime.fromisoformat(due_date_raw)
+    predict_delivery_and_quality(request, db, order)
+
+    # 수량이 바뀌면 제품별 수량/일별 생산량과 기존 실적의 편차율이 달라짐
+    results = []
+    if before[1] != order.planned_qty:
+        results = (
+            db.query(WorkResult.operation_seq, WorkResult.equipment_id, WorkResult.start_ts, WorkResult.end_ts)
+            .filter(WorkResult.order_id == order.order_id)
+            .all()
+        )
+    delta = record_order_change(db, before, (order.product_id, order.planned_qty, order.status, order.end_ts), results)
 
     db.commit()
+    delta.after_commit()
+    bump_data_version()
     db.refresh(order)
     return order
 
 def delete_order(db: Session, order_id: str):
     """작업지시 삭제"""
-    order = db.query(WorkOrder).filter(WorkOrder.order_id == order_id).first()
+    order = db.query(WorkOrder).filter(WorkOrder.order_id == order_id).with_for_update().first()
     if not order:
         return None
 
     db.delete(order)
+    delta = record_order_change(db, (order.product_id, order.planned_qty, order.status, order.end_ts), None)
     db.commit()
+    delta.after_commit()
+    bump_data_version()
     return True
 
-def list_results(db: Session):
+def list_results(db: Session,
+                 product_id: str | None = None,
+                 equipment_id: str | None = None,
+                 operation_seq: str | None = None,
+                 start_raw: str | None = None,
+                 end_raw: str | None = None,
+                 sort: str | None = None,
+                 cursor: str | None = None,
+                 limit_raw: str | None = None):
     """
     생산실적 목록 조회 (공정/설비/제품 정보 포함)
+    필터 + keyset 페이지네이션으로 한 페이지 분량만 조인한다. (기간은 시작 시각 기준)
     """
+    limit = clamp_page_size(limit_raw)
+    sort = sort if sort in RESULT_SORTS else "start_desc"
+    columns, descending = RESULT_SORTS[sort]
+    start = parse_datetime(start_raw)
+    end = parse_datetime(end_raw)
+
     q = (
         db.query(
             WorkResult.result_id,
@@ -200,10 +398,22 @@ def list_results(db: Session):
         .join(MasterOperation, WorkResult.operation_seq == MasterOperation.operation_seq)
         .outerjoin(MasterEquipment, WorkResult.equipment_id == MasterEquipment.equipment_id)
         .join(MasterProduct, WorkOrder.product_id == MasterProduct.product_id)
-        .order_by(desc(WorkResult.start_ts))
     )
 
-    rows = q.all()
+    # 서버측 필터
+    if product_id:
+        q = q.filter(WorkOrder.product_id == product_id)
+    if equipment_id:
+        q = q.filter(WorkResult.equipment_id == equipment_id)
+    if operation_seq and operation_seq.isdigit():
+        q = q.filter(WorkResult.operation_seq == int(operation_seq))
+    if start:
+        q = q.filter(WorkResult.start_ts >= start)
+    if end:
+        q = q.filter(WorkResult.start_ts < end)
+
+    total, total_estimated = count_total(db, q)
+    rows, next_cursor = paginate(q, columns, descending, cursor, limit)
 
     items = []
     for r in rows:
@@ -220,13 +430,47 @@ def list_results(db: Session):
             "end_ts": r.end_ts,
         })
 
+    # 필터 선택 목록
+    products = db.query(MasterProduct.product_id, MasterProduct.name).order_by(MasterProduct.product_id).all()
+    operations = (
+        db.query(MasterOperation.operation_seq, MasterOperation.operation_name)
+        .order_by(MasterOperation.operation_seq)
+        .all()
+    )
+    equipments = (
+        db.query(MasterEquipment.equipment_id, MasterEquipment.name)
+        .order_by(MasterEquipment.equipment_id)
+        .all()
+    )
+
     return {
         "items": items,
-        "total": len(items),
+        "total": total,
+        "total_estimated": total_estimated,
+        "next_cursor": next_cursor,
+        "products": products,
+        "operations": operations,
+        "equipments": equipments,
+        "filters": {
+            "product_id": product_id or "",
+            "equipment_id": equipment_id or "",
+            "operation_seq": operation_seq or "",
+            "start": start_raw or "",
+            "end": end_raw or "",
+            "sort": sort,
+            "limit": limit,
+        },
     }
 
-def list_progress(db: Session):
-    """공정진행 페이지용 - 작업지시 목록 + 공정/설비 목록"""
+def list_progress(db: Session,
+                  status: str | None = None,
+                  product_id: str | None = None,
+                  cursor: str | None = None,
+                  limit_raw: str | None = None):
+    """공정진행 페이지용 - 작업지시 목록(납기순, 필터 + keyset 페이지네이션) + 공정/설비 목록"""
+    limit = clamp_page_size(limit_raw)
+    columns, descending = ORDER_SORTS["due_asc"]
+
     # 작업지시 목록 조회 (제품 이름 포함)
     q = (
         db.query(
@@ -238,10 +482,11 @@ def list_progress(db: Session):
             MasterProduct.name.label("product_name"),
         )
         .join(MasterProduct, WorkOrder.product_id == MasterProduct.product_id)
-        .order_by(WorkOrder.due_date.asc())
     )
+    q = _filter_orders(q, status, product_id, None, None)
 
-    rows = q.all()
+    total, total_estimated = count_total(db, q)
+    rows, next_cursor = paginate(q, columns, descending, cursor, limit)
 
     # 템플릿에 쓰기 편한 dict 리스트로 변환
     items = []
@@ -276,11 +521,21 @@ def list_progress(db: Session):
         .all()
     )
 
+    products = db.query(MasterProduct.product_id, MasterProduct.name).order_by(MasterProduct.product_id).all()
+
     return {
         "items": items,
-        "total": len(items),
+        "total": total,
+        "total_estimated": total_estimated,
+        "next_cursor": next_cursor,
         "operations": operations,
         "equipments": equipments,
+        "products": products,
+        "filters": {
+            "status": status or "",
+            "product_id": product_id or "",
+            "limit": limit,
+        },
     }
 
 # 단계 → 상태 매핑
@@ -291,13 +546,17 @@ STEP_TO_STATUS = {
     4: "S4_PACK",
     5: "S5_DONE",
 }
+STATUS_TO_STEP = {status: step for step, status in STEP_TO_STATUS.items()}
+
+# 공정 이벤트 일괄 전송 1회당 최대 건수
+PROGRESS_EVENTS_MAX = int(os.getenv("PROGRESS_EVENTS_MAX", "5000"))
 
 def advance_progress(db: Session, order_id: str, operation_seq: str, equipment_id: str | None):
     now = datetime.utcnow()
     op_seq = int(operation_seq) 
 
-    # 주문 로드
-    order = db.query(WorkOrder).filter(WorkOrder.order_id == order_id).first()
+    # 주문 로드 (행 잠금: 동시 진행/이벤트 반영 시 같은 변경 전 상태로 집계가 두 번 빠지지 않도록)
+    order = db.query(WorkOrder).filter(WorkOrder.order_id == order_id).with_for_update().first()
 
     # 실적 한 줄 추가
     wr = WorkResult(
@@ -309,14 +568,172 @@ def advance_progress(db: Session, order_id: str, operation_seq: str, equipment_i
     )
     db.add(wr)
 
-    # 주문 상태/시간 갱신
+    # 주문 상태/시간 갱신 + 대시보드 집계 반영
     if order is not None:
+        before = (order.product_id, order.planned_qty, order.status, order.end_ts)
         order.status = STEP_TO_STATUS.get(op_seq, order.status)
         if order.start_ts is None:
             order.start_ts = now
         if op_seq == 5:
             order.end_ts = now
+        # 공정이 진행되면 스테이션 claim 해제
+        order.claimed_by = None
+        order.claimed_ts = None
+
+        delta = SummaryDelta()
+        delta.order(before, (order.product_id, order.planned_qty, order.status, order.end_ts))
+        standard = load_standards(db, [order.product_id]).get((order.product_id, op_seq))
+        delta.result(op_seq, wr.equipment_id, now, now, order.product_id, order.planned_qty, standard)
+        delta.apply(db)
 
     db.commit()
+    if order is not None:
+        delta.after_commit()
+    bump_data_version()
+
+def apply_progress_events(db: Session, events: list):
+    """
+    공정 완료 이벤트 일괄 반영 (JSON, HTML 렌더링 없음)
+
+    - 대상 작업지시를 order_id 순으로 FOR UPDATE 잠금 (동시 전송 간 교착 방지)
+    - (order_id, operation_seq) 실적이 이미 있으면 duplicate 로 응답 (재전송해도 안전)
+    - 실적은 multi-row INSERT 1회, 작업지시 상태/시간은 VALUES 조인 UPDATE 1회로 갱신
+    - 상태는 뒤로 돌아가지 않음 (이미 더 진행된 주문에 이전 공정 실적이 와도 상태 유지)
+    """
+    results = [None] * len(events)
+    parsed = []
+
+    # 1) 스키마 검증
+    for idx, raw in enumerate(events):
+        try:
+            parsed.append((idx, ProgressEvent.model_validate(raw)))
+        except ValidationError as e:
+            results[idx] = {"index": idx, "outcome": "rejected", "reason": _validation_reason(e)}
+
+    order_ids = sorted({ev.order_id for _, ev in parsed})
+    equipment_ids = {ev.equipment_id for _, ev in parsed if ev.equipment_id}
+
+    # 2) 작업지시 잠금 + 기존 실적/설비 조회 (각 1회)
+    orders = {}
+    existing = set()
+    if order_ids:
+        orders = {
+            r.order_id: r for r in
+            db.query(WorkOrder.order_id, WorkOrder.product_id, WorkOrder.planned_qty,
+                     WorkOrder.status, WorkOrder.start_ts, WorkOrder.end_ts)
+              .filter(WorkOrder.order_id.in_(order_ids))
+              .order_by(WorkOrder.order_id)
+              .with_for_update()
+              .all()
+        }
+        existing = {
+            (r.order_id, r.operation_seq) for r in
+            db.query(WorkResult.order_id, WorkResult.operation_seq)
+              .filter(WorkResult.order_id.in_(list(orders)))
+              .all()
+        }
+    known_equipment = {
+        r.equipment_id for r in
+        db.query(MasterEquipment.equipment_id).filter(MasterEquipment.equipment_id.in_(equipment_ids)).all()
+    } if equipment_ids else set()
+
+    # 3) 이벤트별 판정
+    new_results = []
+    order_updates = {}
+    for idx, ev in parsed:
+        key = (ev.order_id, ev.operation_seq)
+        order = orders.get(ev.order_id)
+        if order is None:
+            results[idx] = {"index": idx, "outcome": "rejected", "reason": f"알 수 없는 작업지시: {ev.order_id}"}
+            continue
+        if ev.equipment_id and ev.equipment_id not in known_equipment:
+            results[idx] = {"index": idx, "outcome": "rejected", "reason": f"알 수 없는 설비 ID: {ev.equipment_id}"}
+            continue
+        if key in existing:
+            results[idx] = {"index": idx, "outcome": "duplicate"}
+            continue
+
+        existing.add(key)
+        start_ts, end_ts = ev.start_ts, ev.end_ts   # 스키마에서 naive UTC 로 변환됨
+        new_results.append({
+            "result_id": uuid.uuid4(),
+            "order_id": ev.order_id,
+            "operation_seq": ev.operation_seq,
+            "equipment_id": ev.equipment_id or None,
+            "start_ts": start_ts,
+            "end_ts": end_ts,
+        })
+        results[idx] = {"index": idx, "outcome": "applied"}
+
+        # 주문별 최종 상태 (가장 앞선 공정 기준)
+        u = order_updates.get(ev.order_id)
+        if u is None:
+            u = order_updates[ev.order_id] = {
+                "seq": STATUS_TO_STEP.get(order.status, 0),
+                "start_ts": order.start_ts,
+                "end_ts": order.end_ts,
+            }
+        u["seq"] = max(u["seq"], ev.operation_seq)
+        u["start_ts"] = start_ts if u["start_ts"] is None else min(u["start_ts"], start_ts)
+        if ev.operation_seq == 5:
+            u["end_ts"] = end_ts
+
+    # 4) 실적 INSERT + 상태 UPDATE + 대시보드 집계 (한 트랜잭션)
+    if new_results:
+        db.execute(insert(WorkResult), new_results)
+
+        delta = SummaryDelta()
+        standards = load_standards(db, [o.product_id for o in orders.values()])
+        for r in new_results:
+            o = orders[r["order_id"]]
+            delta.result(r["operation_seq"], r["equipment_id"], r["start_ts"], r["end_ts"],
+                         o.product_id, o.planned_qty, standards.get((o.product_id, r["operation_seq"])))
+        for order_id, u in order_updates.items():
+            o = orders[order_id]
+            delta.order(
+                (o.product_id, o.planned_qty, o.status, o.end_ts),
+                (o.product_id, o.planned_qty, STEP_TO_STATUS.get(u["seq"], "S0_PLANNED"), u["end_ts"]),
+            )
+        delta.apply(db)
+
+        v = values(
+            column("order_id", PG_UUID(as_uuid=True)),
+            column("status", String),
+            column("start_ts", DateTime),
+            column("end_ts", DateTime),
+            name="v",
+        ).data([
+            (order_id, STEP_TO_STATUS.get(u["seq"], "S0_PLANNED"), u["start_ts"], u["end_ts"])
+            for order_id, u in sorted(order_updates.items())
+        ])
+        db.execute(
+            update(WorkOrder)
+            .where(WorkOrder.order_id == cast(v.c.order_id, PG_UUID(as_uuid=True)))
+            .values(
+                # VALUES 목록의 파라미터는 text 로 추론되므로 컬럼 타입으로 명시 변환
+                status=cast(v.c.status, WorkOrder.status.type),
+                start_ts=cast(v.c.start_ts, DateTime),
+                end_ts=cast(v.c.end_ts, DateTime),
+                # 공정이 진행되면 스테이션 claim 해제
+                claimed_by=None,
+                claimed_ts=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    if new_results:
+        delta.after_commit()
+        bump_data_version()
+
+    counts = {"applied": 0, "duplicate": 0, "rejected": 0}
+    for r in results:
+        counts[r["outcome"]] += 1
+    return {
+        "received": len(events),
+        "applied": counts["applied"],
+        "duplicates": counts["duplicate"],
+        "rejected": counts["rejected"],
+        "results": results,
+    }
 
 # def quailty_inspection_list(db: Session, order_id: str, operation_seq: str, equipment_id: str | None):
\ No newline at end of file
@@ -1,5 +1,8 @@
 import pandas as pd
+import numpy as np
 import requests
+import httpx
+import asyncio
 import time
 import os
 import logging
@@ -13,9 +16,18 @@ logger = logging.getLogger()
 # 환경 변수
 SERVER_URL = os.getenv("SERVER_URL", "http://server:8000")
 ENDPOINT = f"{SERVER_URL}/equipment/sensor"
+BATCH_ENDPOINT = f"{SERVER_URL}/equipment/sensor/batch"
 INTERVAL = int(os.getenv("INTERVAL", "10"))  # 초 단위
 CSV_PATH = "/app/data/equipment_sensor_data.csv"
 
+# 부하 생성 모드 설정 (MODE=load)
+MODE = os.getenv("MODE", "replay")                             # replay: 기존 순차 전송, load: 부하 생성
+TARGET_RPS = float(os.getenv("TARGET_RPS", "100"))             # 목표 전송량 (readings/sec, 0이면 제한 없음)
+TIME_COMPRESSION = float(os.getenv("TIME_COMPRESSION", "0"))   # CSV 시각 간격 압축 배율 (0이면 미사용)
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "1"))                 # 1이면 단건 API, 2 이상이면 배치 API
+DURATION = float(os.getenv("DURATION", "60"))                  # 실행 시간 (초, 0이면 CSV 소진 시 종료)
+CONCURRENCY = int(os.getenv("CONCURRENCY", "50"))              # 동시 요청 수 (HTTP 커넥션 풀 크기)
+
 def main():
     logger.info("SCADA 시뮬레이터 시작")
     logger.info(f"서버 URL: {SERVER_URL}")
@@ -51,9 +63,181 @@ def main():
             logger.error(f"Failed to send data: {e}")
         time.sleep(INTERVAL)
 
+def make_payload(row: dict) -> dict:
+    return {
+        "timestamp": datetime.now(ZoneInfo("Asia/Seoul")).strftime('%Y-%m-%d %H:%M:%S'),
+        "equipment_id": row["equipment_id"],
+        "temperature": row["temperature"],
+        "vibration": row["vibration"],
+        "current": row["current"],
+        "rpm": row["rpm"],
+        "pressure": row["pressure"]
+    }
+
+
+class RateLimiter:
+    """전체 스트림 공용 전송량 제한 (readings/sec)"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, n: int = 1):
+        if self.interval == 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + n * self.interval
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class LoadStats:
+    """요청 지연시간 / 처리량 집계"""
+
+    def __init__(self):
+        self.latencies = []
+        self.sent_readings = 0
+        self.failed_readings = 0
+        self.status_counts = {}
+
+    def record(self, latency: float, n: int, status: int | None):
+        self.latencies.append(latency)
+        key = str(status) if status is not None else "error"
+        self.status_counts[key] = self.status_counts.get(key, 0) + 1
+        if status is not None and 200 <= status < 300:
+            self.sent_readings += n
+        else:
+            self.failed_readings += n
+
+    def report(self, elapsed: float):
+        lat_ms = np.array(self.latencies) * 1000
+        logger.info("===== 부하 테스트 결과 =====")
+        logger.info(f"실행 시간: {elapsed:.1f}초, 요청 수: {len(lat_ms)}, 응답 코드: {self.status_counts}")
+        logger.info(f"전송 성공: {self.sent_readings}건, 실패: {self.failed_readings}건")
+        logger.info(f"달성 처리량: {self.sent_readings / elapsed:.1f} readings/sec" if elapsed > 0 else "달성 처리량: -")
+        if len(lat_ms):
+            p50, p95, p99 = np.percentile(lat_ms, [50, 95, 99])
+            logger.info(f"지연시간(ms) p50={p50:.1f} p95={p95:.1f} p99={p99:.1f} max={lat_ms.max():.1f}")
+
+
+async def send(client: httpx.AsyncClient, sem: asyncio.Semaphore, stats: LoadStats, rows: list):
+    started = time.monotonic()
+    status = None
+    try:
+        if BATCH_SIZE > 1:
+            response = await client.post(BATCH_ENDPOINT, json=[make_payload(r) for r in rows])
+        else:
+            response = await client.post(ENDPOINT, json=make_payload(rows[0]))
+        status = response.status_code
+    except httpx.HTTPError as e:
+        logger.error(f"Failed to send data: {e}")
+    finally:
+        sem.release()
+    stats.record(time.monotonic() - started, len(rows), status)
+
+
+async def replay_stream(rows: list, offsets: list | None, client: httpx.AsyncClient,
+                        sem: asyncio.Semaphore, limiter: RateLimiter, stats: LoadStats,
+                        started: float, deadline: float | None):
+    """설비 1대의 센서 스트림 재생"""
+    tasks = set()
+
+    async def dispatch(batch: list):
+        await limiter.acquire(len(batch))
+        # 동시 요청 수 제한 (서버가 느려지면 생성 속도도 함께 늦춤)
+        await sem.acquire()
+        task = asyncio.create_task(send(client, sem, stats, batch))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    batch = []
+    loop_offset = 0.0
+    span = (offsets[-1] + 1.0) if offsets else 0.0
+
+    i = 0
+    while True:
+        if i == len(rows):
+            # DURATION 동안 반복 재생
+            if deadline is None:
+                break
+            i = 0
+            loop_offset += span
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+
+        # 시간 압축 재생: 원본 시각 간격 / 압축 배율 만큼 대기
+        if offsets is not None:
+            delay = started + loop_offset + offsets[i] - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        batch.append(rows[i])
+        i += 1
+        if len(batch) >= max(BATCH_SIZE, 1):
+            await dispatch(batch)
+            batch = []
+
+    if batch:
+        await dispatch(batch)
+    await asyncio.gather(*tasks)
+
+
+async def run_load(df: pd.DataFrame):
+    logger.info(f"부하 생성 모드: 목표 {TARGET_RPS} readings/sec, 배치 {BATCH_SIZE}, "
+                f"시간 압축 {TIME_COMPRESSION}, 동시 요청 {CONCURRENCY}, 실행 시간 {DURATION}초")
+
+    use_time = TIME_COMPRESSION > 0 and "timestamp" in df.columns
+    if use_time:
+        df = df.assign(_ts=pd.to_datetime(df["timestamp"])).sort_values("_ts")
+        t0 = df["_ts"].min()
+
+    # 설비별 스트림 분리
+    streams = []
+    for _, group in df.groupby("equipment_id", sort=False):
+        rows = group[["equipment_id", "temperature", "vibration", "current", "rpm", "pressure"]].to_dict("records")
+        offsets = None
+        if use_time:
+            offsets = ((group["_ts"] - t0).dt.total_seconds() / TIME_COMPRESSION).tolist()
+        streams.append((rows, offsets))
+
+    stats = LoadStats()
+    limiter = RateLimiter(TARGET_RPS)
+    sem = asyncio.Semaphore(CONCURRENCY)
+    limits = httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
+
+    started = time.monotonic()
+    deadline = started + DURATION if DURATION > 0 else None
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        await asyncio.gather(*[
+            replay_stream(rows, offsets, client, sem, limiter, stats, started, deadline)
+            for rows, offsets in streams
+        ])
+    stats.report(time.monotonic() - started)
+
+
+def main_load():
+    # 서버 연결 대기
+    time.sleep(5)
+    try:
+        df = pd.read_csv(CSV_PATH)
+    except Exception as e:
+        logger.error(f"CSV 파일 로드 실패: {e}")
+        return
+    # JSON 직렬화를 위해 NaN -> None
+    df = df.astype(object).where(df.notna(), None)
+    asyncio.run(run_load(df))
+
+
 if __name__ == "__main__":
     try:
-        main()
+        if MODE == "load":
+            main_load()
+        else:
+            main()
     except KeyboardInterrupt:
         logger.info("시뮬레이터 종료")
     except Exception as e: